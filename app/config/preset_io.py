@@ -0,0 +1,387 @@
+"""
+Streaming preset import/export.
+
+Entries are read and written one at a time, so memory stays bounded by the
+chunk size rather than the file size. Supported formats, chosen by file
+extension:
+
+  .jsonl  one preset object per line
+  .csv    header row with name, duration, alerts, flash_time, music
+  .ics    iCalendar agenda; every VEVENT becomes a preset named after its
+          SUMMARY, lasting DTEND - DTSTART (or DURATION)
+  .json   the legacy format: a JSON list of preset objects
+
+Import and export run as tasks whose step() processes one chunk, so the
+settings dialog can drive them from a timer and show progress.
+"""
+import csv
+import io
+import json
+import os
+import re
+from datetime import datetime, timedelta
+
+from app.config.settings import Preset
+
+CHUNK_SIZE = 500
+MAX_DURATION = 36000 # Same limit as the preset editor
+
+FORMATS = (".jsonl", ".csv", ".ics", ".json")
+FILE_FILTER = "预设文件 (*.jsonl *.csv *.ics *.json);;JSON Lines (*.jsonl);;CSV (*.csv);;iCalendar (*.ics);;JSON (*.json)"
+
+CSV_FIELDS = ("name", "duration", "alerts", "flash_time", "music")
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"不支持的文件格式：{ext or path}")
+    return ext
+
+# Normalization
+
+def parse_seconds(value):
+    """Seconds from an int, "90", "05:00" or "1:30:00"; None if invalid."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        parts = [int(p) for p in value.split(":")]
+    except ValueError:
+        return None
+    if len(parts) > 3:
+        return None
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds
+
+def parse_alert_list(value):
+    if isinstance(value, str):
+        value = re.split(r"[,;，\s]+", value)
+    elif not isinstance(value, (list, tuple)):
+        value = [value]
+    alerts = []
+    for item in value:
+        seconds = parse_seconds(item)
+        if seconds:
+            alerts.append(seconds)
+    return alerts
+
+def normalize_preset(entry):
+    """Validate a raw entry into a Preset, or return None if it is unusable."""
+    if not isinstance(entry, dict):
+        return None
+    name = entry.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return None
+    duration = parse_seconds(entry.get("duration"))
+    if not duration or duration <= 0 or duration > MAX_DURATION:
+        return None
+    preset = Preset(name.strip(), duration)
+    if "alerts" in entry:
+        preset.alerts = parse_alert_list(entry["alerts"])
+    elif "alert_time" in entry:
+        preset.alerts = parse_alert_list(entry["alert_time"])
+    flash_time = parse_seconds(entry.get("flash_time"))
+    if flash_time is not None:
+        preset.flash_time = flash_time
+    music = entry.get("music")
+    if isinstance(music, str):
+        preset.music = music.strip()
+    preset.validate()
+    # Alerts at or beyond the duration would fire immediately
+    preset.alerts = [t for t in preset.alerts if t < duration]
+    return preset
+
+def preset_key(preset):
+    # Presets with the same name and duration count as duplicates
+    return (preset.name, preset.duration)
+
+# Readers: each yields raw entries (dicts) from a text file
+
+def read_jsonl(f):
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+def read_csv(f):
+    for row in csv.DictReader(f):
+        yield {k.strip().lower(): v for k, v in row.items() if k}
+
+def read_json_array(f, chunk_size=65536):
+    # Incremental parse of a top level JSON list, one element at a time
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size).lstrip()
+    if not buf.startswith("["):
+        raise ValueError("格式无效：根元素必须是列表。")
+    buf = buf[1:]
+    eof = False
+    while True:
+        buf = buf.lstrip().lstrip(",").lstrip()
+        if buf.startswith("]"):
+            return
+        try:
+            item, end = decoder.raw_decode(buf)
+        except ValueError:
+            if eof:
+                raise
+            more = f.read(chunk_size)
+            eof = not more
+            buf += more
+            continue
+        yield item
+        buf = buf[end:]
+        if not buf and not eof:
+            more = f.read(chunk_size)
+            eof = not more
+            buf = more
+
+def unfold_ical(f):
+    # RFC 5545 folds long lines; continuation lines start with a space/tab
+    pending = None
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+def parse_ical_datetime(value):
+    value = value.rstrip("Z")
+    for fmt in ("%Y%m%dT%H%M%S", "%Y%m%dT%H%M", "%Y%m%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    return None
+
+ICAL_DURATION = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+def parse_ical_duration(value):
+    m = ICAL_DURATION.match(value.strip())
+    if not m or m.group(1) == "-":
+        return None
+    weeks, days, hours, minutes, seconds = (int(g or 0) for g in m.groups()[1:])
+    return (((weeks * 7 + days) * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def unescape_ical(text):
+    return (text.replace("\\n", " ").replace("\\N", " ").replace("\\,", ",")
+            .replace("\\;", ";").replace("\\\\", "\\"))
+
+def read_ical(f):
+    event = None
+    for line in unfold_ical(f):
+        if line == "BEGIN:VEVENT":
+            event = {}
+            continue
+        if event is None:
+            continue
+        if line == "END:VEVENT":
+            start = parse_ical_datetime(event.get("DTSTART", ""))
+            end = parse_ical_datetime(event.get("DTEND", ""))
+            if "DURATION" in event:
+                duration = parse_ical_duration(event["DURATION"])
+            elif start and end:
+                duration = int((end - start).total_seconds())
+            else:
+                duration = None
+            yield {"name": unescape_ical(event.get("SUMMARY", "")), "duration": duration}
+            event = None
+            continue
+        name, sep, value = line.partition(":")
+        if sep:
+            # Drop parameters such as DTSTART;TZID=Asia/Shanghai
+            event[name.split(";", 1)[0].upper()] = value
+
+READERS = {
+    ".jsonl": read_jsonl,
+    ".csv": read_csv,
+    ".ics": read_ical,
+    ".json": read_json_array,
+}
+
+# Writers: begin(f), write(f, preset), end(f)
+
+def escape_ical(text):
+    return (text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\n", "\\n"))
+
+class JsonlWriter:
+    def begin(self, f):
+        pass
+
+    def write(self, f, preset):
+        f.write(json.dumps(preset.to_dict(), ensure_ascii=False))
+        f.write("\n")
+
+    def end(self, f):
+        pass
+
+class CsvWriter:
+    def begin(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(CSV_FIELDS)
+
+    def write(self, f, preset):
+        self.writer.writerow((preset.name, preset.duration, ";".join(str(t) for t in preset.alerts),
+                              preset.flash_time, preset.music))
+
+    def end(self, f):
+        pass
+
+class JsonArrayWriter:
+    def begin(self, f):
+        self.first = True
+        f.write("[\n")
+
+    def write(self, f, preset):
+        if not self.first:
+            f.write(",\n")
+        self.first = False
+        f.write("    " + json.dumps(preset.to_dict(), ensure_ascii=False))
+
+    def end(self, f):
+        f.write("\n]\n")
+
+class IcalWriter:
+    # Presets have no start times; they are laid out back to back from
+    # today 09:00 (floating local time)
+    def begin(self, f):
+        self.start = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+        self.index = 0
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//DaoJiShi//Presets//ZH\r\n")
+
+    def write(self, f, preset):
+        end = self.start + timedelta(seconds=preset.duration)
+        self.index += 1
+        f.write("BEGIN:VEVENT\r\n")
+        f.write(f"UID:preset-{self.index}-{self.start:%Y%m%dT%H%M%S}@daojishi\r\n")
+        f.write(f"DTSTART:{self.start:%Y%m%dT%H%M%S}\r\n")
+        f.write(f"DTEND:{end:%Y%m%dT%H%M%S}\r\n")
+        f.write(f"SUMMARY:{escape_ical(preset.name)}\r\n")
+        f.write("END:VEVENT\r\n")
+        self.start = end
+
+    def end(self, f):
+        f.write("END:VCALENDAR\r\n")
+
+WRITERS = {
+    ".jsonl": JsonlWriter,
+    ".csv": CsvWriter,
+    ".ics": IcalWriter,
+    ".json": JsonArrayWriter,
+}
+
+class PresetImporter:
+    """
+    Appends the presets of a file to a PresetStore, skipping invalid
+    entries and duplicates (same name and duration) of existing or already
+    imported presets. Call step() until it returns False.
+    """
+    def __init__(self, path, store, chunk_size=CHUNK_SIZE):
+        self.store = store
+        self.chunk_size = chunk_size
+        # Checked before opening, so an unsupported file leaks no handle
+        reader = READERS[file_format(path)]
+        self.raw = open(path, 'rb')
+        self.size = os.path.getsize(path)
+        # utf-8-sig: spreadsheet CSV exports often start with a BOM
+        text = io.TextIOWrapper(self.raw, encoding='utf-8-sig', newline='')
+        self.entries = reader(text)
+        self.seen = store.keys()
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.done = False
+
+    def progress(self):
+        # Fraction of the file consumed (approximate, read-ahead included)
+        if self.done or not self.size:
+            return 1.0
+        return min(1.0, self.raw.tell() / self.size)
+
+    def step(self):
+        batch = []
+        try:
+            for entry in self.entries:
+                preset = normalize_preset(entry)
+                if preset is None:
+                    self.invalid += 1
+                elif preset_key(preset) in self.seen:
+                    self.duplicates += 1
+                else:
+                    self.seen.add(preset_key(preset))
+                    batch.append(preset)
+                if len(batch) >= self.chunk_size:
+                    break
+            else:
+                self.close()
+        finally:
+            if batch:
+                self.store.insert_many(batch)
+                self.imported += len(batch)
+        return not self.done
+
+    def close(self):
+        self.done = True
+        self.raw.close()
+
+class PresetExporter:
+    """Writes the presets of a PresetStore to a file, one chunk per step()."""
+    def __init__(self, path, store, chunk_size=CHUNK_SIZE):
+        self.writer = WRITERS[file_format(path)]()
+        self.path = path
+        self.chunk_size = chunk_size
+        self.total = store.count()
+        self.rows = store.iter_all(chunk_size)
+        # Written to a temp file and renamed, like the config file
+        self.tmp_path = path + ".tmp"
+        self.f = open(self.tmp_path, 'w', encoding='utf-8', newline='')
+        self.writer.begin(self.f)
+        self.exported = 0
+        self.done = False
+
+    def progress(self):
+        if self.done or not self.total:
+            return 1.0
+        return self.exported / self.total
+
+    def step(self):
+        try:
+            for preset in self.rows:
+                self.writer.write(self.f, preset)
+                self.exported += 1
+                if self.exported % self.chunk_size == 0:
+                    return True
+            self.writer.end(self.f)
+            self.f.close()
+            os.replace(self.tmp_path, self.path)
+            self.done = True
+            return False
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if not self.done:
+            self.done = True
+            self.f.close()
+            try:
+                os.remove(self.tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,180 @@
+import json
+import os
+import sqlite3
+
+from app.config.settings import Preset, presets_digest
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    alerts TEXT NOT NULL,
+    flash_time INTEGER NOT NULL,
+    music TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS presets_position ON presets (position);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+COLUMNS = "id, name, duration, alerts, flash_time, music"
+
+def _row_to_preset(row):
+    _, name, duration, alerts, flash_time, music = row
+    return Preset(name, duration, json.loads(alerts), flash_time, music)
+
+def _preset_values(preset):
+    return (preset.name, preset.duration, json.dumps(preset.alerts), preset.flash_time, preset.music)
+
+class PresetStore:
+    """
+    Indexed working copy of the preset list in a local SQLite file.
+
+    config.json stays the source of truth; the store is re-filled from it
+    only when the presets' digest differs from the one it was last synced
+    with, so opening the settings dialog with thousands of presets doesn't
+    rebuild anything. Views read rows by id (O(1), cached) and search by
+    name without materializing the whole list.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        self.cache = {} # id -> Preset
+        self.synced = None # Preset list object last synced or saved
+
+    @staticmethod
+    def path_for(config_file):
+        return os.path.splitext(os.path.abspath(config_file))[0] + "_presets.db"
+
+    def meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def sync(self, presets, digest=None):
+        """
+        Make the store hold presets (a list of Preset). digest is their
+        presets_digest() if already known. Returns True if the rows had to
+        be rewritten.
+        """
+        if presets is self.synced:
+            return False
+        digest = digest or presets_digest(presets)
+        if digest == self.meta("digest"):
+            self.synced = presets
+            return False
+        self.replace(presets)
+        self.mark_synced(presets, digest)
+        return True
+
+    def mark_synced(self, presets, digest=None):
+        # The rows now match presets, e.g. right after saving them
+        self.set_meta("digest", digest or presets_digest(presets))
+        self.db.commit()
+        self.synced = presets
+
+    def replace(self, presets):
+        self.cache.clear()
+        self.synced = None
+        with self.db:
+            self.db.execute("DELETE FROM presets")
+            self.db.executemany(
+                "INSERT INTO presets (position, name, duration, alerts, flash_time, music) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((i,) + _preset_values(p) for i, p in enumerate(presets)))
+            self.set_meta("digest", None)
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM presets").fetchone()[0]
+
+    def ids(self, query=""):
+        """Ids in list order, optionally only those whose name contains query."""
+        if query:
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            rows = self.db.execute(
+                "SELECT id FROM presets WHERE name LIKE ? ESCAPE '\\' ORDER BY position",
+                (pattern,))
+        else:
+            rows = self.db.execute("SELECT id FROM presets ORDER BY position")
+        return [row[0] for row in rows]
+
+    def get(self, preset_id):
+        preset = self.cache.get(preset_id)
+        if preset is None:
+            row = self.db.execute(f"SELECT {COLUMNS} FROM presets WHERE id = ?", (preset_id,)).fetchone()
+            if row is None:
+                return None
+            preset = self.cache[preset_id] = _row_to_preset(row)
+        return preset
+
+    def all(self):
+        rows = self.db.execute(f"SELECT {COLUMNS} FROM presets ORDER BY position")
+        return [_row_to_preset(row) for row in rows]
+
+    def iter_all(self, chunk_size=500):
+        # Streams the presets in list order without loading them all
+        cur = self.db.execute(f"SELECT {COLUMNS} FROM presets ORDER BY position")
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_preset(row)
+
+    def keys(self):
+        # (name, duration) of every preset, for duplicate detection
+        return set(self.db.execute("SELECT name, duration FROM presets"))
+
+    def update(self, preset_id, preset):
+        # Left in the open transaction; the editor calls this on every
+        # keystroke and commits once the edits settle (see commit())
+        self.db.execute(
+            "UPDATE presets SET name = ?, duration = ?, alerts = ?, flash_time = ?, music = ? "
+            "WHERE id = ?", _preset_values(preset) + (preset_id,))
+        self.set_meta("digest", None)
+        self.cache[preset_id] = preset
+        self.synced = None
+
+    def commit(self):
+        if self.db.in_transaction:
+            self.db.commit()
+
+    def insert(self, preset):
+        # Appended at the end of the list
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO presets (position, name, duration, alerts, flash_time, music) "
+                "VALUES ((SELECT COALESCE(MAX(position), -1) + 1 FROM presets), ?, ?, ?, ?, ?)",
+                _preset_values(preset))
+            self.set_meta("digest", None)
+        self.synced = None
+        return cur.lastrowid
+
+    def insert_many(self, presets):
+        # Appended at the end of the list, in order
+        with self.db:
+            start = self.db.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM presets").fetchone()[0]
+            self.db.executemany(
+                "INSERT INTO presets (position, name, duration, alerts, flash_time, music) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((start + i,) + _preset_values(p) for i, p in enumerate(presets)))
+            self.set_meta("digest", None)
+        self.synced = None
+
+    def delete(self, preset_id):
+        with self.db:
+            self.db.execute("DELETE FROM presets WHERE id = ?", (preset_id,))
+            self.set_meta("digest", None)
+        self.cache.pop(preset_id, None)
+        self.synced = None
+
+    def close(self):
+        self.commit()
+        self.db.close()
@@ -1,11 +1,18 @@
+import atexit
+import contextlib
+import dataclasses
+import hashlib
 import json
+import operator
 import os
+import threading
+from dataclasses import dataclass, field
 
 DEFAULT_SETTINGS = {
     "presets": [
-        {"name": "5分钟", "duration": 300, "alert_time": 60, "flash_time": 10, "music": "app/source/time.mp3"},
-        {"name": "10分钟", "duration": 600, "alert_time": 60, "flash_time": 10, "music": "app/source/time.mp3"},
-        {"name": "15分钟", "duration": 900, "alert_time": 60, "flash_time": 10, "music": "app/source/time.mp3"}
+        {"name": "5分钟", "duration": 300, "alerts": [60], "flash_time": 10, "music": "app/source/time.mp3"},
+        {"name": "10分钟", "duration": 600, "alerts": [60], "flash_time": 10, "music": "app/source/time.mp3"},
+        {"name": "15分钟", "duration": 900, "alerts": [60], "flash_time": 10, "music": "app/source/time.mp3"}
     ],
     "shortcuts": {
         "start_pause": "1",
@@ -16,7 +23,8 @@ DEFAULT_SETTINGS = {
         "toggle_top": "6",
         "opacity_up": "7",
         "opacity_down": "8",
-        "mute": "ctrl+m"
+        "mute": "ctrl+m",
+        "perf_hud": "ctrl+shift+p"
     },
     "window": {
         "width": 350,
@@ -30,6 +38,7 @@ DEFAULT_SETTINGS = {
     "audio": {
         "volume": 0.8,
         "fade_duration": 2000,
+        "fade_curve": "linear", # linear, log, equal_power
         "prompt_regular": "app/source/非保密会议版.wav",
         "prompt_confidential": "app/source/保密会议版.wav"
     },
@@ -39,59 +48,516 @@ DEFAULT_SETTINGS = {
     },
     "display": {
         "format": "min_sec", # min_sec, seconds, percent
-        "font_size": 150
+        "font_size": 150,
+        "smooth_progress": False
+    },
+    "agenda": {
+        "enabled": False,
+        # [{"preset": name or index, "start": "HH:MM" (optional)}], empty = all presets
+        "slots": []
     }
 }
 
+def preset_alerts(preset):
+    # Raw alert times of a preset; older configs store a single alert_time
+    if "alerts" in preset:
+        return preset["alerts"]
+    return [preset.get("alert_time", 0)]
+
+def alert_seconds(values):
+    # Distinct positive alert times in seconds, latest first; entries that
+    # are not numbers are dropped instead of failing the whole config
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    seconds = set()
+    for t in values:
+        if isinstance(t, bool):
+            continue
+        try:
+            t = int(t)
+        except (TypeError, ValueError):
+            continue
+        if t > 0:
+            seconds.add(t)
+    return sorted(seconds, reverse=True)
+
+# Typed settings model. config.json is validated into these once at load
+# time (and on set()), so reads are plain attribute lookups.
+
+THEMES = ("dark", "light")
+DISPLAY_FORMATS = ("min_sec", "seconds", "percent")
+FADE_CURVES = ("linear", "log", "equal_power") # See app.core.fade.CURVES
+
+def _coerce(kind, value, default):
+    # Convert a JSON value to the field type, falling back to the default
+    if kind is bool:
+        return value if isinstance(value, bool) else default
+    if kind in (int, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return default
+        return kind(value)
+    if kind is str:
+        return value if isinstance(value, str) else default
+    return value
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+class Section:
+    """Shared loading and serialization for the settings sections."""
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        section = cls()
+        if isinstance(data, dict):
+            for f in dataclasses.fields(cls):
+                if f.name in data:
+                    default = getattr(section, f.name)
+                    setattr(section, f.name, _coerce(f.type, data[f.name], default))
+        section.validate()
+        return section
+
+    def validate(self):
+        pass
+
+    def to_dict(self):
+        return {f.name: getattr(self, f.name) for f in dataclasses.fields(self)}
+
+@dataclass(slots=True)
+class WindowSettings(Section):
+    width: int = 350
+    height: int = 250
+    opacity: float = 1.0
+    topmost: bool = False
+    x: int = 100
+    y: int = 100
+
+    def validate(self):
+        self.width = max(50, self.width)
+        self.height = max(20, self.height)
+        self.opacity = _clamp(self.opacity, 0.2, 1.0)
+
+@dataclass(slots=True)
+class AudioSettings(Section):
+    volume: float = 0.8
+    fade_duration: int = 2000
+    fade_curve: str = "linear"
+    prompt_regular: str = "app/source/非保密会议版.wav"
+    prompt_confidential: str = "app/source/保密会议版.wav"
+
+    def validate(self):
+        self.volume = _clamp(self.volume, 0.0, 1.0)
+        self.fade_duration = _clamp(self.fade_duration, 0, 10000)
+        if self.fade_curve not in FADE_CURVES:
+            self.fade_curve = "linear"
+
+@dataclass(slots=True)
+class ReminderSettings(Section):
+    flash_seconds: int = 5
+    flash_color: str = "#FF0000"
+
+    def validate(self):
+        self.flash_seconds = max(0, self.flash_seconds)
+
+@dataclass(slots=True)
+class DisplaySettings(Section):
+    format: str = "min_sec" # min_sec, seconds, percent
+    font_size: int = 150
+    smooth_progress: bool = False
+
+    def validate(self):
+        if self.format not in DISPLAY_FORMATS:
+            self.format = "min_sec"
+        self.font_size = _clamp(self.font_size, 20, 500)
+
+@dataclass(slots=True)
+class AgendaSettings(Section):
+    enabled: bool = False
+    slots: list = field(default_factory=list)
+
+    def validate(self):
+        if not isinstance(self.slots, list):
+            self.slots = []
+
+@dataclass(slots=True)
+class Preset(Section):
+    name: str = "新预设"
+    duration: int = 300 # seconds
+    alerts: list = field(default_factory=list) # seconds before the end
+    flash_time: int = 5
+    music: str = ""
+
+    @classmethod
+    def from_dict(cls, data):
+        preset = super(Preset, cls).from_dict(data)
+        if isinstance(data, dict):
+            preset.alerts = preset_alerts(data)
+            preset.validate()
+        return preset
+
+    def validate(self):
+        self.duration = max(1, self.duration)
+        self.flash_time = max(0, self.flash_time)
+        self.alerts = alert_seconds(self.alerts)
+
+    def to_dict(self):
+        d = Section.to_dict(self)
+        d["alerts"] = list(self.alerts)
+        return d
+
+_MISSING = object()
+
+SECTIONS = {
+    "window": WindowSettings,
+    "audio": AudioSettings,
+    "reminder": ReminderSettings,
+    "display": DisplaySettings,
+    "agenda": AgendaSettings,
+}
+
+class SettingsModel:
+    __slots__ = ("window", "audio", "reminder", "display", "agenda", "presets",
+                 "presets_digest", "shortcuts", "theme", "extra")
+
+    def __init__(self, data):
+        if not isinstance(data, dict):
+            data = {}
+        for name, cls in SECTIONS.items():
+            setattr(self, name, cls.from_dict(data.get(name, DEFAULT_SETTINGS[name])))
+        presets = data.get("presets")
+        if not isinstance(presets, list):
+            presets = DEFAULT_SETTINGS["presets"]
+        self.presets = [Preset.from_dict(p) for p in presets if isinstance(p, dict)]
+        # Computed with the presets, so the preset store can tell whether
+        # it is up to date without hashing them when the dialog opens
+        self.presets_digest = presets_digest(self.presets)
+        self.shortcuts = dict(DEFAULT_SETTINGS["shortcuts"])
+        if isinstance(data.get("shortcuts"), dict):
+            self.shortcuts.update((k, v) for k, v in data["shortcuts"].items() if isinstance(v, str))
+        theme = data.get("theme")
+        self.theme = theme if theme in THEMES else DEFAULT_SETTINGS["theme"]
+        # Unknown top level keys are kept so they survive a save
+        self.extra = {k: v for k, v in data.items() if k not in DEFAULT_SETTINGS}
+
+    def to_dict(self):
+        data = {name: getattr(self, name).to_dict() for name in SECTIONS}
+        data["presets"] = [p.to_dict() for p in self.presets]
+        data["shortcuts"] = dict(self.shortcuts)
+        data["theme"] = self.theme
+        data.update(self.extra)
+        return data
+
+def file_digest(raw):
+    return hashlib.sha1(raw).hexdigest()
+
+def presets_digest(presets):
+    # repr of plain tuples is several times faster than json.dumps of dicts
+    data = [(p.name, p.duration, p.alerts, p.flash_time, p.music) for p in presets]
+    return file_digest(repr(data).encode('utf-8'))
+
+def diff_models(old, new):
+    """Return the dotted keys whose values differ between two models."""
+    changed = []
+    for name in SECTIONS:
+        a, b = getattr(old, name), getattr(new, name)
+        for f in dataclasses.fields(a):
+            if getattr(a, f.name) != getattr(b, f.name):
+                changed.append(f"{name}.{f.name}")
+    if old.presets != new.presets:
+        changed.append("presets")
+    for key in old.shortcuts.keys() | new.shortcuts.keys():
+        if old.shortcuts.get(key) != new.shortcuts.get(key):
+            changed.append(f"shortcuts.{key}")
+    if old.theme != new.theme:
+        changed.append("theme")
+    for key in old.extra.keys() | new.extra.keys():
+        if old.extra.get(key, _MISSING) != new.extra.get(key, _MISSING):
+            changed.append(key)
+    return changed
+
 class Settings:
+    # Changes are written behind: set() only marks the data dirty and a
+    # background timer writes the file once the burst is over. flush() writes
+    # synchronously and runs on exit.
+    SAVE_DELAY = 0.5 # seconds
+
     def __init__(self, config_file="config.json"):
         self.config_file = config_file
-        self.data = self.load()
+        # Digest of the file contents last read or written by us; lets the
+        # config watcher skip reloading our own writes
+        self.file_digest = None
+        self.model = self.load()
+        self.accessors = {} # key -> compiled getter
+        self.lock = threading.RLock() # Guards model and dirty
+        self.write_lock = threading.Lock() # Serializes file writes
+        self.dirty = False
+        self.save_timer = None
+        # Values set since the last write, re-applied on top of the file
+        # when it was replaced on disk in the meantime (see merge())
+        self.local_changes = {}
+        # Digest of the last external file merged by flush(), so the config
+        # watcher doesn't reload it a second time
+        self.merged_digest = None
+        # Called with the keys changed by merging an external file; the
+        # config watcher routes this to the UI thread
+        self.notify_external = self.notify
+        # Change notifications: (prefix, callback) pairs, and the keys
+        # collected while a batch() is open
+        self.subscribers = []
+        self.batch_depth = 0
+        self.pending_changes = set()
+        atexit.register(self.flush)
 
     def load(self):
         if not os.path.exists(self.config_file):
-            return DEFAULT_SETTINGS.copy()
+            return SettingsModel(DEFAULT_SETTINGS)
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Merge with default to ensure new keys exist
-                return self.merge_defaults(data, DEFAULT_SETTINGS)
-        except Exception:
-            return DEFAULT_SETTINGS.copy()
-
-    def merge_defaults(self, data, defaults):
-        for key, value in defaults.items():
-            if key not in data:
-                data[key] = value
-            elif isinstance(value, dict) and isinstance(data[key], dict):
-                self.merge_defaults(data[key], value)
-        return data
+            with open(self.config_file, 'rb') as f:
+                raw = f.read()
+            self.file_digest = file_digest(raw)
+            # Missing or invalid values fall back to their defaults
+            return SettingsModel(json.loads(raw.decode('utf-8')))
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+            return SettingsModel(DEFAULT_SETTINGS)
+
+    @property
+    def data(self):
+        # Plain dict view of the settings, built on demand
+        return self.model.to_dict()
 
     def save(self):
+        # Mark dirty and write later; repeated calls within SAVE_DELAY are
+        # batched into a single write
+        with self.lock:
+            self.dirty = True
+            if self.save_timer is None:
+                self.save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self.save_timer.daemon = True
+                self.save_timer.start()
+
+    def flush(self):
+        # write_lock is taken first and held until the text is on disk, so
+        # texts are written in the order they were serialized, and a flush
+        # on exit waits for a write the save timer has in progress
+        changed = []
+        with self.write_lock:
+            with self.lock:
+                if not self.dirty:
+                    self.cancel_save()
+                    return
+            external = self.read_external()
+            with self.lock:
+                self.cancel_save()
+                self.dirty = False
+                if external is not None:
+                    # The file was replaced since we last read or wrote it
+                    # (e.g. pushed centrally): keep it and re-apply ours
+                    changed = self.merge(*external)
+                self.local_changes = {}
+                # Serialized under the lock so a concurrent set() can't
+                # change the data halfway through
+                text = json.dumps(self.model.to_dict(), indent=4, ensure_ascii=False)
+            self.write_file(text)
+        if changed:
+            self.notify_external(changed)
+
+    def cancel_save(self):
+        if self.save_timer is not None:
+            self.save_timer.cancel()
+            self.save_timer = None
+
+    def read_external(self):
+        """
+        (model, digest) of the config file if it differs from what we last
+        read or wrote, else None. Unreadable files count as unchanged.
+        """
+        try:
+            with open(self.config_file, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return None
+        digest = file_digest(raw)
+        if digest == self.file_digest:
+            return None
+        try:
+            data = json.loads(raw.decode('utf-8'))
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        return SettingsModel(data), digest
+
+    def merge(self, model, digest):
+        # Called with self.lock held: make model current with the values set
+        # locally since the last write applied on top. Returns changed keys.
+        old = self.model
+        self.model = model
+        for key, value in self.local_changes.items():
+            self.apply(key, value)
+        self.merged_digest = digest
+        return diff_models(old, self.model)
+
+    def write_file(self, text):
+        # Write a temp file next to the config and rename it over the old
+        # one, so readers never see a half-written file
+        tmp_file = self.config_file + ".tmp"
+        raw = text.encode('utf-8')
+        self.file_digest = file_digest(raw)
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=4, ensure_ascii=False)
+            with open(tmp_file, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.config_file)
         except Exception as e:
             print(f"Error saving settings: {e}")
 
+    def accessor(self, key):
+        """
+        Return a compiled getter for a dotted key, e.g. accessor("window.opacity")().
+        Raises KeyError for keys outside the schema.
+        """
+        getter = self.accessors.get(key)
+        if getter is None:
+            getter = self.accessors[key] = self.compile_key(key)
+        return getter
+
+    def compile_key(self, key):
+        section, _, name = key.partition('.')
+        model = self.model
+        if section in SECTIONS:
+            if name not in SECTIONS[section].__slots__:
+                raise KeyError(key)
+            # attrgetter resolves the dotted path in C; it goes through
+            # self.model so it stays valid when the model is replaced
+            get = operator.attrgetter(key)
+            return lambda: get(self.model)
+        if section == "shortcuts":
+            if name:
+                return lambda: self.model.shortcuts.get(name)
+            return lambda: dict(self.model.shortcuts)
+        if section == "presets" and not name:
+            return lambda: [p.to_dict() for p in self.model.presets]
+        if section == "theme" and not name:
+            return lambda: self.model.theme
+        if not name and section in model.extra:
+            return lambda: self.model.extra.get(section)
+        raise KeyError(key)
+
     def get(self, key, default=None):
-        keys = key.split('.')
-        val = self.data
-        for k in keys:
-            if isinstance(val, dict) and k in val:
-                val = val[k]
-            else:
-                return default
-        return val
+        # Compatibility API; hot paths should read self.model directly
+        try:
+            value = self.accessor(key)()
+        except KeyError:
+            return default
+        return default if value is None else value
 
     def set(self, key, value):
-        keys = key.split('.')
-        d = self.data
-        for k in keys[:-1]:
-            if k not in d:
-                d[k] = {}
-            d = d[k]
-        d[keys[-1]] = value
-        self.save()
+        with self.lock:
+            changed = self.apply(key, value)
+            if changed:
+                # Moved to the end so a merge replays changes in order
+                self.local_changes.pop(key, None)
+                self.local_changes[key] = value
+        if changed:
+            self.save()
+            self.notify(changed)
+
+    def apply(self, key, value):
+        # Called with self.lock held; returns the changed dotted keys
+        section, _, name = key.partition('.')
+        changed = []
+        model = self.model
+        if section in SECTIONS:
+            current = getattr(model, section)
+            if name:
+                data = current.to_dict()
+                data[name] = value
+            else:
+                data = value
+            # Revalidate the whole section so ranges stay consistent
+            new = SECTIONS[section].from_dict(data)
+            for f in dataclasses.fields(new):
+                if getattr(new, f.name) != getattr(current, f.name):
+                    changed.append(f"{section}.{f.name}")
+            setattr(model, section, new)
+        elif section == "shortcuts":
+            new = dict(model.shortcuts)
+            if name:
+                new[name] = value
+            else:
+                new.update(value)
+            changed = [f"shortcuts.{k}" for k, v in new.items() if model.shortcuts.get(k) != v]
+            model.shortcuts = new
+        elif section == "presets" and not name:
+            presets = [Preset.from_dict(p) for p in value]
+            if presets != model.presets:
+                model.presets = presets
+                model.presets_digest = presets_digest(presets)
+                changed.append("presets")
+        elif section == "theme" and not name:
+            if value in THEMES and value != model.theme:
+                model.theme = value
+                changed.append("theme")
+        elif not name:
+            if model.extra.get(section, _MISSING) != value:
+                model.extra[section] = value
+                changed.append(section)
+        else:
+            print(f"Unknown setting: {key}")
+        return changed
+
+    def replace_model(self, model, digest=None):
+        """
+        Swap in a model loaded from disk (config hot reload) and notify the
+        subscribers of the keys that differ. Values set locally but not yet
+        written are kept and written by the pending save.
+        """
+        with self.lock:
+            changed = self.merge(model, digest)
+            if digest is not None:
+                self.file_digest = digest
+        if changed:
+            self.notify(changed)
+        return changed
+
+    def subscribe(self, prefix, callback):
+        """
+        Call callback(keys) with the set of changed dotted keys under prefix
+        ("display" matches "display.format"; "" matches everything).
+        """
+        self.subscribers.append((prefix, callback))
+
+    def unsubscribe(self, callback):
+        self.subscribers = [s for s in self.subscribers if s[1] != callback]
+
+    @contextlib.contextmanager
+    def batch(self):
+        # Changes made inside are reported once, when the outermost batch ends
+        self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0 and self.pending_changes:
+                changed, self.pending_changes = self.pending_changes, set()
+                self.notify(changed)
+
+    def notify(self, changed):
+        if self.batch_depth:
+            self.pending_changes.update(changed)
+            return
+        for prefix, callback in list(self.subscribers):
+            if prefix:
+                keys = {k for k in changed if k == prefix or k.startswith(prefix + ".")}
+            else:
+                keys = set(changed)
+            if keys:
+                try:
+                    callback(keys)
+                except Exception as e:
+                    print(f"Error in settings subscriber for {prefix!r}: {e}")
 
 settings = Settings()
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from app.config.settings import SettingsModel, file_digest
+
+class ConfigWatcher(QObject):
+    """
+    Reloads config.json when it changes on disk, e.g. when it is pushed
+    from a central location. Bursts of change events are debounced, the
+    file is parsed and validated on a worker thread, and the new model is
+    handed to Settings.replace_model on the UI thread, which notifies only
+    the subscribers of keys that changed. Writes made by the app itself
+    are recognized by their digest and skipped.
+    """
+    loaded = pyqtSignal(object, str) # (SettingsModel, digest), from the worker
+    merged = pyqtSignal(object) # Keys changed by a merge in Settings.flush()
+
+    DEBOUNCE_MS = 300
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.path = os.path.abspath(settings.config_file)
+        self.reloads = 0
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(self.DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.start_reload)
+        self.loaded.connect(self.apply)
+        # A save that finds the file replaced merges it itself, possibly on
+        # the save timer thread; subscribers are notified on the UI thread
+        self.merged.connect(self.on_merged)
+        settings.notify_external = self.merged.emit
+
+        self.watcher = QFileSystemWatcher(self)
+        # The directory is watched too: an atomic replace removes the
+        # watched file, and the new one has to be picked up again
+        self.watcher.addPath(os.path.dirname(self.path))
+        self.watch_file()
+        self.watcher.fileChanged.connect(self.on_changed)
+        self.watcher.directoryChanged.connect(self.on_changed)
+
+    def watch_file(self):
+        if os.path.exists(self.path) and self.path not in self.watcher.files():
+            self.watcher.addPath(self.path)
+
+    def on_changed(self, path):
+        self.watch_file()
+        self.debounce.start()
+
+    def start_reload(self):
+        threading.Thread(target=self.read, daemon=True).start()
+
+    def read(self):
+        # Worker thread: no Qt objects are touched here
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return
+        digest = file_digest(raw)
+        if self.is_known(digest):
+            # Our own write, unchanged contents or already merged
+            return
+        try:
+            data = json.loads(raw.decode('utf-8'))
+        except ValueError as e:
+            # Possibly caught mid-write by a non-atomic writer; the next
+            # change event triggers another attempt
+            print(f"Ignoring invalid config file: {e}")
+            return
+        if not isinstance(data, dict):
+            print("Ignoring invalid config file: root must be an object")
+            return
+        self.loaded.emit(SettingsModel(data), digest)
+
+    def is_known(self, digest):
+        return digest in (self.settings.file_digest, self.settings.merged_digest)
+
+    def apply(self, model, digest):
+        if self.is_known(digest):
+            return
+        self.reloads += 1
+        changed = self.settings.replace_model(model, digest)
+        if changed:
+            print(f"Config reloaded: {', '.join(sorted(changed))}")
+
+    def on_merged(self, changed):
+        self.reloads += 1
+        self.settings.notify(changed)
+        print(f"Config merged: {', '.join(sorted(changed))}")
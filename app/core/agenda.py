@@ -0,0 +1,144 @@
+"""
+Agenda mode: an ordered sequence of presets played back to back.
+
+The agenda is compiled into a timeline of planned start/end times (wall
+clock, epoch seconds). Slots may carry a fixed start time ("HH:MM");
+the others follow the previous slot. While running, the expected end of
+the current slot (now + remaining) is compared with its planned end to
+show how far ahead or behind schedule we are; overruns simply carry into
+the following slots. Qt-free, like the countdown core.
+"""
+import bisect
+from datetime import datetime, time as dt_time
+
+class AgendaSlot:
+    __slots__ = ("preset_index", "duration", "fixed_start")
+
+    def __init__(self, preset_index, duration, fixed_start=None):
+        self.preset_index = preset_index
+        self.duration = duration # seconds
+        self.fixed_start = fixed_start # epoch seconds or None
+
+def parse_start(text, day):
+    """Epoch seconds of "HH:MM" / "HH:MM:SS" on the given date, or None."""
+    if not isinstance(text, str) or not text.strip():
+        return None
+    try:
+        parts = [int(p) for p in text.strip().split(":")]
+        start = dt_time(*parts)
+    except (TypeError, ValueError):
+        print(f"Invalid agenda start time: {text}")
+        return None
+    return datetime.combine(day, start).timestamp()
+
+def build_slots(slot_configs, presets, day=None):
+    """
+    Resolve the agenda config against the presets. Each config entry is
+    {"preset": name or index, "start": "HH:MM" (optional)}; an empty config
+    plays every preset in order. Unknown presets are skipped.
+    """
+    day = day or datetime.now().date()
+    if not slot_configs:
+        return [AgendaSlot(i, p.duration) for i, p in enumerate(presets)]
+    by_name = {}
+    for i, p in enumerate(presets):
+        by_name.setdefault(p.name, i)
+    slots = []
+    for config in slot_configs:
+        if not isinstance(config, dict):
+            continue
+        ref = config.get("preset")
+        if isinstance(ref, int) and not isinstance(ref, bool) and 0 <= ref < len(presets):
+            index = ref
+        elif isinstance(ref, str) and ref in by_name:
+            index = by_name[ref]
+        else:
+            print(f"Unknown agenda preset: {ref}")
+            continue
+        slots.append(AgendaSlot(index, presets[index].duration, parse_start(config.get("start"), day)))
+    return slots
+
+class Agenda:
+    __slots__ = ("slots", "anchor", "starts", "ends", "index", "started")
+
+    def __init__(self, slots, anchor=0):
+        self.slots = slots
+        self.anchor = anchor
+        self.starts = [] # Planned start of each slot, ascending
+        self.ends = []
+        self.index = 0
+        self.started = False
+        self.plan(anchor)
+
+    def __len__(self):
+        return len(self.slots)
+
+    @property
+    def current(self):
+        return self.slots[self.index] if self.slots else None
+
+    def plan(self, anchor):
+        """
+        Compute the timeline. Slots before the first fixed start are laid
+        out from anchor (usually the moment the agenda is started).
+        """
+        self.anchor = anchor
+        starts, ends = [], []
+        t = anchor
+        for slot in self.slots:
+            if slot.fixed_start is not None:
+                # A fixed start earlier than the previous slot's end would
+                # overlap it (and break the ordering bisect relies on); such
+                # a slot starts when the previous one ends
+                t = max(t, slot.fixed_start) if starts else slot.fixed_start
+            starts.append(t)
+            t += slot.duration
+            ends.append(t)
+        self.starts, self.ends = starts, ends
+
+    def start(self, now):
+        # The first start anchors the floating slots to the wall clock
+        if not self.started:
+            self.started = True
+            self.plan(now - self.elapsed_before(self.index))
+
+    def has_fixed_starts(self):
+        return any(slot.fixed_start is not None for slot in self.slots)
+
+    def elapsed_before(self, index):
+        # Playing time of the slots before index; durations only, so it
+        # doesn't depend on where the plan is anchored
+        return sum(slot.duration for slot in self.slots[:index])
+
+    def index_at(self, t):
+        """Slot the plan schedules at wall clock time t (binary search)."""
+        if not self.slots:
+            return 0
+        i = bisect.bisect_right(self.starts, t) - 1
+        return max(0, min(len(self.slots) - 1, i))
+
+    def seek(self, index):
+        self.index = max(0, min(len(self.slots) - 1, index))
+
+    def advance(self):
+        """Move to the next slot; False when the agenda is over."""
+        if self.index + 1 >= len(self.slots):
+            return False
+        self.index += 1
+        return True
+
+    def delta(self, now, remaining):
+        """
+        Seconds behind schedule (positive) or ahead (negative), given the
+        current slot's remaining time in seconds.
+        """
+        if not self.started or not self.slots:
+            return 0.0
+        return now + remaining - self.ends[self.index]
+
+def format_delta(delta):
+    seconds = int(round(abs(delta)))
+    if seconds < 1:
+        return "准时"
+    text = f"{seconds // 60:02d}:{seconds % 60:02d}"
+    return f"落后 {text}" if delta > 0 else f"提前 {text}"
@@ -0,0 +1,57 @@
+import asyncio
+
+from app.core.countdown import Countdown, NS_PER_MS
+
+class AsyncCountdownDriver:
+    """
+    Drives a Countdown from an asyncio event loop, for headless use (services,
+    scripts) without Qt. The driver owns on_schedule only; every other
+    callback, on_finished included, is left to the caller and may be set at
+    any time.
+
+        driver = AsyncCountdownDriver()
+        driver.countdown.on_alert = lambda: print("alert")
+        driver.countdown.set_config(300, [60])
+        driver.countdown.start()
+        await driver.wait_finished()
+    """
+    def __init__(self, countdown=None, loop=None):
+        self.countdown = countdown or Countdown()
+        self.loop = loop
+        self._handle = None
+        # Set when the countdown stops running (finished, paused or reset);
+        # the core reports this as on_schedule(None)
+        self._stopped = asyncio.Event()
+        self.countdown.on_schedule = self._on_schedule
+
+    def _on_schedule(self, due_ns):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if due_ns is None:
+            if not self.countdown.is_running:
+                self._stopped.set()
+            return
+        loop = self.loop or asyncio.get_running_loop()
+        delay = max(0, due_ns - self.countdown.clock()) / (1000 * NS_PER_MS)
+        self._handle = loop.call_later(delay, self._fire)
+
+    def _fire(self):
+        self._handle = None
+        self.countdown.tick()
+
+    async def wait_finished(self):
+        """
+        Wait until the countdown stops running: it finished, or was paused
+        or reset. Returns at once if it isn't running.
+        """
+        if not self.countdown.is_running:
+            return
+        self._stopped.clear()
+        await self._stopped.wait()
+
+    def close(self):
+        self.countdown.pause()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
@@ -1,83 +1,242 @@
 import os
-from PyQt5.QtCore import QObject, QUrl, QTimer
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QUrl, QTimer, Qt
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QSoundEffect
 from app.utils import get_resource_path
+from app.core.fade import Fade
+
+# Players (and WAV sound effects) kept loaded for upcoming playback
+POOL_SIZE = 4
+
+# QSoundEffect keeps the whole decoded file in memory, so only short cues
+# go through it (about 6 s of 16-bit 44.1 kHz stereo); longer announcements
+# are streamed by QMediaPlayer
+MAX_EFFECT_BYTES = 1024 * 1024
 
 class AudioPlayer(QObject):
+    """
+    Plays preset music and prompts. Files announced with preload() are
+    resolved and opened ahead of time, so play() only has to start a
+    player that already holds its media. Short WAV cues without a fade
+    go through QSoundEffect, which keeps the decoded samples in memory.
+    """
     def __init__(self):
         super().__init__()
-        self.player = QMediaPlayer()
+        self._player = None # Active player, built on first playback
+        self.players = OrderedDict() # resolved path -> QMediaPlayer, LRU
+        self.effects = OrderedDict() # resolved path -> QSoundEffect, LRU
+        self.active_effect = None
+        self.resolved = {} # file path -> resolved path or None
+        self.latency = None # Optional LatencyRecorder
+        # Latency trace kind of the pending playback and the player or
+        # effect it waits for; other playback is never recorded
+        self.trace = None
+        self.traced = None
         self.target_volume = 80
+        # Running fades: player -> (Fade, stop when done). One single-shot
+        # timer is armed for the earliest audible change of any of them.
+        self.fades = {}
+        self.fade_curve = "linear" # linear, log, equal_power
         self.fade_timer = QTimer()
-        self.fade_timer.setInterval(50) # Update every 50ms
-        self.fade_timer.timeout.connect(self._update_fade)
-        self.fade_step = 0
-        self.fade_target = 0
-        self.stop_after_fade = False
-
-    def play(self, file_path, fade_in_duration=0):
-        if not file_path:
+        self.fade_timer.setSingleShot(True)
+        self.fade_timer.setTimerType(Qt.PreciseTimer)
+        self.fade_timer.timeout.connect(self._update_fades)
+
+    @property
+    def player(self):
+        if self._player is None:
+            self._player = QMediaPlayer()
+        return self._player
+
+    def resolve(self, file_path):
+        # Resolve path (handle bundled files); cached, misses included
+        if file_path not in self.resolved:
+            resolved_path = get_resource_path(file_path)
+            self.resolved[file_path] = resolved_path if os.path.exists(resolved_path) else None
+        return self.resolved[file_path]
+
+    def preload(self, file_paths):
+        """Resolve and load the given files so that playing them is instant."""
+        self.resolved.clear() # Files may have been added or replaced
+        for file_path in file_paths:
+            if not file_path:
+                continue
+            resolved_path = self.resolve(file_path)
+            if resolved_path is None:
+                continue
+            if self.is_short_cue(resolved_path):
+                self.get_effect(resolved_path)
+            self.get_player(resolved_path)
+
+    @staticmethod
+    def is_short_cue(resolved_path):
+        if not resolved_path.lower().endswith(".wav"):
+            return False
+        try:
+            return os.path.getsize(resolved_path) <= MAX_EFFECT_BYTES
+        except OSError:
+            return False
+
+    def get_player(self, resolved_path):
+        player = self.players.get(resolved_path)
+        if player is None:
+            player = QMediaPlayer()
+            player.stateChanged.connect(lambda state, p=player: self._on_state_changed(p, state))
+            # setMedia starts opening the file in the background
+            player.setMedia(QMediaContent(QUrl.fromLocalFile(resolved_path)))
+            self.players[resolved_path] = player
+            # A player still fading out is in use until its fade ends
+            self.evict(self.players, lambda p: p is self._player or p in self.fades)
+        else:
+            self.players.move_to_end(resolved_path)
+        return player
+
+    def get_effect(self, resolved_path):
+        effect = self.effects.get(resolved_path)
+        if effect is None:
+            effect = QSoundEffect()
+            effect.playingChanged.connect(lambda e=effect: self._on_effect_playing(e))
+            effect.setSource(QUrl.fromLocalFile(resolved_path))
+            self.effects[resolved_path] = effect
+            self.evict(self.effects, lambda e: e is self.active_effect)
+        else:
+            self.effects.move_to_end(resolved_path)
+        return effect
+
+    def evict(self, pool, in_use):
+        # Drop the least recently used entries beyond POOL_SIZE
+        for path in list(pool):
+            if len(pool) <= POOL_SIZE:
+                break
+            item = pool[path]
+            if in_use(item):
+                continue
+            del pool[path]
+            item.stop()
+            item.deleteLater()
+
+    def play(self, file_path, fade_in_duration=0, trace=None):
+        """
+        trace names the latency trace this playback completes (e.g.
+        "alert"); its play and playing stages are marked for it only.
+        """
+        # A newer playback replaces whatever the previous trace waited for
+        self.cancel_trace()
+        resolved_path = self.resolve(file_path) if file_path else None
+        if resolved_path is None:
+            if trace is not None and self.latency is not None:
+                self.latency.cancel(trace)
             return
-            
-        # Resolve path (handle bundled files)
-        resolved_path = get_resource_path(file_path)
-        
-        if not os.path.exists(resolved_path):
+        if trace is not None and self.latency is not None:
+            self.latency.mark(trace, "play")
+            self.trace = trace
+
+        # A playing track is crossfaded into a new one that fades in
+        previous = self._player
+        crossfade = (fade_in_duration > 0 and previous is not None and
+                     previous.state() == QMediaPlayer.PlayingState and
+                     previous is not self.players.get(resolved_path))
+        if crossfade:
+            self.stop_effect()
+            self.fade_to(0, fade_in_duration, stop_after=True, player=previous, curve="equal_power")
+        else:
+            self.stop()
+
+        # Low latency path for short cues that are already decoded
+        effect = self.effects.get(resolved_path)
+        if fade_in_duration <= 0 and effect is not None and effect.status() == QSoundEffect.Ready:
+            effect.setVolume(self.target_volume / 100.0)
+            self.traced = effect
+            effect.play()
+            self.active_effect = effect
             return
 
-        url = QUrl.fromLocalFile(resolved_path)
-        content = QMediaContent(url)
-        self.player.setMedia(content)
+        self._player = self.get_player(resolved_path)
+        self.traced = self._player
+        self.fades.pop(self._player, None)
+        self.player.setPosition(0)
         
         if fade_in_duration > 0:
             self.player.setVolume(0)
             self.player.play()
-            self.fade_to(self.target_volume, fade_in_duration)
+            self.fade_to(self.target_volume, fade_in_duration,
+                         curve="equal_power" if crossfade else None)
         else:
             self.player.setVolume(self.target_volume)
             self.player.play()
 
+    def cancel_trace(self):
+        if self.trace is not None:
+            self.latency.cancel(self.trace)
+        self.trace = None
+        self.traced = None
+
+    def _mark_playing(self, source):
+        if self.trace is not None and source is self.traced:
+            self.latency.mark(self.trace, "playing")
+            self.trace = None
+            self.traced = None
+
+    def _on_state_changed(self, player, state):
+        if state == QMediaPlayer.PlayingState:
+            self._mark_playing(player)
+
+    def _on_effect_playing(self, effect):
+        if effect.isPlaying():
+            self._mark_playing(effect)
+
+    def stop_effect(self):
+        if self.active_effect is not None:
+            self.active_effect.stop()
+            self.active_effect = None
+
     def stop(self, fade_out_duration=0):
+        self.stop_effect()
+        if self._player is None:
+            return
         if fade_out_duration > 0 and self.player.state() == QMediaPlayer.PlayingState:
             self.fade_to(0, fade_out_duration, stop_after=True)
         else:
+            self.fades.pop(self._player, None)
             self.player.stop()
 
     def set_volume(self, volume):
         self.target_volume = volume
-        if not self.fade_timer.isActive():
-            self.player.setVolume(volume)
+        if self._player is not None and self._player not in self.fades:
+            self._player.setVolume(volume)
+        if self.active_effect is not None:
+            self.active_effect.setVolume(volume / 100.0)
 
-    def fade_to(self, target_vol, duration, stop_after=False):
-        current_vol = self.player.volume()
-        diff = target_vol - current_vol
-        if diff == 0:
+    def fade_to(self, target_vol, duration, stop_after=False, player=None, curve=None):
+        player = player or self.player
+        current_vol = player.volume()
+        if current_vol == target_vol or duration <= 0:
+            self.fades.pop(player, None)
+            player.setVolume(target_vol)
             if stop_after:
-                self.player.stop()
+                player.stop()
             return
 
-        steps = duration / 50
-        if steps <= 0:
-            self.player.setVolume(target_vol)
-            if stop_after:
-                self.player.stop()
-            return
-            
-        self.fade_step = diff / steps
-        self.fade_target = target_vol
-        self.stop_after_fade = stop_after
-        self.fade_timer.start()
-
-    def _update_fade(self):
-        current_vol = self.player.volume()
-        new_vol = current_vol + self.fade_step
-        
-        # Check bounds
-        if (self.fade_step > 0 and new_vol >= self.fade_target) or \
-           (self.fade_step < 0 and new_vol <= self.fade_target):
-            self.player.setVolume(int(self.fade_target))
+        # The volume follows the elapsed time, so the fade takes exactly
+        # duration ms however late the timer fires
+        self.fades[player] = (Fade(current_vol, target_vol, duration, curve or self.fade_curve), stop_after)
+        self._update_fades()
+
+    def _update_fades(self):
+        delay = None
+        for player, (fade, stop_after) in list(self.fades.items()):
+            now = fade.clock()
+            volume = int(round(fade.volume(now)))
+            if volume != player.volume():
+                player.setVolume(volume)
+            if fade.done(now):
+                del self.fades[player]
+                if stop_after:
+                    player.stop()
+                continue
+            wait = fade.next_update_ms(now)
+            delay = wait if delay is None else min(delay, wait)
+        if delay is None:
             self.fade_timer.stop()
-            if self.stop_after_fade:
-                self.player.stop()
         else:
-            self.player.setVolume(int(new_vol))
+            self.fade_timer.start(delay)
@@ -0,0 +1,35 @@
+import time
+
+NS_PER_MS = 1000000
+
+class MonotonicClock:
+    """Real clock backed by time.monotonic_ns()."""
+    __slots__ = ()
+    now_ns = staticmethod(time.monotonic_ns)
+
+class VirtualClock:
+    """
+    Manually advanced clock for tests and simulations. Time only moves when
+    advance() or set() is called.
+    """
+    __slots__ = ("_now",)
+
+    def __init__(self, start_ns=0):
+        self._now = start_ns
+
+    def now_ns(self):
+        return self._now
+
+    def advance(self, delta_ns):
+        if delta_ns < 0:
+            raise ValueError("A monotonic clock cannot go backwards")
+        self._now += delta_ns
+        return self._now
+
+    def advance_ms(self, delta_ms):
+        return self.advance(int(delta_ms * NS_PER_MS))
+
+    def set(self, now_ns):
+        return self.advance(now_ns - self._now)
+
+MONOTONIC_CLOCK = MonotonicClock()
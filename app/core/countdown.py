@@ -0,0 +1,285 @@
+"""
+Qt-free countdown state machine.
+
+Countdown holds the timing state (deadline, threshold schedule, tick
+granularity) and reports what happens through plain callbacks. It never
+sleeps or arms timers itself: whenever its next wakeup changes it calls
+on_schedule(due_ns) and a driver calls tick() at that time. The Qt signal
+adapter (app.core.timer), the TimerPool and the asyncio driver
+(app.core.async_driver) are such drivers.
+"""
+import bisect
+
+from app.core.clock import MONOTONIC_CLOCK, NS_PER_MS
+
+# The flash cycle is phase-locked to the deadline: it toggles on whole
+# half seconds of remaining time and is off for the first half second.
+FLASH_HALF_PERIOD_NS = 500 * NS_PER_MS
+
+# Threshold event kinds, in firing order for equal thresholds
+EVENT_ALERT = 0
+EVENT_FLASH = 1
+EVENT_FINISH = 2
+
+def compile_schedule(alert_times_ms, flash_start_ms):
+    """
+    Compile a preset's thresholds into a list of (remaining_ms, kind) events,
+    sorted in the order they fire (descending remaining time). The finish
+    event at 0 is always last.
+    """
+    events = [(t, EVENT_ALERT) for t in alert_times_ms if t > 0]
+    if flash_start_ms > 0:
+        events.append((flash_start_ms, EVENT_FLASH))
+    events.sort(key=lambda e: (-e[0], e[1]))
+    events.append((0, EVENT_FINISH))
+    return events
+
+def schedule_keys(events):
+    # Ascending keys for bisect over the descending thresholds
+    return [-threshold for threshold, _ in events]
+
+def next_change_ns(remaining_ns, steps_ns, thresholds_ns):
+    """
+    Return the remaining time (ns) at which the visible output or a threshold
+    changes next, i.e. the largest boundary strictly below remaining_ns.
+    steps_ns: (step, offset) granularities of the visible output (display,
+    progress bar); it changes at offset + k * step.
+    thresholds_ns: pending one-off thresholds (alert, flash, finish).
+    """
+    target = 0 # Finish
+    for step, offset in steps_ns:
+        if step > 0:
+            boundary = offset + ((remaining_ns - offset - 1) // step) * step
+            if boundary > target:
+                target = boundary
+    for threshold in thresholds_ns:
+        if threshold >= remaining_ns:
+            # Already crossed (e.g. an alert longer than the duration)
+            return remaining_ns
+        if threshold > target:
+            target = threshold
+    return target
+
+def _noop(*args):
+    pass
+
+class Countdown:
+    __slots__ = ("duration", "flash_start_time", "alert_times", "is_running",
+                 "deadline_ns", "paused_remaining_ns", "events", "event_keys",
+                 "event_index", "flashing", "flash_state", "tick_steps_ns", "clock",
+                 "last_event_ns", "event_crossed",
+                 "on_update", "on_finished", "on_alert", "on_flash", "on_schedule",
+                 "__weakref__") # Qt signals hold bound methods weakly
+
+    def __init__(self, on_update=None, on_finished=None, on_alert=None,
+                 on_flash=None, on_schedule=None, clock=None):
+        self.duration = 0 # milliseconds
+        self.flash_start_time = 5000 # Start flashing at last 5 seconds
+        self.alert_times = [] # milliseconds
+        self.is_running = False
+
+        # While running, the countdown ends at an absolute monotonic deadline
+        # and the remaining time is derived from it. While paused, the
+        # remaining time is frozen and resuming shifts the deadline.
+        self.deadline_ns = 0
+        self.paused_remaining_ns = 0
+
+        # Threshold events compiled by set_config; only the event at
+        # event_index is pending, everything before it has fired.
+        self.events = compile_schedule([], 0)
+        self.event_keys = schedule_keys(self.events)
+        self.event_index = 0
+        self.flashing = False # Inside the flash window
+        self.flash_state = False # Currently flashed on
+        # Ideal clock time of the event being reported (threshold or flash
+        # boundary), valid inside the callbacks; used for latency tracing
+        self.last_event_ns = 0
+        # True when last_event_ns is a threshold crossed by tick(), False
+        # when it is just the time of a start or seek
+        self.event_crossed = False
+
+        self.tick_steps_ns = [(1000 * NS_PER_MS, 0)]
+        # Time source (ns), e.g. MonotonicClock or a VirtualClock in tests
+        self.clock = (clock or MONOTONIC_CLOCK).now_ns
+
+        self.on_update = on_update or _noop # (remaining_ms)
+        self.on_finished = on_finished or _noop # ()
+        self.on_alert = on_alert or _noop # ()
+        self.on_flash = on_flash or _noop # (state), flash on/off changed
+        self.on_schedule = on_schedule or _noop # (due_ns or None), next tick() time
+
+    @property
+    def remaining(self):
+        # Remaining milliseconds, computed on demand
+        return self.remaining_ns() // NS_PER_MS
+
+    def remaining_ns(self):
+        if self.is_running:
+            return max(0, self.deadline_ns - self.clock())
+        return self.paused_remaining_ns
+
+    def set_config(self, duration_seconds, alert_seconds=0, flash_seconds=5):
+        # alert_seconds may be a single value or a list of alert times
+        if not isinstance(alert_seconds, (list, tuple)):
+            alert_seconds = [alert_seconds]
+        self.duration = duration_seconds * 1000
+        self.alert_times = [int(s * 1000) for s in alert_seconds if s]
+        self.flash_start_time = flash_seconds * 1000
+        self.events = compile_schedule(self.alert_times, self.flash_start_time)
+        self.event_keys = schedule_keys(self.events)
+        self.reset()
+
+    def set_tick_steps(self, steps_ms):
+        """
+        Set the granularities (ms, may be fractional) at which the displayed
+        output changes, e.g. 1000 for whole seconds or the duration covered
+        by one progress bar pixel. A (step, offset) pair changes at
+        offset + k * step instead of whole multiples.
+        """
+        steps_ns = []
+        for step in steps_ms:
+            step, offset = step if isinstance(step, tuple) else (step, 0)
+            if step > 0:
+                steps_ns.append((int(step * NS_PER_MS), int(offset * NS_PER_MS)))
+        self.tick_steps_ns = steps_ns
+        if self.is_running:
+            now = self.clock()
+            self._schedule(now, self.deadline_ns - now)
+
+    def start(self):
+        if self.is_running or self.paused_remaining_ns <= 0:
+            return
+        now = self.clock()
+        self.deadline_ns = now + self.paused_remaining_ns
+        self.is_running = True
+        self.last_event_ns = now
+        self.event_crossed = False
+        self._update_flash(self.paused_remaining_ns)
+        self._schedule(now, self.paused_remaining_ns)
+
+    def start_chained(self):
+        """
+        Start right where the previous run finished: the new deadline is the
+        old deadline plus the configured duration, so the time spent handling
+        the finish is not lost between back-to-back runs.
+        """
+        if self.is_running or self.paused_remaining_ns <= 0:
+            return
+        if not self.deadline_ns:
+            self.start()
+            return
+        now = self.clock()
+        self.deadline_ns += self.paused_remaining_ns
+        self.is_running = True
+        remaining_ns = max(0, self.deadline_ns - now)
+        self.event_index = bisect.bisect_left(self.event_keys, -(remaining_ns // NS_PER_MS))
+        self.flashing = 0 < self.flash_start_time and remaining_ns < self.flash_start_time * NS_PER_MS
+        self.last_event_ns = now
+        self.event_crossed = False
+        self._update_flash(remaining_ns)
+        self._schedule(now, remaining_ns)
+
+    def pause(self):
+        if self.is_running:
+            self.paused_remaining_ns = max(0, self.deadline_ns - self.clock())
+            self.is_running = False
+            self.on_schedule(None)
+            self._set_flash(False)
+
+    def toggle(self):
+        if self.is_running:
+            self.pause()
+        else:
+            self.start()
+
+    def reset(self):
+        self.pause()
+        self.paused_remaining_ns = self.duration * NS_PER_MS
+        self.event_index = 0
+        self.flashing = False
+        self.on_update(self.remaining)
+
+    def seek(self, remaining_ms):
+        """
+        Jump to the given remaining time. Thresholds above it count as passed
+        and are not fired retroactively.
+        """
+        remaining_ms = max(0, min(self.duration, int(remaining_ms)))
+        remaining_ns = remaining_ms * NS_PER_MS
+        now = self.clock()
+        if self.is_running:
+            self.deadline_ns = now + remaining_ns
+        else:
+            self.paused_remaining_ns = remaining_ns
+        # Events strictly above the new remaining time have passed
+        self.event_index = bisect.bisect_left(self.event_keys, -remaining_ms)
+        self.flashing = 0 < self.flash_start_time and remaining_ms < self.flash_start_time
+        if self.is_running:
+            self.last_event_ns = now
+            self.event_crossed = False
+            self._update_flash(remaining_ns)
+            self._schedule(now, remaining_ns)
+        self.on_update(remaining_ms)
+
+    def tick(self, now=None):
+        if not self.is_running:
+            return
+        if now is None:
+            now = self.clock()
+
+        remaining_ns = self.deadline_ns - now
+        remaining = remaining_ns // NS_PER_MS
+
+        # Fire every threshold event that has been reached; only the next
+        # pending one needs to be compared.
+        events = self.events
+        while remaining <= events[self.event_index][0]:
+            threshold, kind = events[self.event_index]
+            self.last_event_ns = self.deadline_ns - threshold * NS_PER_MS
+            self.event_crossed = True
+            if kind == EVENT_FINISH:
+                remaining = 0
+                self.is_running = False
+                self.paused_remaining_ns = 0
+                self.on_schedule(None)
+                self._set_flash(False)
+                self.on_finished()
+                break
+            self.event_index += 1
+            if kind == EVENT_ALERT:
+                self.on_alert()
+            elif kind == EVENT_FLASH:
+                self.flashing = True
+        else:
+            if self.flashing:
+                # The half second boundary just crossed
+                half = (remaining_ns - 1) // FLASH_HALF_PERIOD_NS + 1
+                self.last_event_ns = self.deadline_ns - half * FLASH_HALF_PERIOD_NS
+                self.event_crossed = True
+            self._update_flash(remaining_ns)
+            self._schedule(now, remaining_ns)
+
+        self.on_update(int(remaining))
+
+    def _update_flash(self, remaining_ns):
+        if self.flashing:
+            # Same boundary convention as the display: a half second starts
+            # at exactly k * 500 ms remaining
+            self._set_flash(((remaining_ns - 1) // FLASH_HALF_PERIOD_NS) % 2 == 0)
+        elif self.flash_state:
+            # Moved out of the flash window (seek)
+            self._set_flash(False)
+
+    def _set_flash(self, state):
+        if state != self.flash_state:
+            self.flash_state = state
+            self.on_flash(state)
+
+    def _schedule(self, now, remaining_ns):
+        steps = self.tick_steps_ns
+        if self.flashing:
+            # Flash toggles are just another boundary of the same schedule
+            steps = steps + [(FLASH_HALF_PERIOD_NS, 0)]
+        threshold_ns = self.events[self.event_index][0] * NS_PER_MS
+        target = next_change_ns(remaining_ns, steps, (threshold_ns,))
+        self.on_schedule(now + remaining_ns - target)
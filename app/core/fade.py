@@ -0,0 +1,80 @@
+"""
+Clock-driven volume fades.
+
+A Fade computes the volume from the elapsed monotonic time rather than
+stepping it per timer tick, so a fade always ends exactly after its
+duration however late the event loop wakes up. It also tells the driver
+when the (integer) volume will next change, so updates that would not be
+audible are skipped. Qt-free; AudioPlayer drives it with a QTimer.
+"""
+import math
+
+from app.core.clock import MONOTONIC_CLOCK, NS_PER_MS
+
+# Bounds for the update interval, in ms
+MIN_INTERVAL_MS = 10
+MAX_INTERVAL_MS = 100
+
+# Volume scale of QMediaPlayer (0-100); a change below one unit is inaudible
+VOLUME_STEP = 1
+
+def linear(x):
+    return x
+
+def logarithmic(x):
+    # Linear in decibels over a 60 dB range, which sounds even to the ear
+    return (10 ** (3 * x) - 1) / 999
+
+def equal_power(x):
+    # sin/cos pair whose powers sum to one, for crossfades without a dip
+    return math.sin(x * math.pi / 2)
+
+CURVES = {
+    "linear": linear,
+    "log": logarithmic,
+    "equal_power": equal_power,
+}
+
+class Fade:
+    __slots__ = ("start_volume", "end_volume", "start_ns", "duration_ns", "curve", "clock")
+
+    def __init__(self, start_volume, end_volume, duration_ms, curve="linear", clock=None):
+        self.start_volume = start_volume
+        self.end_volume = end_volume
+        self.clock = (clock or MONOTONIC_CLOCK).now_ns
+        self.start_ns = self.clock()
+        self.duration_ns = max(0, int(duration_ms * NS_PER_MS))
+        self.curve = CURVES.get(curve, linear)
+
+    def progress(self, now=None):
+        if self.duration_ns <= 0:
+            return 1.0
+        if now is None:
+            now = self.clock()
+        return min(1.0, max(0.0, (now - self.start_ns) / self.duration_ns))
+
+    def done(self, now=None):
+        return self.progress(now) >= 1.0
+
+    def volume(self, now=None):
+        """Volume at now; fades out mirror the fade-in shape of the curve."""
+        p = self.progress(now)
+        if self.end_volume >= self.start_volume:
+            return self.start_volume + (self.end_volume - self.start_volume) * self.curve(p)
+        return self.end_volume + (self.start_volume - self.end_volume) * self.curve(1.0 - p)
+
+    def next_update_ms(self, now=None):
+        """
+        Delay until the volume has moved by about one step, estimated from
+        the local slope and clamped to [MIN_INTERVAL_MS, MAX_INTERVAL_MS].
+        """
+        if now is None:
+            now = self.clock()
+        remaining_ms = (self.start_ns + self.duration_ns - now) / NS_PER_MS
+        if remaining_ms <= 0:
+            return 0
+        probe_ns = MIN_INTERVAL_MS * NS_PER_MS
+        slope = abs(self.volume(now + probe_ns) - self.volume(now)) / MIN_INTERVAL_MS # per ms
+        interval = VOLUME_STEP / slope if slope > 0 else MAX_INTERVAL_MS
+        interval = max(MIN_INTERVAL_MS, min(MAX_INTERVAL_MS, interval))
+        return int(math.ceil(min(interval, remaining_ms)))
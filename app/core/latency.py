@@ -0,0 +1,132 @@
+"""
+End-to-end latency of alerts and flashes.
+
+Each alert or flash-on opens a trace at its ideal time, the instant the
+threshold is crossed on the countdown's monotonic clock. Later stages mark
+the trace, and every mark records (stage time - ideal time) into a
+per-stage histogram:
+
+  alert: crossing (CountdownTimer tick), signal (alert handler),
+         play (AudioPlayer.play), playing (player reports PlayingState)
+  flash: crossing, signal (flash handler), paint (first background paint)
+
+Only one trace per kind is open at a time; a mark without an open trace
+costs a dict lookup. Qt-free.
+"""
+import bisect
+import csv
+import json
+
+from app.core.clock import MONOTONIC_CLOCK, NS_PER_MS
+
+STAGES = {
+    "alert": ("crossing", "signal", "play", "playing"),
+    "flash": ("crossing", "signal", "paint"),
+}
+
+# Histogram bucket upper bounds, in ms; the last bucket is open ended
+BUCKETS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Raw samples kept per stage for exact percentiles
+MAX_SAMPLES = 100000
+
+def percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+class Histogram:
+    __slots__ = ("counts", "samples", "count", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.samples = []
+        self.count = 0
+        self.max_ns = 0
+
+    def add(self, latency_ns):
+        self.count += 1
+        self.counts[bisect.bisect_left(BUCKETS_MS, latency_ns / NS_PER_MS)] += 1
+        if latency_ns > self.max_ns:
+            self.max_ns = latency_ns
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(latency_ns)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "p50_ms": percentile(ordered, 50) / NS_PER_MS,
+            "p99_ms": percentile(ordered, 99) / NS_PER_MS,
+            "max_ms": self.max_ns / NS_PER_MS,
+            "buckets": [{"le_ms": bound, "count": n}
+                        for bound, n in zip(BUCKETS_MS + (None,), self.counts)],
+        }
+
+class LatencyRecorder:
+    __slots__ = ("enabled", "clock", "open", "histograms")
+
+    def __init__(self, clock=None, enabled=True):
+        self.enabled = enabled
+        # Must be the countdown's clock, the ideal times come from it
+        self.clock = (clock or MONOTONIC_CLOCK).now_ns
+        self.reset()
+
+    def reset(self):
+        self.open = {} # kind -> [ideal_ns, marked stages]
+        self.histograms = {} # (kind, stage) -> Histogram
+
+    def begin(self, kind, ideal_ns, now=None):
+        """Open a trace whose ideal time is ideal_ns and mark 'crossing'."""
+        if not self.enabled:
+            return
+        self.open[kind] = [ideal_ns, set()]
+        self.mark(kind, "crossing", now)
+
+    def mark(self, kind, stage, now=None):
+        trace = self.open.get(kind)
+        if trace is None or stage in trace[1]:
+            return
+        if now is None:
+            now = self.clock()
+        trace[1].add(stage)
+        histogram = self.histograms.get((kind, stage))
+        if histogram is None:
+            histogram = self.histograms[(kind, stage)] = Histogram()
+        histogram.add(max(0, now - trace[0]))
+        if stage == STAGES[kind][-1]:
+            del self.open[kind]
+
+    def cancel(self, kind):
+        # Drop an open trace whose remaining stages will never happen, e.g.
+        # an alert without music
+        self.open.pop(kind, None)
+
+    def snapshot(self):
+        """{kind: {stage: summary}} with stages in pipeline order."""
+        result = {}
+        for kind, stages in STAGES.items():
+            for stage in stages:
+                histogram = self.histograms.get((kind, stage))
+                if histogram is not None:
+                    result.setdefault(kind, {})[stage] = histogram.summary()
+        return result
+
+    def export(self, path):
+        """Write the histograms as JSON, or as CSV rows if path ends in .csv."""
+        snapshot = self.snapshot()
+        if path.lower().endswith(".csv"):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(("kind", "stage", "count", "p50_ms", "p99_ms", "max_ms", "bucket_le_ms", "bucket_count"))
+                for kind, stages in snapshot.items():
+                    for stage, s in stages.items():
+                        for bucket in s["buckets"]:
+                            writer.writerow((kind, stage, s["count"], f"{s['p50_ms']:.3f}",
+                                             f"{s['p99_ms']:.3f}", f"{s['max_ms']:.3f}",
+                                             bucket["le_ms"] if bucket["le_ms"] is not None else "inf",
+                                             bucket["count"]))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, indent=4)
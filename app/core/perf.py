@@ -0,0 +1,125 @@
+import functools
+import os
+import sys
+import time
+
+class PerfCounters:
+    """
+    Cheap runtime counters for the performance HUD and automated tests.
+    Nothing is recorded while disabled; the only cost is the enabled check.
+    """
+    __slots__ = ("enabled", "counts", "timings", "lag", "started_ns")
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.counts = {} # name -> count
+        self.timings = {} # name -> [count, total_ns, max_ns]
+        self.lag = [0, 0, 0] # count, total_ns, max_ns
+        self.started_ns = time.perf_counter_ns()
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def record(self, name, elapsed_ns):
+        entry = self.timings.get(name)
+        if entry is None:
+            self.timings[name] = [1, elapsed_ns, elapsed_ns]
+            return
+        entry[0] += 1
+        entry[1] += elapsed_ns
+        if elapsed_ns > entry[2]:
+            entry[2] = elapsed_ns
+
+    def record_lag(self, lag_ns):
+        lag = self.lag
+        lag[0] += 1
+        lag[1] += lag_ns
+        if lag_ns > lag[2]:
+            lag[2] = lag_ns
+
+    def snapshot(self, reset=False):
+        """
+        Return rates since the last reset, timings in milliseconds and the
+        resident memory. With reset=True a new measurement window starts.
+        """
+        elapsed = max(1e-9, (time.perf_counter_ns() - self.started_ns) / 1e9)
+        timings = {}
+        for name, (count, total, peak) in self.timings.items():
+            timings[name] = {
+                "count": count,
+                "avg_ms": total / count / 1e6,
+                "max_ms": peak / 1e6,
+            }
+        tick = self.timings.get("update_time_display")
+        lag_count, lag_total, lag_max = self.lag
+        result = {
+            "seconds": elapsed,
+            "ticks_per_s": (tick[0] if tick else 0) / elapsed,
+            "paints_per_s": self.counts.get("paint", 0) / elapsed,
+            "counts": dict(self.counts),
+            "timings": timings,
+            "loop_lag_ms": {
+                "avg": lag_total / lag_count / 1e6 if lag_count else 0.0,
+                "max": lag_max / 1e6,
+            },
+            "rss_bytes": resident_memory_bytes(),
+        }
+        if reset:
+            self.reset()
+        return result
+
+def timed(name):
+    """
+    Method decorator recording the call duration into self.perf when the
+    counters are enabled.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            perf = self.perf
+            if not perf.enabled:
+                return func(self, *args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                perf.record(name, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+def resident_memory_bytes():
+    """Resident set size of this process, or 0 if it cannot be determined."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD),
+                            ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t),
+                            ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t),
+                            ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return 0
+        if os.path.exists("/proc/self/statm"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        import resource
+        # ru_maxrss is the peak, in bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        return 0
@@ -0,0 +1,150 @@
+import heapq
+import itertools
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, Qt
+
+from app.core.clock import MONOTONIC_CLOCK
+from app.core.countdown import Countdown, NS_PER_MS
+
+class PooledCountdown(QObject):
+    """
+    A countdown owned by a TimerPool. It has the same signals as
+    CountdownTimer but no QTimer of its own: the pool wakes it up.
+    """
+    time_updated = pyqtSignal(int)  # Remaining milliseconds
+    finished = pyqtSignal()
+    alert_triggered = pyqtSignal()
+    flash_triggered = pyqtSignal(bool)
+
+    def __init__(self, pool, name):
+        super().__init__()
+        self.pool = pool
+        self.name = name
+        self.core = Countdown(on_update=self.time_updated.emit,
+                              on_finished=self.finished.emit,
+                              on_alert=self.alert_triggered.emit,
+                              on_flash=self.flash_triggered.emit,
+                              on_schedule=self._on_schedule,
+                              clock=pool.clock)
+        # Bumped whenever the pending wakeup is invalidated, so stale heap
+        # entries can be skipped instead of searched for and removed.
+        self.generation = 0
+
+    @property
+    def is_running(self):
+        return self.core.is_running
+
+    @property
+    def remaining(self):
+        return self.core.remaining
+
+    @property
+    def flash_state(self):
+        return self.core.flash_state
+
+    def remaining_ns(self):
+        return self.core.remaining_ns()
+
+    def set_config(self, duration_seconds, alert_seconds=0, flash_seconds=5):
+        self.core.set_config(duration_seconds, alert_seconds, flash_seconds)
+
+    def set_tick_steps(self, steps_ms):
+        self.core.set_tick_steps(steps_ms)
+
+    def start(self):
+        self.core.start()
+
+    def pause(self):
+        self.core.pause()
+
+    def toggle(self):
+        self.core.toggle()
+
+    def reset(self):
+        self.core.reset()
+
+    def seek(self, remaining_ms):
+        self.core.seek(remaining_ms)
+
+    def _on_schedule(self, due_ns):
+        self.generation += 1
+        if due_ns is not None:
+            self.pool._push(self, due_ns, self.generation)
+
+class TimerPool(QObject):
+    """
+    Runs many named countdowns from a single OS timer. Upcoming wakeups of
+    all countdowns (tick boundaries, alert, flash, finish) are kept in one
+    heap ordered by due time, and only the earliest one is armed.
+    """
+    def __init__(self, clock=None):
+        super().__init__()
+        self.clock = clock or MONOTONIC_CLOCK
+        self.timers = {}
+        self._heap = [] # (due_ns, seq, generation, countdown)
+        self._seq = itertools.count()
+        self._armed_ns = None
+        self._dispatching = False
+        self.wakeups = 0
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def create(self, name, duration_seconds, alert_seconds=0, flash_seconds=5):
+        if name in self.timers:
+            raise KeyError(f"Timer already exists: {name}")
+        countdown = PooledCountdown(self, name)
+        countdown.set_config(duration_seconds, alert_seconds, flash_seconds)
+        self.timers[name] = countdown
+        return countdown
+
+    def get(self, name):
+        return self.timers.get(name)
+
+    def remove(self, name):
+        countdown = self.timers.pop(name, None)
+        if countdown is not None:
+            countdown.pause()
+        return countdown
+
+    def __len__(self):
+        return len(self.timers)
+
+    def __contains__(self, name):
+        return name in self.timers
+
+    def _push(self, countdown, due_ns, generation):
+        heapq.heappush(self._heap, (due_ns, next(self._seq), generation, countdown))
+        # While dispatching, the timer is re-armed once at the end
+        if not self._dispatching and (self._armed_ns is None or due_ns < self._armed_ns):
+            self._arm()
+
+    def _arm(self):
+        heap = self._heap
+        # Drop entries invalidated by pause/reset/reschedule
+        while heap and heap[0][2] != heap[0][3].generation:
+            heapq.heappop(heap)
+        if not heap:
+            self._armed_ns = None
+            self._timer.stop()
+            return
+        due_ns = heap[0][0]
+        self._armed_ns = due_ns
+        delay_ms = -(-(due_ns - self.clock.now_ns()) // NS_PER_MS)
+        self._timer.start(max(0, delay_ms))
+
+    def _on_timeout(self):
+        self.wakeups += 1
+        self._armed_ns = None
+        heap = self._heap
+        now = self.clock.now_ns()
+        self._dispatching = True
+        try:
+            while heap and heap[0][0] <= now:
+                _, _, generation, countdown = heapq.heappop(heap)
+                if generation == countdown.generation:
+                    countdown.core.tick(now)
+        finally:
+            self._dispatching = False
+        self._arm()
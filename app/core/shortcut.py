@@ -1,4 +1,3 @@
-import keyboard
 from PyQt5.QtCore import QObject, pyqtSignal
 
 class ShortcutManager(QObject):
@@ -9,6 +8,8 @@ class ShortcutManager(QObject):
         self.hotkeys = {}
 
     def register(self, action_name, key_sequence):
+        # Imported on first use; it installs OS hooks and is slow to load
+        import keyboard
         # Remove existing if any
         if action_name in self.hotkeys:
             try:
@@ -28,7 +29,10 @@ class ShortcutManager(QObject):
             print(f"Failed to register hotkey {key_sequence} for {action_name}: {e}")
 
     def clear(self):
+        if not self.hotkeys:
+            return
         try:
+            import keyboard
             keyboard.unhook_all()
             self.hotkeys = {}
         except:
@@ -1,87 +1,96 @@
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
-import time
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, Qt
+
+from app.core.countdown import Countdown, NS_PER_MS
 
 class CountdownTimer(QObject):
+    """
+    Qt signal adapter around the Qt-free Countdown core. It arms a single-shot
+    precise QTimer for the next wakeup the core asks for; display ticks and
+    flash toggles share that one timer.
+    """
     time_updated = pyqtSignal(int)  # Remaining milliseconds
     finished = pyqtSignal()
     alert_triggered = pyqtSignal() # Custom alert time reached
     flash_triggered = pyqtSignal(bool) # Flash state (True/False)
 
-    def __init__(self):
+    def __init__(self, clock=None):
         super().__init__()
-        self.duration = 0 # milliseconds
-        self.remaining = 0 # milliseconds
-        self.is_running = False
+        self.core = Countdown(on_update=self.time_updated.emit,
+                              on_finished=self.finished.emit,
+                              on_alert=self._on_alert,
+                              on_flash=self._on_flash,
+                              on_schedule=self._on_schedule,
+                              clock=clock)
+
+        # Single-shot scheduler: instead of a fixed 50Hz tick, the timer is
+        # armed for the next moment the visible output can change.
         self.timer = QTimer()
-        self.timer.timeout.connect(self._on_tick)
-        self.last_time = 0
-        
-        self.alert_time = 0 # milliseconds
-        self.alert_triggered_flag = False
-        
-        # Flash logic
-        self.flash_timer = QTimer()
-        self.flash_timer.timeout.connect(self._on_flash)
-        self.flash_state = False
-        self.flash_start_time = 5000 # Start flashing at last 5 seconds
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.core.tick)
+
+        # Optional LatencyRecorder; alert and flash-on traces start here
+        self.latency = None
+
+    @property
+    def is_running(self):
+        return self.core.is_running
+
+    @property
+    def duration(self):
+        return self.core.duration
+
+    @property
+    def remaining(self):
+        return self.core.remaining
+
+    @property
+    def flash_state(self):
+        return self.core.flash_state
+
+    def remaining_ns(self):
+        return self.core.remaining_ns()
 
     def set_config(self, duration_seconds, alert_seconds=0, flash_seconds=5):
-        self.duration = duration_seconds * 1000
-        self.alert_time = alert_seconds * 1000
-        self.flash_start_time = flash_seconds * 1000
-        self.reset()
+        self.core.set_config(duration_seconds, alert_seconds, flash_seconds)
+
+    def set_tick_steps(self, steps_ms):
+        self.core.set_tick_steps(steps_ms)
 
     def start(self):
-        if self.remaining <= 0:
-            return
-        self.is_running = True
-        self.last_time = time.time()
-        self.timer.start(20) # 50Hz update rate
+        self.core.start()
+
+    def start_chained(self):
+        self.core.start_chained()
 
     def pause(self):
-        self.is_running = False
-        self.timer.stop()
-        self.flash_timer.stop()
-        self.flash_triggered.emit(False) # Reset flash
+        self.core.pause()
 
     def toggle(self):
-        if self.is_running:
-            self.pause()
-        else:
-            self.start()
+        self.core.toggle()
 
     def reset(self):
-        self.pause()
-        self.remaining = self.duration
-        self.alert_triggered_flag = False
-        self.time_updated.emit(int(self.remaining))
+        self.core.reset()
 
-    def _on_tick(self):
-        if not self.is_running:
-            return
+    def seek(self, remaining_ms):
+        self.core.seek(remaining_ms)
 
-        current_time = time.time()
-        elapsed = (current_time - self.last_time) * 1000
-        self.last_time = current_time
-        
-        self.remaining -= elapsed
-        
-        # Check alerts
-        if self.alert_time > 0 and self.remaining <= self.alert_time and not self.alert_triggered_flag:
-            self.alert_triggered_flag = True
-            self.alert_triggered.emit()
-
-        # Check flash
-        if self.remaining <= self.flash_start_time and not self.flash_timer.isActive():
-            self.flash_timer.start(500) # Flash every 500ms
-
-        if self.remaining <= 0:
-            self.remaining = 0
-            self.pause()
-            self.finished.emit()
-        
-        self.time_updated.emit(int(self.remaining))
-
-    def _on_flash(self):
-        self.flash_state = not self.flash_state
-        self.flash_triggered.emit(self.flash_state)
+    def _on_alert(self):
+        if self.latency is not None:
+            self.latency.begin("alert", self.core.last_event_ns)
+        self.alert_triggered.emit()
+
+    def _on_flash(self, state):
+        # Only flash-on changes crossed by a tick have an ideal time; a
+        # start or seek inside the flash window is not traced
+        if state and self.latency is not None and self.core.event_crossed:
+            self.latency.begin("flash", self.core.last_event_ns)
+        self.flash_triggered.emit(state)
+
+    def _on_schedule(self, due_ns):
+        if due_ns is None:
+            self.timer.stop()
+            return
+        # Round up so that we never wake before the boundary
+        delay_ms = -(-(due_ns - self.core.clock()) // NS_PER_MS)
+        self.timer.start(max(0, delay_ms))
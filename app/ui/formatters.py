@@ -0,0 +1,84 @@
+class TimeFormatter:
+    """
+    Turns remaining milliseconds into the display string for one format.
+    Resolved once from the display.format setting, not on every tick.
+    """
+    __slots__ = ("total_ms",)
+
+    def __init__(self, total_ms=0):
+        self.total_ms = total_ms
+
+    def format(self, remaining_ms):
+        raise NotImplementedError
+
+    def tick_step_ms(self):
+        # How much remaining time one change of the output corresponds to,
+        # or a (step, offset) pair if it does not change at whole multiples
+        return 1000
+
+class MinSecFormatter(TimeFormatter):
+    __slots__ = ()
+
+    def format(self, remaining_ms):
+        seconds = (remaining_ms + 999) // 1000
+        return f"{seconds // 60:02}:{seconds % 60:02}"
+
+class SecondsFormatter(TimeFormatter):
+    __slots__ = ()
+
+    def format(self, remaining_ms):
+        return f"{(remaining_ms + 999) // 1000}"
+
+class PercentFormatter(TimeFormatter):
+    __slots__ = ()
+
+    def format(self, remaining_ms):
+        if self.total_ms > 0:
+            # Tenths of a percent, rounded half down so that the text
+            # changes exactly at the half points below
+            tenths = (2000 * remaining_ms + self.total_ms - 1) // (2 * self.total_ms)
+            return f"{tenths // 10}.{tenths % 10}%"
+        return "0.0%"
+
+    def tick_step_ms(self):
+        # One decimal, rounded: the text changes half way through each
+        # 0.1% step, i.e. at the odd multiples of 0.05%
+        step = self.total_ms / 1000
+        return (step, step / 2)
+
+FORMATTERS = {
+    "min_sec": MinSecFormatter,
+    "seconds": SecondsFormatter,
+    "percent": PercentFormatter,
+}
+
+def make_formatter(fmt, total_ms):
+    return FORMATTERS.get(fmt, MinSecFormatter)(total_ms)
+
+class DisplayUpdater:
+    """
+    Pushes formatted text to the display only when it actually changed and
+    counts applied and suppressed updates.
+    """
+    __slots__ = ("apply", "formatter", "text", "applied", "suppressed")
+
+    def __init__(self, apply, formatter=None):
+        self.apply = apply
+        self.formatter = formatter or MinSecFormatter()
+        self.text = None
+        self.applied = 0
+        self.suppressed = 0
+
+    def set_formatter(self, formatter):
+        self.formatter = formatter
+        self.text = None # Force the next update through
+
+    def update(self, remaining_ms):
+        text = self.formatter.format(remaining_ms)
+        if text == self.text:
+            self.suppressed += 1
+            return False
+        self.text = text
+        self.applied += 1
+        self.apply(text)
+        return True
@@ -0,0 +1,95 @@
+from PyQt5.QtCore import QObject, QTimer, QRect, Qt
+
+# Edge hit-test bits
+EDGE_NONE = 0
+EDGE_TOP = 1
+EDGE_BOTTOM = 2
+EDGE_LEFT = 4
+EDGE_RIGHT = 8
+
+EDGE_CURSORS = {
+    EDGE_NONE: Qt.ArrowCursor,
+    EDGE_TOP: Qt.SizeVerCursor,
+    EDGE_BOTTOM: Qt.SizeVerCursor,
+    EDGE_LEFT: Qt.SizeHorCursor,
+    EDGE_RIGHT: Qt.SizeHorCursor,
+    EDGE_TOP | EDGE_LEFT: Qt.SizeFDiagCursor,
+    EDGE_BOTTOM | EDGE_RIGHT: Qt.SizeFDiagCursor,
+    EDGE_TOP | EDGE_RIGHT: Qt.SizeBDiagCursor,
+    EDGE_BOTTOM | EDGE_LEFT: Qt.SizeBDiagCursor,
+}
+
+class EdgeZones:
+    """
+    Resize zones along the window border, precomputed for the current size.
+    Only rebuilt on resize; hit() is a handful of integer comparisons.
+    """
+    __slots__ = ("margin", "top", "bottom", "left", "right")
+
+    def __init__(self, margin=5):
+        self.margin = margin
+        self.rebuild(0, 0)
+
+    def rebuild(self, width, height):
+        self.top = self.margin
+        self.left = self.margin
+        self.bottom = height - self.margin
+        self.right = width - self.margin
+
+    def hit(self, x, y):
+        edges = EDGE_NONE
+        if y < self.top:
+            edges |= EDGE_TOP
+        if y > self.bottom:
+            edges |= EDGE_BOTTOM
+        if x < self.left:
+            edges |= EDGE_LEFT
+        if x > self.right:
+            edges |= EDGE_RIGHT
+        return edges
+
+class GeometryCoalescer(QObject):
+    """
+    Applies window moves/resizes at most once per display frame. The first
+    request after an idle frame is applied immediately; requests arriving
+    within the same frame only replace the pending geometry.
+    """
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self._pending = None
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setTimerType(Qt.PreciseTimer)
+        self._frame_timer.timeout.connect(self._on_frame)
+
+    def request(self, geometry):
+        """geometry: a QRect (resize) or a QPoint (move)."""
+        if self._frame_timer.isActive():
+            self._pending = geometry
+            return
+        self._apply(geometry)
+        self._frame_timer.start(self._frame_interval())
+
+    def flush(self):
+        self._frame_timer.stop()
+        if self._pending is not None:
+            self._apply(self._pending)
+
+    def _on_frame(self):
+        if self._pending is not None:
+            self._apply(self._pending)
+            self._frame_timer.start(self._frame_interval())
+
+    def _apply(self, geometry):
+        self._pending = None
+        if isinstance(geometry, QRect):
+            self.window.setGeometry(geometry)
+        else:
+            self.window.move(geometry)
+
+    def _frame_interval(self):
+        handle = self.window.windowHandle()
+        screen = handle.screen() if handle is not None else None
+        rate = screen.refreshRate() if screen is not None else 0
+        return max(1, int(1000 / rate)) if rate > 0 else 16
@@ -1,49 +1,84 @@
 import sys
 import os
+import time
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QProgressBar, QApplication, QSizeGrip,
+                             QLabel, QPushButton, QApplication, QSizeGrip,
                              QSystemTrayIcon, QMenu, QAction, QStyle)
-from PyQt5.QtCore import Qt, QPoint, pyqtSlot, QRect
+from PyQt5.QtCore import Qt, QPoint, pyqtSlot, pyqtSignal, QRect, QTimer
 from PyQt5.QtGui import QColor, QPalette, QMouseEvent, QIcon, QCursor
 
 from app.config.settings import settings
 from app.core.timer import CountdownTimer
-from app.core.audio import AudioPlayer
 from app.core.shortcut import ShortcutManager
-from app.ui.styles import DARK_THEME, LIGHT_THEME
-from app.ui.settings_dialog import SettingsDialog
+from app.core.perf import PerfCounters, timed
+from app.core.latency import LatencyRecorder
+from app.core.agenda import Agenda, build_slots, format_delta
+from app.ui.styles import DARK_THEME, LIGHT_THEME, TIME_COLOR, BackgroundStyles
+from app.ui.time_display import TimeDisplayWidget
+from app.ui.formatters import DisplayUpdater, make_formatter
+from app.ui.progress import PixelProgressBar
+from app.ui.perf_hud import PerfMonitor, PerfHud
+from app.ui.frameless import (EdgeZones, GeometryCoalescer, EDGE_NONE, EDGE_TOP, EDGE_BOTTOM,
+                              EDGE_LEFT, EDGE_RIGHT, EDGE_CURSORS)
+from app.ui.widgets import BackgroundPanel, FirstPaintFilter
 from app.utils import get_resource_path
 
 class MainWindow(QMainWindow):
+    first_painted = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.settings = settings
         self.timer = CountdownTimer()
-        self.audio = AudioPlayer()
+        # Created on first use, keeps QtMultimedia out of the startup path
+        self._audio = None
+        self.startup_finished = False
         self.shortcuts = ShortcutManager()
+        self.settings_dialog = None # Created on first open
+        # Readable from code (perf.snapshot()); filled while the HUD is shown
+        self.perf = PerfCounters()
+        # Alert/flash latency from threshold crossing to sound and paint
+        self.latency = LatencyRecorder()
+        self.timer.latency = self.latency
         
         self.current_preset_index = 0
+        # Agenda mode: presets played back to back (None when disabled)
+        self.agenda = None
+        self.agenda_status_timer = QTimer(self)
+        self.agenda_status_timer.setInterval(1000)
+        self.agenda_status_timer.timeout.connect(self.update_agenda_status)
         self.drag_position = QPoint()
-        self.resize_margin = 5
-        self.resize_mode = None
+        self.edge_zones = EdgeZones(margin=5)
+        self.hover_edges = EDGE_NONE
+        self.resize_edges = EDGE_NONE
         self.start_geometry = None
+        self.geometry_coalescer = GeometryCoalescer(self)
         
         self.normal_geometry = None
         self.simple_geometry = None
         
         self.is_simple_mode = False
+
+        # Last applied theme / background / font, to skip redundant restyling
+        self.background_styles = BackgroundStyles()
+        self.applied_theme = None
+        self.applied_background = None
+        self.applied_font_size = None
         
         self.init_ui()
         self.connect_signals()
         self.load_settings()
-        self.setup_shortcuts()
+        self.connect_settings()
+
+        # Tray icon and global hotkeys are set up after the first frame
+        self.first_paint_filter = FirstPaintFilter(self, self.on_first_paint)
         
     def init_ui(self):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowSystemMenuHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setMouseTracking(True)
         
-        self.central_widget = QWidget()
+        self.central_widget = BackgroundPanel()
         self.central_widget.setObjectName("CentralWidget")
         self.central_widget.setMouseTracking(True)
         self.setCentralWidget(self.central_widget)
@@ -55,6 +90,10 @@ class MainWindow(QMainWindow):
         self.preset_label = QLabel("预设")
         self.preset_label.setObjectName("PresetLabel")
         header_layout.addWidget(self.preset_label)
+        self.agenda_label = QLabel()
+        self.agenda_label.setObjectName("AgendaLabel")
+        self.agenda_label.hide()
+        header_layout.addWidget(self.agenda_label)
         header_layout.addStretch()
         
         self.btn_min = QPushButton()
@@ -72,33 +111,23 @@ class MainWindow(QMainWindow):
         self.main_layout.addLayout(header_layout)
         
         # Time
-        self.time_container = QWidget()
+        self.time_container = BackgroundPanel()
         self.time_container.setObjectName("TimeContainer")
         self.time_layout = QHBoxLayout(self.time_container)
         self.time_layout.setContentsMargins(5, 5, 5, 5)
         self.time_layout.setSpacing(0)
         
-        self.lbl_min = QLabel("00")
-        self.lbl_min.setObjectName("TimeLabelPart")
-        self.lbl_min.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        
-        self.lbl_sep = QLabel(":")
-        self.lbl_sep.setObjectName("TimeLabelPart")
-        self.lbl_sep.setAlignment(Qt.AlignCenter)
-        
-        self.lbl_sec = QLabel("00")
-        self.lbl_sec.setObjectName("TimeLabelPart")
-        self.lbl_sec.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        
-        self.time_layout.addWidget(self.lbl_min)
-        self.time_layout.addWidget(self.lbl_sep)
-        self.time_layout.addWidget(self.lbl_sec)
+        self.time_display = TimeDisplayWidget()
+        self.time_display.setObjectName("TimeDisplay")
+        self.time_display.set_text("00:00")
+        self.time_layout.addWidget(self.time_display)
+        self.display_updater = DisplayUpdater(self.time_display.set_text)
 
         # Add with alignment to prevent stretching, keeping background tight to text
         self.main_layout.addWidget(self.time_container, 0, Qt.AlignCenter)
         
         # Progress
-        self.progress_bar = QProgressBar()
+        self.progress_bar = PixelProgressBar()
         self.progress_bar.setTextVisible(False)
         self.progress_bar.setFixedHeight(10)
         self.main_layout.addWidget(self.progress_bar)
@@ -135,7 +164,37 @@ class MainWindow(QMainWindow):
         # Resize grip removed in favor of edge resizing
         # self.sizegrip = QSizeGrip(self) ...
 
+        # Performance HUD overlay, hooked in only while visible
+        self.perf_monitor = PerfMonitor(self.perf, [self.central_widget, self.time_container,
+                                                    self.time_display, self.progress_bar], self)
+        self.perf_hud = PerfHud(self.perf_monitor, self, self.latency)
+        self.central_widget.on_paint = self.on_background_painted
+        self.time_container.on_paint = self.on_background_painted
+
+    @property
+    def audio(self):
+        if self._audio is None:
+            from app.core.audio import AudioPlayer
+            self._audio = AudioPlayer()
+            self._audio.latency = self.latency
+            self._audio.set_volume(int(self.settings.model.audio.volume * 100))
+            self._audio.fade_curve = self.settings.model.audio.fade_curve
+        return self._audio
+
+    def on_first_paint(self):
+        self.first_painted.emit()
+        self.finish_startup()
+
+    def finish_startup(self):
         self.init_tray()
+        self.setup_shortcuts()
+        # Pick up config.json changes made outside the app
+        from app.config.watcher import ConfigWatcher
+        self.config_watcher = ConfigWatcher(self.settings, self)
+        # Multimedia is loaded now, off the first-frame path, if there is
+        # anything to play
+        self.startup_finished = True
+        self.preload_audio()
 
     def init_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
@@ -162,55 +221,62 @@ class MainWindow(QMainWindow):
                 self.showNormal()
                 self.activateWindow()
 
-    def update_background(self):
+    def apply_theme(self):
         theme = self.settings.get("theme")
-        opacity = self.settings.get("window.opacity")
-        
-        # Determine base color based on theme
-        # Dark: #2b2b2b (43, 43, 43)
-        # Light: #f0f0f0 (240, 240, 240)
-        if theme == "dark":
-            r, g, b = 43, 43, 43
-        else:
-            r, g, b = 240, 240, 240
-            
-        # Apply transparency ONLY if in Simple Mode (buttons hidden)
-        # We use self.is_simple_mode as the indicator
-        
-        if self.is_simple_mode:
-            alpha = int(opacity * 255)
-            # In Simple Mode, CentralWidget is transparent, TimeContainer has background
-            self.central_widget.setStyleSheet(f"#CentralWidget {{ background-color: transparent; }}")
-            self.time_container.setStyleSheet(f"#TimeContainer {{ background-color: rgba({r}, {g}, {b}, {alpha}); border-radius: 10px; }}")
-        else:
-            alpha = 255 # Fully opaque when not running/paused (Normal Mode)
-            # In Normal Mode, CentralWidget has background, TimeContainer is transparent
-            self.central_widget.setStyleSheet(f"#CentralWidget {{ background-color: rgba({r}, {g}, {b}, {alpha}); border-radius: 10px; }}")
-            self.time_container.setStyleSheet(f"#TimeContainer {{ background-color: transparent; }}")
+        if theme == self.applied_theme:
+            return
+        self.applied_theme = theme
+        self.setStyleSheet(DARK_THEME if theme == "dark" else LIGHT_THEME)
+        self.time_display.set_color(TIME_COLOR.get(theme, TIME_COLOR["light"]))
+
+    @timed("update_background")
+    def update_background(self):
+        # Runs on every flash toggle; reads the typed model directly
+        model = self.settings.model
+        theme = model.theme
+        opacity = model.window.opacity
+        flash_color = model.reminder.flash_color if self.timer.flash_state else None
+
+        # Colors are precomputed per (theme, mode, opacity, flash) and only
+        # repainted when the key changes; no stylesheet is re-parsed.
+        key = (theme, self.is_simple_mode, opacity, flash_color)
+        if key != self.applied_background:
+            self.applied_background = key
+            central, container = self.background_styles.get(*key)
+            self.central_widget.set_background(central)
+            self.time_container.set_background(container)
 
         # Apply Font Size
-        font_size = self.settings.get("display.font_size", 150)
-        font = self.lbl_min.font()
-        font.setPixelSize(font_size)
-        self.lbl_min.setFont(font)
-        self.lbl_sep.setFont(font)
-        self.lbl_sec.setFont(font)
-        
-        # Adjust colon position (padding-bottom) to move it up
-        # Try 15% of font size
-        offset = int(font_size * 0.15)
-        self.lbl_sep.setStyleSheet(f"padding-bottom: {offset}px; background-color: transparent;")
-        self.lbl_min.setStyleSheet("background-color: transparent;")
-        self.lbl_sec.setStyleSheet("background-color: transparent;")
+        font_size = model.display.font_size
+        if font_size != self.applied_font_size:
+            self.applied_font_size = font_size
+            # Rebuilds the glyph atlas once
+            self.time_display.set_font_size(font_size)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        self.edge_zones.rebuild(self.width(), self.height())
+
+    def update_formatter(self):
+        # Resolve the display format once, not on every tick
+        fmt = self.settings.model.display.format
+        self.display_updater.set_formatter(make_formatter(fmt, self.progress_bar.maximum()))
+
+    def update_tick_steps(self):
+        # Tell the timer how often the visible output can actually change,
+        # so it only wakes up when something on screen is different.
+        steps = [self.display_updater.formatter.tick_step_ms()]
+        if not self.progress_bar.isHidden() and not self.settings.model.display.smooth_progress:
+            # Duration covered by one device pixel of the progress bar
+            steps.append(self.progress_bar.ms_per_device_pixel())
+        self.timer.set_tick_steps(steps)
 
     def connect_signals(self):
         self.timer.time_updated.connect(self.update_time_display)
         self.timer.finished.connect(self.on_timer_finished)
         self.timer.alert_triggered.connect(self.on_alert_triggered)
         self.timer.flash_triggered.connect(self.on_flash_triggered)
+        self.progress_bar.metrics_changed.connect(self.update_tick_steps)
         self.shortcuts.triggered.connect(self.on_shortcut_triggered)
 
     def load_settings(self):
@@ -230,15 +296,17 @@ class MainWindow(QMainWindow):
         self.set_topmost(topmost)
         
         # Theme
-        theme = self.settings.get("theme")
-        self.setStyleSheet(DARK_THEME if theme == "dark" else LIGHT_THEME)
+        self.apply_theme()
         
         self.update_background()
+        self.update_formatter()
+        self.progress_bar.set_smooth(self.settings.get("display.smooth_progress", False), self.timer)
         
         # Load presets
-        self.presets = self.settings.get("presets")
+        self.presets = self.settings.model.presets
         if self.presets:
             self.load_preset(0)
+        self.update_agenda()
 
     def setup_shortcuts(self):
         s = self.settings.get("shortcuts")
@@ -251,28 +319,189 @@ class MainWindow(QMainWindow):
         self.shortcuts.register("opacity_up", s.get("opacity_up"))
         self.shortcuts.register("opacity_down", s.get("opacity_down"))
         self.shortcuts.register("mute", s.get("mute"))
+        self.shortcuts.register("perf_hud", s.get("perf_hud"))
 
     def load_preset(self, index):
         if 0 <= index < len(self.presets):
             self.current_preset_index = index
             preset = self.presets[index]
-            self.preset_label.setText(preset["name"])
-            self.timer.set_config(preset["duration"], preset.get("alert_time", 0), preset.get("flash_time", 5))
-            self.progress_bar.setRange(0, preset["duration"] * 1000)
-            self.progress_bar.setValue(preset["duration"] * 1000)
-            self.update_time_display(preset["duration"] * 1000)
+            self.preset_label.setText(preset.name)
+            self.timer.set_config(preset.duration, preset.alerts, preset.flash_time)
+            self.progress_bar.setRange(0, preset.duration * 1000)
+            self.progress_bar.set_remaining(preset.duration * 1000)
+            self.update_formatter()
+            self.update_time_display(preset.duration * 1000)
+            self.update_tick_steps()
+            self.preload_audio()
+
+    def next_preset_index(self):
+        agenda = self.agenda
+        if agenda is not None and agenda.index + 1 < len(agenda):
+            return agenda.slots[agenda.index + 1].preset_index
+        return (self.current_preset_index + 1) % len(self.presets)
+
+    def preload_audio(self):
+        # Have the current and next preset's music and both prompts opened
+        # before they are needed. Skipped until startup has finished.
+        if not self.startup_finished or not self.presets:
+            return
+        audio = self.settings.model.audio
+        paths = [
+            self.presets[self.current_preset_index].music,
+            self.presets[self.next_preset_index()].music,
+            audio.prompt_regular,
+            audio.prompt_confidential,
+        ]
+        # QtMultimedia is only loaded once one of them exists
+        if self._audio is None and not any(p and os.path.exists(get_resource_path(p)) for p in paths):
+            return
+        self.audio.preload(paths)
+
+    def step_preset(self, step):
+        if self.agenda is not None:
+            # In agenda mode the hotkeys move along the agenda
+            self.agenda.seek(self.agenda.index + step)
+            self.load_preset(self.agenda.current.preset_index)
+            self.update_agenda_status()
+        else:
+            self.load_preset((self.current_preset_index + step) % len(self.presets))
 
     def open_settings(self):
-        dialog = SettingsDialog(self)
-        if dialog.exec_():
-            self.load_settings()
-            self.setup_shortcuts()
-            # Reload current preset to reflect changes if any (e.g. music)
-            # But don't reset timer if it's just a setting change?
-            # User might want to change preset params on the fly.
-            # Safe to reload preset if we are not running.
-            if not self.timer.is_running:
-                 self.load_preset(self.current_preset_index)
+        # The dialog is kept after the first open and reloads its values
+        # lazily; saved changes reach the window through the settings
+        # subscribers (connect_settings).
+        if self.settings_dialog is None:
+            from app.ui.settings_dialog import SettingsDialog
+            self.settings_dialog = SettingsDialog(self)
+        self.settings_dialog.refresh()
+        self.settings_dialog.exec_()
+
+    def connect_settings(self):
+        # React only to the settings keys that actually changed
+        self.settings.subscribe("theme", self.on_theme_changed)
+        self.settings.subscribe("window.opacity", self.on_background_changed)
+        self.settings.subscribe("reminder.flash_color", self.on_background_changed)
+        self.settings.subscribe("display", self.on_display_changed)
+        self.settings.subscribe("window.topmost", self.on_topmost_changed)
+        self.settings.subscribe("audio.volume", self.on_volume_changed)
+        self.settings.subscribe("audio.fade_curve", self.on_fade_curve_changed)
+        self.settings.subscribe("audio.prompt_regular", self.on_prompts_changed)
+        self.settings.subscribe("audio.prompt_confidential", self.on_prompts_changed)
+        self.settings.subscribe("shortcuts", self.on_shortcuts_changed)
+        self.settings.subscribe("presets", self.on_presets_changed)
+        self.settings.subscribe("agenda", self.on_agenda_changed)
+
+    def on_theme_changed(self, keys):
+        self.apply_theme()
+        self.update_background()
+
+    def on_background_changed(self, keys):
+        self.update_background()
+
+    def on_display_changed(self, keys):
+        if "display.font_size" in keys:
+            self.update_background()
+        if "display.smooth_progress" in keys:
+            self.progress_bar.set_smooth(self.settings.model.display.smooth_progress, self.timer)
+        if keys & {"display.format", "display.smooth_progress"}:
+            self.update_formatter()
+            self.update_tick_steps()
+            self.update_time_display(self.timer.remaining)
+
+    def on_topmost_changed(self, keys):
+        self.set_topmost(self.settings.model.window.topmost)
+
+    def on_volume_changed(self, keys):
+        # Nothing to do until the player exists
+        if self._audio is not None:
+            self._audio.set_volume(int(self.settings.model.audio.volume * 100))
+
+    def on_fade_curve_changed(self, keys):
+        if self._audio is not None:
+            self._audio.fade_curve = self.settings.model.audio.fade_curve
+
+    def on_prompts_changed(self, keys):
+        self.preload_audio()
+
+    def on_shortcuts_changed(self, keys):
+        shortcuts = self.settings.model.shortcuts
+        for key in keys:
+            action = key[len("shortcuts."):]
+            self.shortcuts.register(action, shortcuts.get(action))
+
+    def on_presets_changed(self, keys):
+        self.presets = self.settings.model.presets
+        if not self.presets:
+            return
+        index = min(self.current_preset_index, len(self.presets) - 1)
+        if self.timer.is_running:
+            # Don't interrupt a running countdown; the new preset values
+            # apply the next time a preset is loaded
+            self.current_preset_index = index
+        else:
+            self.load_preset(index)
+        self.update_agenda()
+
+    def on_agenda_changed(self, keys):
+        self.update_agenda()
+
+    def update_agenda(self):
+        config = self.settings.model.agenda
+        agenda = None
+        now = time.time()
+        if config.enabled and self.presets:
+            agenda = Agenda(build_slots(config.slots, self.presets), now)
+        if not agenda:
+            self.agenda = None
+            self.agenda_label.hide()
+            self.agenda_status_timer.stop()
+            return
+        old = self.agenda
+        self.agenda = agenda
+        if old is not None and old.started:
+            # Rebuilt while in use (settings change, hot reload): keep the
+            # position and the wall clock anchor
+            agenda.seek(old.index)
+            agenda.started = True
+            agenda.plan(old.anchor)
+        elif agenda.has_fixed_starts():
+            # Pick up at the slot the plan schedules now; an agenda of
+            # floating slots only starts at its first slot
+            agenda.seek(agenda.index_at(now))
+        if not self.timer.is_running:
+            self.load_preset(agenda.current.preset_index)
+        self.agenda_label.show()
+        self.update_agenda_status()
+
+    def advance_agenda(self):
+        # Runs right after a slot finished: load the next one and start it
+        # from the previous deadline, so there is no gap between slots
+        if self.agenda is None or self.timer.is_running or not self.agenda.advance():
+            self.update_agenda_status()
+            return
+        self.load_preset(self.agenda.current.preset_index)
+        self.timer.start_chained()
+        self.progress_bar.set_running(True)
+        self.btn_start.setText("暂停")
+        self.update_background()
+        self.update_agenda_status()
+
+    def update_agenda_status(self):
+        agenda = self.agenda
+        if agenda is None:
+            return
+        text = f"{agenda.index + 1}/{len(agenda)}"
+        if agenda.started:
+            delta = agenda.delta(time.time(), self.timer.remaining_ns() / 1e9)
+            text += f" {format_delta(delta)}"
+        if text != self.agenda_label.text():
+            self.agenda_label.setText(text)
+        # While paused the delay grows, so keep the label current; while
+        # running it only changes when a slot changes
+        if agenda.started and not self.timer.is_running:
+            self.agenda_status_timer.start()
+        else:
+            self.agenda_status_timer.stop()
 
     def set_simple_mode(self, enabled):
         self.is_simple_mode = enabled
@@ -295,6 +524,7 @@ class MainWindow(QMainWindow):
             self.progress_bar.hide()
         else:
             self.progress_bar.show()
+        self.update_tick_steps()
         
         # Restore geometry of the new mode
         if enabled:
@@ -308,69 +538,52 @@ class MainWindow(QMainWindow):
         self.update_background()
 
     def toggle_timer(self):
+        if self.agenda is not None and not self.timer.is_running:
+            self.agenda.start(time.time())
         self.timer.toggle()
+        self.update_agenda_status()
+        self.progress_bar.set_running(self.timer.is_running)
         self.btn_start.setText("暂停" if self.timer.is_running else "开始")
         self.update_background()
 
     def reset_timer(self):
         self.timer.reset()
+        self.progress_bar.set_running(False)
         self.btn_start.setText("开始")
-        self.audio.stop()
+        if self._audio is not None:
+            self._audio.stop()
         # Reset style to theme
-        theme = self.settings.get("theme")
-        self.setStyleSheet(DARK_THEME if theme == "dark" else LIGHT_THEME)
+        self.apply_theme()
         self.update_background()
 
+    @timed("update_time_display")
     def update_time_display(self, remaining_ms):
-        self.progress_bar.setValue(remaining_ms)
-        
-        fmt = self.settings.get("display.format", "min_sec")
+        # Only repaints when the fill moves by a device pixel
+        self.progress_bar.set_remaining(remaining_ms)
         
-        if fmt == "percent":
-            total = self.progress_bar.maximum()
-            if total > 0:
-                pct = (remaining_ms / total) * 100
-                text = f"{pct:.1f}%"
-            else:
-                text = "0.0%"
-            self.lbl_min.hide()
-            self.lbl_sep.hide()
-            self.lbl_sec.show()
-            self.lbl_sec.setText(text)
-            self.lbl_sec.setAlignment(Qt.AlignCenter)
-            
-        elif fmt == "seconds":
-            seconds = (remaining_ms + 999) // 1000
-            self.lbl_min.hide()
-            self.lbl_sep.hide()
-            self.lbl_sec.show()
-            self.lbl_sec.setText(f"{seconds}")
-            self.lbl_sec.setAlignment(Qt.AlignCenter)
-            
-        else: # min_sec
-            seconds = (remaining_ms + 999) // 1000
-            mins = seconds // 60
-            secs = seconds % 60
-            self.lbl_min.show()
-            self.lbl_sep.show()
-            self.lbl_sec.show()
-            self.lbl_min.setText(f"{mins:02}")
-            self.lbl_sec.setText(f"{secs:02}")
-            self.lbl_min.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.lbl_sec.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        # Only touches the widget when the text changed; the widget then
+        # repaints just the changed glyph cells
+        self.display_updater.update(remaining_ms)
 
     def on_timer_finished(self):
         self.btn_start.setText("开始")
+        self.progress_bar.set_running(False)
         # Ensure final state
         self.update_time_display(0)
+        if self.agenda is not None:
+            # After the core has finished its tick
+            QTimer.singleShot(0, self.advance_agenda)
 
     def on_alert_triggered(self):
-        preset = self.presets[self.current_preset_index]
-        music_path = preset.get("music")
+        self.latency.mark("alert", "signal")
+        audio = self.settings.model.audio
+        music_path = self.presets[self.current_preset_index].music
         if music_path:
-            vol = self.settings.get("audio.volume") * 100
-            self.audio.set_volume(int(vol))
-            self.audio.play(music_path, fade_in_duration=self.settings.get("audio.fade_duration"))
+            self.audio.set_volume(int(audio.volume * 100))
+            self.audio.play(music_path, fade_in_duration=audio.fade_duration, trace="alert")
+        else:
+            # No sound will follow, so the trace ends at the signal
+            self.latency.cancel("alert")
 
     def play_prompt(self, prompt_type):
         """
@@ -399,16 +612,9 @@ class MainWindow(QMainWindow):
 
     def on_flash_triggered(self, state):
         if state:
-            color = self.settings.get("reminder.flash_color")
-            # Apply color to TimeContainer background in simple mode, or CentralWidget in normal mode
-            
-            if self.is_simple_mode:
-                self.time_container.setStyleSheet(f"#TimeContainer {{ background-color: {color}; border-radius: 10px; }}")
-            else:
-                self.central_widget.setStyleSheet(f"#CentralWidget {{ background-color: {color}; border-radius: 10px; }}")
-        else:
-            # Revert to default background
-            self.update_background()
+            self.latency.mark("flash", "signal")
+        # Flash color replaces the background of the visible panel
+        self.update_background()
 
     def on_shortcut_triggered(self, action):
         if action == "start_pause":
@@ -421,9 +627,9 @@ class MainWindow(QMainWindow):
             self.reset_timer()
             self.set_simple_mode(False)
         elif action == "next_preset":
-            self.load_preset((self.current_preset_index + 1) % len(self.presets))
+            self.step_preset(1)
         elif action == "prev_preset":
-            self.load_preset((self.current_preset_index - 1) % len(self.presets))
+            self.step_preset(-1)
         elif action == "toggle_window":
             if self.isVisible():
                 self.hide()
@@ -437,19 +643,20 @@ class MainWindow(QMainWindow):
             op = min(1.0, self.settings.get("window.opacity") + 0.1)
             # self.setWindowOpacity(op)
             self.settings.set("window.opacity", op)
-            # Only update visually if running
-            self.update_background()
         elif action == "opacity_down":
             op = max(0.2, self.settings.get("window.opacity") - 0.1)
             # self.setWindowOpacity(op)
             self.settings.set("window.opacity", op)
-            # Only update visually if running
-            self.update_background()
         elif action == "mute":
             # Toggle mute logic (not implemented in AudioPlayer yet but straightforward)
             pass
+        elif action == "perf_hud":
+            self.perf_hud.toggle()
 
     def set_topmost(self, enable):
+        # setWindowFlags re-creates the native window, so skip no-op changes
+        if bool(self.windowFlags() & Qt.WindowStaysOnTopHint) == bool(enable):
+            return
         flags = self.windowFlags()
         if enable:
             flags |= Qt.WindowStaysOnTopHint
@@ -463,81 +670,74 @@ class MainWindow(QMainWindow):
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             # Check for resize
-            x, y = event.pos().x(), event.pos().y()
-            w, h = self.width(), self.height()
-            margin = self.resize_margin
-            
-            mode = []
-            if y < margin: mode.append("top")
-            if y > h - margin: mode.append("bottom")
-            if x < margin: mode.append("left")
-            if x > w - margin: mode.append("right")
-            
-            if mode:
-                self.resize_mode = "-".join(mode)
+            pos = event.pos()
+            self.resize_edges = self.edge_zones.hit(pos.x(), pos.y())
+            if self.resize_edges:
                 self.start_geometry = self.geometry()
                 self.drag_position = event.globalPos()
             else:
-                self.resize_mode = None
                 self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
             
             event.accept()
 
     def mouseReleaseEvent(self, event):
-        self.resize_mode = None
+        # Apply the last pending move/resize right away
+        self.geometry_coalescer.flush()
+        self.resize_edges = EDGE_NONE
+        self.hover_edges = EDGE_NONE
         self.setCursor(Qt.ArrowCursor)
 
     def mouseMoveEvent(self, event):
-        # Update cursor shape
-        x, y = event.pos().x(), event.pos().y()
-        w, h = self.width(), self.height()
-        margin = self.resize_margin
-        
         if not event.buttons() & Qt.LeftButton:
-            mode = []
-            if y < margin: mode.append("top")
-            if y > h - margin: mode.append("bottom")
-            if x < margin: mode.append("left")
-            if x > w - margin: mode.append("right")
-            
-            mode_str = "-".join(mode)
-            if mode_str == "top-left" or mode_str == "bottom-right":
-                self.setCursor(Qt.SizeFDiagCursor)
-            elif mode_str == "top-right" or mode_str == "bottom-left":
-                self.setCursor(Qt.SizeBDiagCursor)
-            elif "top" in mode or "bottom" in mode:
-                self.setCursor(Qt.SizeVerCursor)
-            elif "left" in mode or "right" in mode:
-                self.setCursor(Qt.SizeHorCursor)
-            else:
-                self.setCursor(Qt.ArrowCursor)
+            # Update cursor shape, only when the hovered zone changes
+            pos = event.pos()
+            edges = self.edge_zones.hit(pos.x(), pos.y())
+            if edges != self.hover_edges:
+                self.hover_edges = edges
+                self.setCursor(EDGE_CURSORS[edges])
             return
 
-        if event.buttons() & Qt.LeftButton:
-            if self.resize_mode:
-                delta = event.globalPos() - self.drag_position
-                rect = QRect(self.start_geometry)
-                
-                if "top" in self.resize_mode:
-                    rect.setTop(rect.top() + delta.y())
-                if "bottom" in self.resize_mode:
-                    rect.setBottom(rect.bottom() + delta.y())
-                if "left" in self.resize_mode:
-                    rect.setLeft(rect.left() + delta.x())
-                if "right" in self.resize_mode:
-                    rect.setRight(rect.right() + delta.x())
-                
-                # Minimum size check
-                if rect.width() > 100 and rect.height() > 50:
-                    self.setGeometry(rect)
-            else:
-                self.move(event.globalPos() - self.drag_position)
-            event.accept()
+        edges = self.resize_edges
+        if edges:
+            delta = event.globalPos() - self.drag_position
+            rect = QRect(self.start_geometry)
+            
+            if edges & EDGE_TOP:
+                rect.setTop(rect.top() + delta.y())
+            if edges & EDGE_BOTTOM:
+                rect.setBottom(rect.bottom() + delta.y())
+            if edges & EDGE_LEFT:
+                rect.setLeft(rect.left() + delta.x())
+            if edges & EDGE_RIGHT:
+                rect.setRight(rect.right() + delta.x())
+            
+            # Minimum size check
+            if rect.width() > 100 and rect.height() > 50:
+                self.geometry_coalescer.request(rect)
+        else:
+            self.geometry_coalescer.request(event.globalPos() - self.drag_position)
+        event.accept()
             
     def closeEvent(self, event):
         self.shortcuts.clear()
-        self.settings.set("window.width", self.width())
-        self.settings.set("window.height", self.height())
-        self.settings.set("window.x", self.x())
-        self.settings.set("window.y", self.y())
+        with self.settings.batch():
+            self.settings.set("window.width", self.width())
+            self.settings.set("window.height", self.height())
+            self.settings.set("window.x", self.x())
+            self.settings.set("window.y", self.y())
+        # Write the pending changes now rather than from the save timer
+        self.settings.flush()
+        self.export_latency(os.environ.get("DAOJISHI_LATENCY_EXPORT"))
         event.accept()
+
+    def on_background_painted(self):
+        self.latency.mark("flash", "paint")
+
+    def export_latency(self, path):
+        # JSON, or CSV if path ends in .csv
+        if not path:
+            return
+        try:
+            self.latency.export(path)
+        except Exception as e:
+            print(f"Error exporting latency: {e}")
@@ -0,0 +1,110 @@
+import time
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import QObject, QEvent, QTimer, Qt
+
+LAG_PROBE_INTERVAL_MS = 100
+
+class PerfMonitor(QObject):
+    """
+    Collects the Qt side of the counters: paint events of the watched
+    widgets and event loop lag. Only hooked in while started.
+    """
+    def __init__(self, perf, widgets, parent=None):
+        super().__init__(parent)
+        self.perf = perf
+        self.widgets = widgets
+        self.active = False
+        self._expected_ns = 0
+        # Single-shot and re-armed by every probe, so each one is measured
+        # against the deadline it was armed for; a repeating timer keeps its
+        # own schedule and hides part of the lag
+        self._lag_timer = QTimer(self)
+        self._lag_timer.setSingleShot(True)
+        self._lag_timer.setTimerType(Qt.PreciseTimer)
+        self._lag_timer.timeout.connect(self._on_lag_probe)
+
+    def start(self):
+        if self.active:
+            return
+        self.active = True
+        self.perf.enabled = True
+        self.perf.reset()
+        for widget in self.widgets:
+            widget.installEventFilter(self)
+        self._arm_lag_probe()
+
+    def stop(self):
+        if not self.active:
+            return
+        self.active = False
+        self.perf.enabled = False
+        self._lag_timer.stop()
+        for widget in self.widgets:
+            widget.removeEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.perf.count("paint")
+        return False
+
+    def _arm_lag_probe(self):
+        self._expected_ns = time.perf_counter_ns() + LAG_PROBE_INTERVAL_MS * 1000000
+        self._lag_timer.start(LAG_PROBE_INTERVAL_MS)
+
+    def _on_lag_probe(self):
+        # How late the probe fired after its deadline; it can only be early
+        # by the timer's sub-millisecond rounding
+        self.perf.record_lag(max(0, time.perf_counter_ns() - self._expected_ns))
+        self._arm_lag_probe()
+
+class PerfHud(QLabel):
+    """Overlay showing the PerfCounters snapshot, refreshed once a second."""
+    def __init__(self, monitor, parent=None, latency=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.latency = latency # Optional LatencyRecorder
+        self.setObjectName("PerfHud")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("#PerfHud { background-color: rgba(0, 0, 0, 180); color: #00ff00;"
+                           " font-family: Consolas, monospace; font-size: 11px; padding: 4px; }")
+        self.hide()
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(1000)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def toggle(self):
+        self.set_visible(self.isHidden())
+
+    def set_visible(self, visible):
+        if visible:
+            self.monitor.start()
+            self.setText("…")
+            self.adjustSize()
+            self.move(4, 4)
+            self.show()
+            self.raise_()
+            self._refresh_timer.start()
+        else:
+            self._refresh_timer.stop()
+            self.monitor.stop()
+            self.hide()
+
+    def refresh(self):
+        s = self.monitor.perf.snapshot(reset=True)
+        lines = [f"ticks/s   {s['ticks_per_s']:6.1f}",
+                 f"paints/s  {s['paints_per_s']:6.1f}"]
+        for name in ("update_time_display", "update_background"):
+            t = s["timings"].get(name)
+            if t:
+                lines.append(f"{name:<20} avg {t['avg_ms']:.3f} max {t['max_ms']:.3f} ms")
+            else:
+                lines.append(f"{name:<20} -")
+        lines.append(f"loop lag  avg {s['loop_lag_ms']['avg']:.2f} max {s['loop_lag_ms']['max']:.2f} ms")
+        lines.append(f"memory    {s['rss_bytes'] / (1024 * 1024):.1f} MB")
+        if self.latency is not None:
+            # Latency of the last stage of each pipeline, since startup
+            for kind, stages in self.latency.snapshot().items():
+                stage, l = list(stages.items())[-1]
+                lines.append(f"{kind} {stage:<8} p50 {l['p50_ms']:.1f} p99 {l['p99_ms']:.1f} ms (n={l['count']})")
+        self.setText("\n".join(lines))
+        self.adjustSize()
@@ -0,0 +1,87 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class PresetListModel(QAbstractListModel):
+    """
+    Preset names for a QListView, read lazily from a PresetStore.
+
+    Only the ids matching the current search are held; names are fetched
+    when the view asks for them, and rows are exposed to the view in
+    batches (canFetchMore/fetchMore) as it scrolls.
+    """
+    BATCH = 200
+    IdRole = Qt.UserRole
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.query = ""
+        self.ids = []
+        self.loaded = 0 # Rows exposed to the view so far
+
+    def set_query(self, query):
+        self.beginResetModel()
+        self.query = query
+        self.ids = self.store.ids(query)
+        self.loaded = min(self.BATCH, len(self.ids))
+        self.endResetModel()
+
+    def reload(self):
+        self.set_query(self.query)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.ids)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.BATCH, len(self.ids) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        preset_id = self.ids[index.row()]
+        if role == Qt.DisplayRole:
+            preset = self.store.get(preset_id)
+            return preset.name if preset else None
+        if role == self.IdRole:
+            return preset_id
+        return None
+
+    def id_at(self, row):
+        if 0 <= row < self.loaded:
+            return self.ids[row]
+        return None
+
+    def row_of(self, preset_id):
+        # Loads rows up to the preset so the view can select it
+        try:
+            row = self.ids.index(preset_id)
+        except ValueError:
+            return -1
+        while row >= self.loaded:
+            self.fetchMore()
+        return row
+
+    def append(self, preset_id):
+        # A newly inserted preset goes at the end, whatever the search
+        self.ids.append(preset_id)
+        return self.row_of(preset_id)
+
+    def remove_row(self, row):
+        if 0 <= row < self.loaded:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.ids.pop(row)
+            self.loaded -= 1
+            self.endRemoveRows()
+
+    def refresh_row(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
@@ -0,0 +1,99 @@
+from PyQt5.QtWidgets import QProgressBar, QStyle, QStyleOptionProgressBar
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter
+
+class PixelProgressBar(QProgressBar):
+    """
+    Progress bar that only calls setValue() when the filled width changes by
+    at least one device pixel. In smooth mode it ignores ticks and instead
+    reads the remaining time from the timer on every frame while running.
+    """
+    metrics_changed = pyqtSignal() # Pixel resolution changed (resize, DPI)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._track_pixels = 0
+        self._filled_pixels = -1
+        self._window_handle = None
+        self.suppressed = 0
+
+        self._smooth = False
+        self._source = None # Object with .remaining and .is_running
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setInterval(16)
+        self._frame_timer.timeout.connect(self._on_frame)
+
+    def ms_per_device_pixel(self):
+        if self._track_pixels <= 0:
+            return 0
+        return self.maximum() / self._track_pixels
+
+    def setRange(self, minimum, maximum):
+        super().setRange(minimum, maximum)
+        self._filled_pixels = -1
+
+    def set_remaining(self, remaining_ms):
+        if self._smooth and self._source is not None and self._source.is_running:
+            return
+        total = self.maximum()
+        filled = remaining_ms * self._track_pixels // total if total > 0 else 0
+        if filled == self._filled_pixels and self._track_pixels > 0:
+            self.suppressed += 1
+            return
+        self._filled_pixels = filled
+        self.setValue(remaining_ms)
+
+    def set_smooth(self, enabled, source=None):
+        self._smooth = enabled
+        self._source = source
+        # Applies at once, also while a countdown is running
+        self.set_running(source is not None and source.is_running)
+
+    def set_running(self, running):
+        if self._smooth and running:
+            self._frame_timer.start()
+        else:
+            self._frame_timer.stop()
+            if self._source is not None:
+                self._filled_pixels = -1
+                self.set_remaining(self._source.remaining)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_metrics()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_metrics()
+        # Recompute when the window moves to a screen with another DPI
+        handle = self.window().windowHandle()
+        if handle is not None and handle is not self._window_handle:
+            self._window_handle = handle
+            handle.screenChanged.connect(self._update_metrics)
+
+    def paintEvent(self, event):
+        if not (self._smooth and self._frame_timer.isActive()):
+            super().paintEvent(event)
+            return
+        # Interpolate: take the fill from the timer at paint time
+        option = QStyleOptionProgressBar()
+        self.initStyleOption(option)
+        option.progress = max(self.minimum(), min(self.maximum(), self._source.remaining))
+        painter = QPainter(self)
+        self.style().drawControl(QStyle.CE_ProgressBar, option, painter, self)
+
+    def _update_metrics(self, *args):
+        # The widget width stands in for the fill track. The groove the fill
+        # is drawn in is a few pixels narrower, so this errs toward updating
+        # slightly more often than once per drawn pixel.
+        track_pixels = int(self.width() * self.devicePixelRatioF())
+        self._filled_pixels = -1
+        if track_pixels != self._track_pixels:
+            self._track_pixels = track_pixels
+            self.metrics_changed.emit()
+
+    def _on_frame(self):
+        if self._source is None or not self._source.is_running:
+            self.set_running(False)
+            return
+        self.update()
@@ -1,12 +1,13 @@
-import copy
-import json
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QSpinBox, QTabWidget, QWidget, 
-                             QPushButton, QListWidget, QFormLayout, QFileDialog, QMessageBox, QComboBox, QStyle,
-                             QKeySequenceEdit, QCheckBox)
+                             QPushButton, QListView, QFormLayout, QFileDialog, QMessageBox, QComboBox, QStyle,
+                             QKeySequenceEdit, QCheckBox, QProgressDialog)
 from PyQt5.QtGui import QKeySequence
-from PyQt5.QtCore import Qt
-from app.config.settings import settings
+from PyQt5.QtCore import Qt, QTimer
+from app.config.settings import settings, Preset
+from app.config.preset_store import PresetStore
+from app.config.preset_io import PresetImporter, PresetExporter, FILE_FILTER
+from app.ui.preset_model import PresetListModel
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -14,6 +15,12 @@ class SettingsDialog(QDialog):
         self.setWindowTitle("设置")
         self.resize(600, 450)
         self.settings = settings
+        # The dialog is created once and reused. Tab widgets are built the
+        # first time a tab is shown, and their values are (re)loaded from
+        # the settings the first time the tab is shown after each open.
+        self.built_tabs = set()
+        self.loaded_tabs = set()
+        self.presets_dirty = False
         self.init_ui()
         
     def init_ui(self):
@@ -23,18 +30,22 @@ class SettingsDialog(QDialog):
         
         # Presets Tab
         self.presets_tab = QWidget()
-        self.init_presets_tab()
         self.tabs.addTab(self.presets_tab, "预设")
         
         # Shortcuts Tab
         self.shortcuts_tab = QWidget()
-        self.init_shortcuts_tab()
         self.tabs.addTab(self.shortcuts_tab, "快捷键")
         
         # Audio/General Tab
         self.general_tab = QWidget()
-        self.init_general_tab()
         self.tabs.addTab(self.general_tab, "常规")
+
+        self.tab_builders = {
+            self.presets_tab: (self.init_presets_tab, self.load_presets_to_list),
+            self.shortcuts_tab: (self.init_shortcuts_tab, self.load_shortcuts),
+            self.general_tab: (self.init_general_tab, self.load_general),
+        }
+        self.tabs.currentChanged.connect(self.ensure_tab)
         
         # Buttons
         btn_layout = QHBoxLayout()
@@ -48,14 +59,50 @@ class SettingsDialog(QDialog):
         btn_layout.addWidget(btn_cancel)
         layout.addLayout(btn_layout)
 
+    def refresh(self):
+        """Prepare for showing again: drop stale values."""
+        self.loaded_tabs.clear()
+        self.ensure_tab(self.tabs.currentIndex())
+
+    def ensure_tab(self, index):
+        tab = self.tabs.widget(index)
+        if tab is None:
+            return
+        build, load = self.tab_builders[tab]
+        if tab not in self.built_tabs:
+            self.built_tabs.add(tab)
+            build()
+        if tab not in self.loaded_tabs:
+            self.loaded_tabs.add(tab)
+            load()
+
     def init_presets_tab(self):
         layout = QHBoxLayout(self.presets_tab)
-        
-        # List
-        self.preset_list = QListWidget()
+
+        # Presets live in an indexed store; the list only loads what it shows
+        self.store = PresetStore(PresetStore.path_for(self.settings.config_file))
+        self.preset_model = PresetListModel(self.store, self)
+        # Edits are committed once they settle rather than per keystroke,
+        # with the same delay as the settings write-behind
+        self.store_commit_timer = QTimer(self)
+        self.store_commit_timer.setSingleShot(True)
+        self.store_commit_timer.setInterval(int(self.settings.SAVE_DELAY * 1000))
+        self.store_commit_timer.timeout.connect(self.store.commit)
+        
+        # Search + List
+        list_layout = QVBoxLayout()
+        self.preset_search = QLineEdit()
+        self.preset_search.setPlaceholderText("搜索预设")
+        self.preset_search.textChanged.connect(self.on_search_changed)
+        list_layout.addWidget(self.preset_search)
+
+        self.preset_list = QListView()
+        self.preset_list.setUniformItemSizes(True)
+        self.preset_list.setModel(self.preset_model)
         # Connect signal to slot
-        self.preset_list.currentItemChanged.connect(self.on_list_selection_changed)
-        layout.addWidget(self.preset_list)
+        self.preset_list.selectionModel().currentChanged.connect(self.on_list_selection_changed)
+        list_layout.addWidget(self.preset_list)
+        layout.addLayout(list_layout)
         
         # Details
         details_layout = QFormLayout()
@@ -66,9 +113,10 @@ class SettingsDialog(QDialog):
         self.preset_duration.setRange(1, 36000)
         self.preset_duration.valueChanged.connect(self.update_current_preset_data)
         
-        self.preset_alert = QSpinBox()
-        self.preset_alert.setRange(0, 36000)
-        self.preset_alert.valueChanged.connect(self.update_current_preset_data)
+        # Several alert times, comma separated (e.g. "300, 60")
+        self.preset_alert = QLineEdit()
+        self.preset_alert.setPlaceholderText("300, 60")
+        self.preset_alert.editingFinished.connect(self.update_current_preset_data)
 
         self.preset_flash = QSpinBox()
         self.preset_flash.setRange(0, 36000)
@@ -88,7 +136,7 @@ class SettingsDialog(QDialog):
         
         details_layout.addRow("名称:", self.preset_name)
         details_layout.addRow("时长 (秒):", self.preset_duration)
-        details_layout.addRow("提醒 (秒):", self.preset_alert)
+        details_layout.addRow("提醒 (秒，可多个):", self.preset_alert)
         details_layout.addRow("开始闪烁 (秒):", self.preset_flash)
         details_layout.addRow("音乐:", music_layout)
         
@@ -117,12 +165,12 @@ class SettingsDialog(QDialog):
         right_panel.addStretch()
         
         layout.addLayout(right_panel)
-        
-        self.load_presets_to_list()
 
     def init_shortcuts_tab(self):
-        layout = QFormLayout(self.shortcuts_tab)
+        self.shortcuts_layout = QFormLayout(self.shortcuts_tab)
         self.shortcut_inputs = {}
+
+    def load_shortcuts(self):
         shortcuts = self.settings.get("shortcuts")
         
         # Mapping for Chinese labels
@@ -135,14 +183,18 @@ class SettingsDialog(QDialog):
             "toggle_top": "切换置顶",
             "opacity_up": "增加不透明度",
             "opacity_down": "减少不透明度",
-            "mute": "静音/取消静音"
+            "mute": "静音/取消静音",
+            "perf_hud": "性能面板"
         }
         
         for key, value in shortcuts.items():
-            edit = QKeySequenceEdit(QKeySequence(value))
-            self.shortcut_inputs[key] = edit
-            label_text = shortcut_labels.get(key, key)
-            layout.addRow(label_text + ":", edit)
+            edit = self.shortcut_inputs.get(key)
+            if edit is None:
+                edit = QKeySequenceEdit()
+                self.shortcut_inputs[key] = edit
+                label_text = shortcut_labels.get(key, key)
+                self.shortcuts_layout.addRow(label_text + ":", edit)
+            edit.setKeySequence(QKeySequence(value))
 
     def init_general_tab(self):
         layout = QFormLayout(self.general_tab)
@@ -150,17 +202,20 @@ class SettingsDialog(QDialog):
         # Audio Volume
         self.volume_spin = QSpinBox()
         self.volume_spin.setRange(0, 100)
-        self.volume_spin.setValue(int(self.settings.get("audio.volume") * 100))
         layout.addRow("音量 (%):", self.volume_spin)
         
         # Fade Duration
         self.fade_spin = QSpinBox()
         self.fade_spin.setRange(0, 10000)
-        self.fade_spin.setValue(self.settings.get("audio.fade_duration"))
         layout.addRow("淡入时长 (ms):", self.fade_spin)
 
+        # Fade Curve
+        self.fade_curve = QComboBox()
+        self.fade_curve.addItems(["linear", "log", "equal_power"])
+        layout.addRow("淡入曲线:", self.fade_curve)
+
         # Meeting Prompts
-        self.prompt_regular = QLineEdit(self.settings.get("audio.prompt_regular", ""))
+        self.prompt_regular = QLineEdit()
         btn_browse_reg = QPushButton()
         btn_browse_reg.setIcon(self.style().standardIcon(QStyle.SP_DirOpenIcon))
         btn_browse_reg.setFixedWidth(30)
@@ -170,7 +225,7 @@ class SettingsDialog(QDialog):
         layout_reg.addWidget(btn_browse_reg)
         layout.addRow("常规会议提示音:", layout_reg)
 
-        self.prompt_confidential = QLineEdit(self.settings.get("audio.prompt_confidential", ""))
+        self.prompt_confidential = QLineEdit()
         btn_browse_conf = QPushButton()
         btn_browse_conf.setIcon(self.style().standardIcon(QStyle.SP_DirOpenIcon))
         btn_browse_conf.setFixedWidth(30)
@@ -181,61 +236,85 @@ class SettingsDialog(QDialog):
         layout.addRow("保密会议提示音:", layout_conf)
         
         # Flash Color
-        self.flash_color = QLineEdit(self.settings.get("reminder.flash_color"))
+        self.flash_color = QLineEdit()
         layout.addRow("闪烁颜色 (Hex):", self.flash_color)
 
         # Time Format
         self.time_format = QComboBox()
         self.time_format.addItems(["min_sec", "seconds", "percent"])
-        current_fmt = self.settings.get("display.format", "min_sec")
-        idx = self.time_format.findText(current_fmt)
-        if idx >= 0:
-            self.time_format.setCurrentIndex(idx)
         layout.addRow("时间格式:", self.time_format)
 
         # Font Size
         self.font_size_spin = QSpinBox()
         self.font_size_spin.setRange(20, 500)
-        self.font_size_spin.setValue(self.settings.get("display.font_size", 150))
         layout.addRow("字体大小:", self.font_size_spin)
 
+        # Smooth progress bar (repaints every frame while running)
+        self.smooth_progress_check = QCheckBox("平滑进度条")
+        layout.addRow("进度条:", self.smooth_progress_check)
+
         # Theme
         self.theme_combo = QComboBox()
         self.theme_combo.addItems(["dark", "light"])
-        current_theme = self.settings.get("theme", "dark")
-        idx_t = self.theme_combo.findText(current_theme)
-        if idx_t >= 0:
-            self.theme_combo.setCurrentIndex(idx_t)
         layout.addRow("主题:", self.theme_combo)
         
         # Always on Top
         self.topmost_check = QCheckBox("窗口置顶")
-        self.topmost_check.setChecked(self.settings.get("window.topmost", False))
         layout.addRow("显示:", self.topmost_check)
 
+        # Agenda mode; the slots themselves are configured in config.json
+        self.agenda_check = QCheckBox("议程模式（预设自动连续播放）")
+        layout.addRow("议程:", self.agenda_check)
+
+    def load_general(self):
+        self.volume_spin.setValue(int(self.settings.get("audio.volume") * 100))
+        self.fade_spin.setValue(self.settings.get("audio.fade_duration"))
+        idx_c = self.fade_curve.findText(self.settings.get("audio.fade_curve", "linear"))
+        if idx_c >= 0:
+            self.fade_curve.setCurrentIndex(idx_c)
+        self.prompt_regular.setText(self.settings.get("audio.prompt_regular", ""))
+        self.prompt_confidential.setText(self.settings.get("audio.prompt_confidential", ""))
+        self.flash_color.setText(self.settings.get("reminder.flash_color"))
+        idx = self.time_format.findText(self.settings.get("display.format", "min_sec"))
+        if idx >= 0:
+            self.time_format.setCurrentIndex(idx)
+        self.font_size_spin.setValue(self.settings.get("display.font_size", 150))
+        self.smooth_progress_check.setChecked(self.settings.get("display.smooth_progress", False))
+        idx_t = self.theme_combo.findText(self.settings.get("theme", "dark"))
+        if idx_t >= 0:
+            self.theme_combo.setCurrentIndex(idx_t)
+        self.topmost_check.setChecked(self.settings.get("window.topmost", False))
+        self.agenda_check.setChecked(self.settings.get("agenda.enabled", False))
+
     def load_presets_to_list(self):
-        self.preset_list.blockSignals(True)
-        self.preset_list.clear()
-        self.current_presets = copy.deepcopy(self.settings.get("presets"))
-        
-        for p in self.current_presets:
-            self.preset_list.addItem(p["name"])
-        
-        self.preset_list.blockSignals(False)
-        
-        if self.current_presets:
-            self.preset_list.setCurrentRow(0)
+        # The store is only rewritten when the configured presets changed
+        model = self.settings.model
+        self.store.sync(model.presets, model.presets_digest)
+        self.presets_dirty = False
+        self.preset_model.reload()
+        self.select_preset_row(0)
+
+    def on_search_changed(self, text):
+        self.preset_model.set_query(text.strip())
+        self.select_preset_row(0)
+
+    def select_preset_row(self, row):
+        if 0 <= row < self.preset_model.rowCount():
+            self.preset_list.setCurrentIndex(self.preset_model.index(row))
+        else:
+            self.load_preset_details(-1)
+
+    def current_preset_row(self):
+        return self.preset_list.currentIndex().row()
 
     def on_list_selection_changed(self, current, previous):
-        if not current:
-            return
-        row = self.preset_list.row(current)
-        self.load_preset_details(row)
+        self.load_preset_details(current.row())
 
     def load_preset_details(self, row):
-        if row < 0 or row >= len(self.current_presets):
+        preset_id = self.preset_model.id_at(row)
+        p = self.store.get(preset_id) if preset_id is not None else None
+        if p is None:
             return
-        p = self.current_presets[row]
         
         # Block signals to prevent feedback loop
         self.preset_name.blockSignals(True)
@@ -244,11 +323,11 @@ class SettingsDialog(QDialog):
         self.preset_flash.blockSignals(True)
         self.preset_music.blockSignals(True)
         
-        self.preset_name.setText(p["name"])
-        self.preset_duration.setValue(p["duration"])
-        self.preset_alert.setValue(p["alert_time"])
-        self.preset_flash.setValue(p.get("flash_time", 5))
-        self.preset_music.setText(p.get("music", ""))
+        self.preset_name.setText(p.name)
+        self.preset_duration.setValue(p.duration)
+        self.preset_alert.setText(", ".join(str(t) for t in p.alerts))
+        self.preset_flash.setValue(p.flash_time)
+        self.preset_music.setText(p.music)
         
         self.preset_name.blockSignals(False)
         self.preset_duration.blockSignals(False)
@@ -257,32 +336,42 @@ class SettingsDialog(QDialog):
         self.preset_music.blockSignals(False)
 
     def update_current_preset_data(self):
-        row = self.preset_list.currentRow()
-        if row < 0: return
-        
-        p = self.current_presets[row]
-        p["name"] = self.preset_name.text()
-        p["duration"] = self.preset_duration.value()
-        p["alert_time"] = self.preset_alert.value()
-        p["flash_time"] = self.preset_flash.value()
-        p["music"] = self.preset_music.text()
-        
+        row = self.current_preset_row()
+        preset_id = self.preset_model.id_at(row)
+        if preset_id is None: return
+        
+        p = Preset(self.preset_name.text(), self.preset_duration.value(),
+                   self.parse_alerts(self.preset_alert.text()),
+                   self.preset_flash.value(), self.preset_music.text())
+        if p == self.store.get(preset_id):
+            return
+        self.store.update(preset_id, p)
+        self.store_commit_timer.start()
+        self.presets_dirty = True
         # Update list item text
-        item = self.preset_list.item(row)
-        if item.text() != p["name"]:
-            item.setText(p["name"])
+        self.preset_model.refresh_row(row)
+
+    def parse_alerts(self, text):
+        alerts = []
+        for part in text.replace("，", ",").split(","):
+            part = part.strip()
+            if part.isdigit() and int(part) > 0:
+                alerts.append(int(part))
+        return sorted(set(alerts), reverse=True)
 
     def add_preset(self):
-        new_preset = {"name": "新预设", "duration": 300, "alert_time": 60, "flash_time": 10, "music": "app/source/time.mp3"}
-        self.current_presets.append(new_preset)
-        self.preset_list.addItem(new_preset["name"])
-        self.preset_list.setCurrentRow(len(self.current_presets) - 1)
+        new_preset = Preset("新预设", 300, [60], 10, "app/source/time.mp3")
+        preset_id = self.store.insert(new_preset)
+        self.presets_dirty = True
+        self.select_preset_row(self.preset_model.append(preset_id))
 
     def remove_preset(self):
-        row = self.preset_list.currentRow()
-        if row < 0: return
-        self.current_presets.pop(row)
-        self.preset_list.takeItem(row)
+        row = self.current_preset_row()
+        preset_id = self.preset_model.id_at(row)
+        if preset_id is None: return
+        self.store.delete(preset_id)
+        self.presets_dirty = True
+        self.preset_model.remove_row(row)
 
     def browse_music(self):
         file, _ = QFileDialog.getOpenFileName(self, "选择音乐", "", "Audio Files (*.mp3 *.wav *.ogg)")
@@ -296,62 +385,115 @@ class SettingsDialog(QDialog):
             line_edit.setText(file)
 
     def import_presets(self):
-        file, _ = QFileDialog.getOpenFileName(self, "导入预设", "", "JSON Files (*.json)")
+        file, _ = QFileDialog.getOpenFileName(self, "导入预设", "", FILE_FILTER)
         if not file:
             return
         
         try:
-            with open(file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    # Validate basic structure if needed, or just assume correct
-                    self.current_presets = data
-                    self.load_presets_to_list()
-                    QMessageBox.information(self, "成功", "预设导入成功。")
-                else:
-                    QMessageBox.warning(self, "错误", "格式无效：根元素必须是列表。")
+            importer = PresetImporter(file, self.store)
         except Exception as e:
             QMessageBox.warning(self, "错误", f"导入失败：{e}")
+            return
+
+        def finished(error, cancelled):
+            if importer.imported:
+                self.presets_dirty = True
+                self.preset_model.reload()
+            if error:
+                QMessageBox.warning(self, "错误", f"导入失败：{error}")
+            elif cancelled:
+                # Presets imported before the cancel are kept
+                QMessageBox.information(
+                    self, "已取消", f"导入已取消，已导入 {importer.imported} 个预设。")
+            else:
+                QMessageBox.information(
+                    self, "成功",
+                    f"导入 {importer.imported} 个预设，跳过重复 {importer.duplicates} 个，无效 {importer.invalid} 个。")
+
+        self.run_chunked(importer, "正在导入预设...", finished)
 
     def export_presets(self):
-        file, _ = QFileDialog.getSaveFileName(self, "导出预设", "presets.json", "JSON Files (*.json)")
+        file, _ = QFileDialog.getSaveFileName(self, "导出预设", "presets.jsonl", FILE_FILTER)
         if not file:
             return
             
         try:
-            with open(file, 'w', encoding='utf-8') as f:
-                json.dump(self.current_presets, f, indent=4, ensure_ascii=False)
-            QMessageBox.information(self, "成功", "预设导出成功。")
+            exporter = PresetExporter(file, self.store)
         except Exception as e:
             QMessageBox.warning(self, "错误", f"导出失败：{e}")
+            return
+
+        def finished(error, cancelled):
+            if error:
+                QMessageBox.warning(self, "错误", f"导出失败：{error}")
+            elif cancelled:
+                # close() removed the partial file, nothing was written
+                QMessageBox.information(self, "已取消", "导出已取消，未写入文件。")
+            else:
+                QMessageBox.information(self, "成功", f"导出 {exporter.exported} 个预设。")
+
+        self.run_chunked(exporter, "正在导出预设...", finished)
+
+    def run_chunked(self, task, label, finished):
+        # Runs task.step() one chunk per event loop pass, so the dialog
+        # stays responsive and shows progress; finished(error or None,
+        # cancelled)
+        progress = QProgressDialog(label, "取消", 0, 1000, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        timer = QTimer(progress)
+
+        def step():
+            error = None
+            cancelled = False
+            try:
+                if progress.wasCanceled():
+                    task.close()
+                    cancelled = True
+                elif task.step():
+                    progress.setValue(int(task.progress() * 1000))
+                    return
+            except Exception as e:
+                task.close()
+                error = e
+            timer.stop()
+            progress.close()
+            progress.deleteLater()
+            finished(error, cancelled)
+
+        timer.timeout.connect(step)
+        timer.start(0)
 
     def save_settings(self):
-        # Save presets
-        self.settings.set("presets", self.current_presets)
-        
-        # Save shortcuts
-        new_shortcuts = {}
-        for key, edit in self.shortcut_inputs.items():
-            seq = edit.keySequence().toString(QKeySequence.PortableText)
-            new_shortcuts[key] = seq.lower()
-        self.settings.set("shortcuts", new_shortcuts)
-        
-        # Save general
-        self.settings.set("audio.volume", self.volume_spin.value() / 100.0)
-        self.settings.set("audio.fade_duration", self.fade_spin.value())
-        self.settings.set("audio.prompt_regular", self.prompt_regular.text())
-        self.settings.set("audio.prompt_confidential", self.prompt_confidential.text())
-        self.settings.set("reminder.flash_color", self.flash_color.text())
-        self.settings.set("display.format", self.time_format.currentText())
-        self.settings.set("display.font_size", self.font_size_spin.value())
-        self.settings.set("theme", self.theme_combo.currentText())
-        
-        # Save topmost setting
-        is_top = self.topmost_check.isChecked()
-        self.settings.set("window.topmost", is_top)
-        
-        # We need to apply this setting immediately on the main window
-        if self.parent():
-            self.parent().set_topmost(is_top)
+        # Only tabs that were shown can hold edits. Settings.set ignores
+        # unchanged values, and the batch reports all changes at once to
+        # the subscribers (see MainWindow.connect_settings).
+        with self.settings.batch():
+            if self.presets_tab in self.loaded_tabs and self.presets_dirty:
+                self.settings.set("presets", [p.to_dict() for p in self.store.all()])
+                # The store already holds exactly these presets
+                model = self.settings.model
+                self.store.mark_synced(model.presets, model.presets_digest)
+
+            if self.shortcuts_tab in self.loaded_tabs:
+                new_shortcuts = {}
+                for key, edit in self.shortcut_inputs.items():
+                    seq = edit.keySequence().toString(QKeySequence.PortableText)
+                    new_shortcuts[key] = seq.lower()
+                self.settings.set("shortcuts", new_shortcuts)
+
+            if self.general_tab in self.loaded_tabs:
+                self.settings.set("audio.volume", self.volume_spin.value() / 100.0)
+                self.settings.set("audio.fade_duration", self.fade_spin.value())
+                self.settings.set("audio.fade_curve", self.fade_curve.currentText())
+                self.settings.set("audio.prompt_regular", self.prompt_regular.text())
+                self.settings.set("audio.prompt_confidential", self.prompt_confidential.text())
+                self.settings.set("reminder.flash_color", self.flash_color.text())
+                self.settings.set("display.format", self.time_format.currentText())
+                self.settings.set("display.font_size", self.font_size_spin.value())
+                self.settings.set("display.smooth_progress", self.smooth_progress_check.isChecked())
+                self.settings.set("theme", self.theme_combo.currentText())
+                self.settings.set("window.topmost", self.topmost_check.isChecked())
+                self.settings.set("agenda.enabled", self.agenda_check.isChecked())
         
         self.accept()
@@ -1,20 +1,11 @@
+from PyQt5.QtGui import QColor
+
 DARK_THEME = """
 QWidget#CentralWidget {
-    background-color: #2b2b2b;
     color: #ffffff;
     font-family: "Segoe UI", Arial, sans-serif;
 }
-QWidget#TimeContainer {
-    background-color: transparent;
-    border-radius: 10px;
-}
-QLabel#TimeLabelPart {
-    font-weight: bold;
-    color: #00ff00;
-    background-color: transparent;
-    padding: 0px;
-}
-QLabel#PresetLabel {
+QLabel#PresetLabel, QLabel#AgendaLabel {
     font-size: 16px;
     color: #aaaaaa;
     background-color: transparent;
@@ -47,21 +38,10 @@ QPushButton:pressed {
 
 LIGHT_THEME = """
 QWidget#CentralWidget {
-    background-color: #f0f0f0;
     color: #000000;
     font-family: "Segoe UI", Arial, sans-serif;
 }
-QWidget#TimeContainer {
-    background-color: transparent;
-    border-radius: 10px;
-}
-QLabel#TimeLabelPart {
-    font-weight: bold;
-    color: #008800;
-    background-color: transparent;
-    padding: 0px;
-}
-QLabel#PresetLabel {
+QLabel#PresetLabel, QLabel#AgendaLabel {
     font-size: 16px;
     color: #666666;
     background-color: transparent;
@@ -91,3 +71,49 @@ QPushButton:pressed {
     background-color: #bbb;
 }
 """
+
+# Window background per theme. CentralWidget and TimeContainer paint it
+# themselves (see BackgroundPanel), so it is not part of the stylesheets.
+BACKGROUND_RGB = {
+    "dark": (43, 43, 43),
+    "light": (240, 240, 240),
+}
+
+# Time digits per theme, painted by TimeDisplayWidget
+TIME_COLOR = {
+    "dark": "#00ff00",
+    "light": "#008800",
+}
+
+TRANSPARENT = QColor(0, 0, 0, 0)
+
+class BackgroundStyles:
+    """
+    Cache of precomputed background colors, keyed by
+    (theme, simple mode, opacity, flash color).
+    """
+    def __init__(self):
+        self._cache = {}
+
+    def get(self, theme, simple_mode, opacity, flash_color=None):
+        """Return (central widget color, time container color)."""
+        key = (theme, simple_mode, opacity, flash_color)
+        colors = self._cache.get(key)
+        if colors is None:
+            colors = self._build(theme, simple_mode, opacity, flash_color)
+            self._cache[key] = colors
+        return colors
+
+    def _build(self, theme, simple_mode, opacity, flash_color):
+        if flash_color:
+            background = QColor(flash_color)
+        else:
+            r, g, b = BACKGROUND_RGB.get(theme, BACKGROUND_RGB["light"])
+            # Apply transparency ONLY in Simple Mode (buttons hidden)
+            alpha = int(opacity * 255) if simple_mode else 255
+            background = QColor(r, g, b, alpha)
+        if simple_mode:
+            # In Simple Mode, CentralWidget is transparent, TimeContainer has background
+            return TRANSPARENT, background
+        # In Normal Mode, CentralWidget has background, TimeContainer is transparent
+        return background, TRANSPARENT
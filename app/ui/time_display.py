@@ -0,0 +1,149 @@
+import math
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QEvent, QRectF, QSize
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+
+# Glyphs rendered up front; anything else is added to the atlas on demand
+GLYPHS = "0123456789:%."
+
+class TimeDisplayWidget(QWidget):
+    """
+    Custom-painted time display. The glyphs are rendered once per font size,
+    color and device pixel ratio into a pixmap atlas; painting just copies
+    cells out of it, and set_text() only invalidates the cells whose
+    character changed.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self._text = ""
+        self._font_size = 150
+        self._color = QColor("#008800")
+        self._glyphs = GLYPHS
+
+        self._atlas = None
+        self._atlas_dpr = 0
+        self._sources = {} # char -> source rect in the atlas (device pixels)
+        self._widths = {} # char -> cell width
+        self._cell_height = 0
+        self._rects = [] # target rect of each character of the text
+        self._text_width = 0
+        self._rebuild_atlas()
+
+    def text(self):
+        return self._text
+
+    def set_font_size(self, size):
+        if size == self._font_size:
+            return
+        self._font_size = size
+        self._rebuild_atlas()
+
+    def set_color(self, color):
+        color = QColor(color)
+        if color == self._color:
+            return
+        self._color = color
+        self._rebuild_atlas()
+
+    def set_text(self, text):
+        if text == self._text:
+            return
+        old = self._text
+        self._text = text
+        missing = [c for c in text if c not in self._sources]
+        if missing:
+            self._glyphs += "".join(sorted(set(missing)))
+            self._rebuild_atlas()
+            return
+        widths = self._widths
+        if len(old) != len(text) or any(widths[a] != widths[b] for a, b in zip(old, text)):
+            # Cell layout changed (e.g. 100:00 -> 99:59)
+            self._relayout()
+            self.updateGeometry()
+            self.update()
+            return
+        for i, (a, b) in enumerate(zip(old, text)):
+            if a != b:
+                self.update(self._rects[i].toAlignedRect())
+
+    def sizeHint(self):
+        return QSize(math.ceil(self._text_width), math.ceil(self._cell_height))
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._relayout()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange:
+            # Theme stylesheet changed the font family
+            self._rebuild_atlas()
+        super().changeEvent(event)
+
+    def paintEvent(self, event):
+        if self.devicePixelRatioF() != self._atlas_dpr:
+            # Moved to a screen with a different scale factor
+            self._rebuild_atlas()
+        painter = QPainter(self)
+        dirty = QRectF(event.rect())
+        sources = self._sources
+        for char, rect in zip(self._text, self._rects):
+            if rect.intersects(dirty):
+                painter.drawPixmap(rect, self._atlas, sources[char])
+
+    def _rebuild_atlas(self):
+        font = QFont(self.font())
+        font.setPixelSize(self._font_size)
+        font.setBold(True)
+        metrics = QFontMetrics(font)
+
+        # Digits share one width so the text does not jitter while counting
+        digit_width = max(metrics.horizontalAdvance(c) for c in "0123456789")
+        widths = {c: digit_width if c.isdigit() else metrics.horizontalAdvance(c) for c in self._glyphs}
+        height = metrics.height()
+        # Move the colon up by 15% of the font size
+        colon_offset = int(self._font_size * 0.15)
+
+        dpr = self.devicePixelRatioF()
+        atlas = QPixmap(max(1, math.ceil(sum(widths.values()) * dpr)), max(1, math.ceil(height * dpr)))
+        atlas.setDevicePixelRatio(dpr)
+        atlas.fill(Qt.transparent)
+
+        painter = QPainter(atlas)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(self._color)
+        sources = {}
+        x = 0
+        for char in self._glyphs:
+            width = widths[char]
+            shift = -colon_offset if char == ":" else 0
+            painter.drawText(QRectF(x, shift, width, height), Qt.AlignCenter, char)
+            sources[char] = QRectF(x * dpr, 0, width * dpr, height * dpr)
+            x += width
+        painter.end()
+
+        self._atlas = atlas
+        self._atlas_dpr = dpr
+        self._sources = sources
+        self._widths = widths
+        self._cell_height = height
+        self._relayout()
+        self.updateGeometry()
+        self.update()
+
+    def _relayout(self):
+        widths = self._widths
+        total = sum(widths[c] for c in self._text)
+        x = (self.width() - total) / 2
+        y = (self.height() - self._cell_height) / 2
+        rects = []
+        for char in self._text:
+            rects.append(QRectF(x, y, widths[char], self._cell_height))
+            x += widths[char]
+        self._rects = rects
+        self._text_width = total
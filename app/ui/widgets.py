@@ -0,0 +1,48 @@
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer
+from PyQt5.QtGui import QPainter
+
+class BackgroundPanel(QWidget):
+    """
+    Container that paints its own rounded background. Changing the color is
+    a plain repaint, with no stylesheet parsing or widget re-polishing.
+    """
+    def __init__(self, parent=None, radius=10):
+        super().__init__(parent)
+        self.radius = radius
+        self._color = None
+        self.on_paint = None # Optional callback, e.g. latency tracing
+
+    def set_background(self, color):
+        if color == self._color:
+            return
+        self._color = color
+        self.update()
+
+    def paintEvent(self, event):
+        if self.on_paint is not None:
+            self.on_paint()
+        if self._color is None or self._color.alpha() == 0:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self._color)
+        painter.drawRoundedRect(self.rect(), self.radius, self.radius)
+
+class FirstPaintFilter(QObject):
+    """
+    Calls callback once, after the window has painted its first frame, and
+    then uninstalls itself.
+    """
+    def __init__(self, window, callback):
+        super().__init__(window)
+        self.callback = callback
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.UpdateRequest:
+            obj.removeEventFilter(self)
+            # Let the paint triggered by this event happen first
+            QTimer.singleShot(0, self.callback)
+        return False
@@ -0,0 +1,143 @@
+"""
+Alert latency test mode.
+
+Fires alerts back to back through the real pipeline (CountdownTimer on the
+Qt event loop, alert handler, AudioPlayer, background paint) and reports
+the p50/p99 latency of every stage, measured from the ideal threshold
+crossing time:
+
+  alert  crossing, signal, play, playing (playing needs --audio and a
+         working QtMultimedia backend)
+  flash  crossing, signal, paint (with --flash; adds ~0.5 s per alert
+         because the flash cycle starts dark)
+
+Each round seeks the running countdown to just above the alert threshold,
+waits for the alert (and the flash paint), then starts the next round.
+
+Usage: python benchmarks/bench_alert_latency.py [--alerts 200] [--audio FILE]
+                                                [--flash] [--export FILE]
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QColor
+
+from app.core.timer import CountdownTimer
+from app.core.latency import LatencyRecorder, STAGES
+from app.ui.widgets import BackgroundPanel
+
+DURATION_S = 3
+ALERT_S = 2
+LEAD_MS = 50 # Each round starts this long before the alert
+ROUND_TIMEOUT_MS = 2000
+
+FLASH_COLOR = QColor("#FF0000")
+IDLE_COLOR = QColor(240, 240, 240)
+
+class LatencyRun:
+    def __init__(self, app, args):
+        self.app = app
+        self.args = args
+        self.rounds = 0
+        self.latency = LatencyRecorder()
+
+        self.timer = CountdownTimer()
+        self.timer.latency = self.latency
+        self.timer.alert_triggered.connect(self.on_alert)
+        self.timer.flash_triggered.connect(self.on_flash)
+        flash_s = ALERT_S if args.flash else 0
+        self.timer.set_config(DURATION_S, [ALERT_S], flash_s)
+
+        self.panel = BackgroundPanel()
+        self.panel.resize(300, 150)
+        self.panel.on_paint = lambda: self.latency.mark("flash", "paint")
+        self.panel.set_background(IDLE_COLOR)
+        self.panel.show()
+
+        self.audio = None
+        if args.audio:
+            from app.core.audio import AudioPlayer
+            self.audio = AudioPlayer()
+            self.audio.latency = self.latency
+            self.audio.preload([args.audio])
+
+        self.waiting = set()
+        self.timeout = QTimer()
+        self.timeout.setSingleShot(True)
+        self.timeout.timeout.connect(self.next_round)
+
+    def start(self):
+        self.timer.start()
+        self.next_round()
+
+    def next_round(self):
+        if self.rounds >= self.args.alerts:
+            self.app.quit()
+            return
+        self.rounds += 1
+        if self.audio is not None:
+            self.audio.stop()
+        self.panel.set_background(IDLE_COLOR)
+        self.waiting = {"alert", "flash"} if self.args.flash else {"alert"}
+        self.timer.seek(ALERT_S * 1000 + LEAD_MS)
+        self.timeout.start(ROUND_TIMEOUT_MS)
+
+    def on_alert(self):
+        self.latency.mark("alert", "signal")
+        if self.audio is not None:
+            self.audio.play(self.args.audio, trace="alert")
+        else:
+            self.latency.cancel("alert")
+        self.done("alert")
+
+    def on_flash(self, state):
+        if not state:
+            return
+        self.latency.mark("flash", "signal")
+        self.panel.set_background(FLASH_COLOR)
+        # Finished once the flash color has been painted
+        QTimer.singleShot(0, lambda: self.done("flash"))
+
+    def done(self, kind):
+        self.waiting.discard(kind)
+        if not self.waiting:
+            self.timeout.stop()
+            # Leave time for the sound to start before the next round
+            QTimer.singleShot(self.args.gap, self.next_round)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--audio", help="sound file played on every alert")
+    parser.add_argument("--flash", action="store_true", help="also trace the flash paint")
+    parser.add_argument("--gap", type=int, default=50, help="ms between rounds")
+    parser.add_argument("--export", help="write the histograms (.json or .csv)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    run = LatencyRun(app, args)
+    QTimer.singleShot(0, run.start)
+    app.exec_()
+
+    print(f"{run.rounds} rounds")
+    print(f"{'kind':<7}{'stage':<10}{'count':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    snapshot = run.latency.snapshot()
+    for kind, stages in STAGES.items():
+        for stage in stages:
+            s = snapshot.get(kind, {}).get(stage)
+            if s is None:
+                print(f"{kind:<7}{stage:<10}{0:>7}{'-':>10}{'-':>10}{'-':>10}")
+            else:
+                print(f"{kind:<7}{stage:<10}{s['count']:>7}{s['p50_ms']:>10.2f}{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}")
+    if args.export:
+        run.latency.export(args.export)
+        print(f"Exported to {args.export}")
+
+if __name__ == "__main__":
+    main()
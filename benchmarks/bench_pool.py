@@ -0,0 +1,84 @@
+"""
+TimerPool scaling benchmark.
+
+Runs N countdowns for a few seconds, once with a TimerPool and once with
+N independent CountdownTimer instances, and reports OS timer wakeups and
+process CPU time. With the pool, wakeups stay flat as N grows and the
+CPU cost per countdown event stays constant.
+
+Usage: python benchmarks/bench_pool.py [--seconds 5] [--counts 1 10 100 500 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+from app.core.pool import TimerPool
+from app.core.timer import CountdownTimer
+
+def run_loop(app, seconds):
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    cpu_start = time.process_time()
+    app.exec_()
+    return time.process_time() - cpu_start
+
+def bench_pool(app, count, seconds):
+    pool = TimerPool()
+    events = [0]
+    def on_update(_):
+        events[0] += 1
+    for i in range(count):
+        countdown = pool.create(f"room-{i}", 3600, alert_seconds=60)
+        countdown.time_updated.connect(on_update)
+    # Started together, like a morning of parallel sessions
+    for countdown in pool.timers.values():
+        countdown.start()
+    events[0] = 0
+    cpu = run_loop(app, seconds)
+    for name in list(pool.timers):
+        pool.remove(name)
+    return pool.wakeups, events[0], cpu
+
+def bench_independent(app, count, seconds):
+    timers = []
+    events = [0]
+    def on_update(_):
+        events[0] += 1
+    for _ in range(count):
+        timer = CountdownTimer()
+        timer.time_updated.connect(on_update)
+        timer.set_config(3600, 60)
+        timers.append(timer)
+    for timer in timers:
+        timer.start()
+    events[0] = 0
+    cpu = run_loop(app, seconds)
+    for timer in timers:
+        timer.pause()
+    # Every tick of an independent timer is its own wakeup
+    return events[0], events[0], cpu
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="run time per measurement")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 100, 500, 1000],
+                        help="numbers of countdowns")
+    args = parser.parse_args()
+    seconds = args.seconds
+    app = QCoreApplication(sys.argv[:1])
+
+    print(f"{'mode':<12}{'timers':>8}{'wakeups/s':>12}{'events/s':>12}{'cpu ms/s':>12}{'us/event':>12}")
+    for count in args.counts:
+        for mode, bench in (("pool", bench_pool), ("independent", bench_independent)):
+            wakeups, events, cpu = bench(app, count, seconds)
+            per_event = (cpu / events * 1e6) if events else 0.0
+            print(f"{mode:<12}{count:>8}{wakeups / seconds:>12.1f}{events / seconds:>12.1f}"
+                  f"{cpu / seconds * 1000:>12.2f}{per_event:>12.2f}")
+
+if __name__ == "__main__":
+    main()
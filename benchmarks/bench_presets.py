@@ -0,0 +1,57 @@
+"""
+Preset library benchmark.
+
+Times the operations behind the settings dialog's preset tab with N
+presets (default 10000):
+
+  digest       hashing the presets, done by Settings when they are loaded
+               or set, not when the dialog opens
+  sync-first   filling the SQLite store from the configured presets
+  sync-again   re-opening the dialog with unchanged presets (same process)
+  sync-reopen  the same after a restart (compares the cached digest)
+  list-all     ids of all presets, in order
+  search       ids of presets whose name contains a query
+  get          one preset by id
+
+Usage: python benchmarks/bench_presets.py [--count 10000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.settings import Preset, presets_digest
+from app.config.preset_store import PresetStore
+
+def timed(name, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{name:<12}{(time.perf_counter() - start) * 1000:>10.2f} ms")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10000, help="number of presets")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "presets.db")
+    presets = [Preset(f"会议 {i}", 300 + i, [60], 5, "") for i in range(args.count)]
+
+    digest = timed("digest", lambda: presets_digest(presets))
+    store = PresetStore(path)
+    timed("sync-first", lambda: store.sync(presets, digest))
+    timed("sync-again", lambda: store.sync(presets, digest))
+    store.close()
+
+    store = PresetStore(path)
+    timed("sync-reopen", lambda: store.sync(presets, digest))
+    ids = timed("list-all", store.ids)
+    timed("search", lambda: store.ids("99"))
+    timed("get", lambda: store.get(ids[len(ids) // 2]))
+    store.close()
+
+if __name__ == "__main__":
+    main()
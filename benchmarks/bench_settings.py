@@ -0,0 +1,75 @@
+"""
+Settings read benchmark.
+
+Compares the ways of reading a setting:
+
+  get          settings.get("window.opacity"), the dotted-string API
+  accessor     a getter compiled once with settings.accessor(key)
+  model        attribute access, settings.model.window.opacity
+  dict-walk    the original approach: split the key and walk nested dicts
+
+Usage: python benchmarks/bench_settings.py [--iterations 200000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.settings import Settings
+
+KEYS = ("window.opacity", "reminder.flash_color", "display.format", "audio.volume")
+
+def dict_walk(data, key, default=None):
+    val = data
+    for k in key.split('.'):
+        if isinstance(val, dict) and k in val:
+            val = val[k]
+        else:
+            return default
+    return val
+
+def run(name, read, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        read()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<12}{elapsed / (iterations * len(KEYS)) * 1e9:>10.1f} ns/read")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200000)
+    iterations = parser.parse_args().iterations
+    # A config file that doesn't exist yet, so nothing is read or written
+    settings = Settings(os.path.join(tempfile.mkdtemp(), "config.json"))
+    data = settings.data
+    accessors = [settings.accessor(key) for key in KEYS]
+    model = settings.model
+
+    def read_get():
+        for key in KEYS:
+            settings.get(key)
+
+    def read_accessor():
+        for get in accessors:
+            get()
+
+    def read_model():
+        model.window.opacity
+        model.reminder.flash_color
+        model.display.format
+        model.audio.volume
+
+    def read_dict_walk():
+        for key in KEYS:
+            dict_walk(data, key)
+
+    run("get", read_get, iterations)
+    run("accessor", read_accessor, iterations)
+    run("model", read_model, iterations)
+    run("dict-walk", read_dict_walk, iterations)
+
+if __name__ == "__main__":
+    main()
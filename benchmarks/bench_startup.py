@@ -0,0 +1,94 @@
+"""
+Cold start benchmark.
+
+1. Import time per module for `import app.ui.main_window`, from
+   `python -X importtime`, and whether heavy modules (QtMultimedia,
+   keyboard, the settings dialog) are loaded before the first frame.
+2. Time from interpreter start to the main window's first painted frame.
+
+Each measurement runs in a fresh interpreter.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 25]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ("PyQt5.QtMultimedia", "keyboard", "app.ui.settings_dialog", "app.core.audio")
+
+FIRST_PAINT_SCRIPT = r"""
+import sys, time
+t0 = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from app.ui.main_window import MainWindow
+t_import = time.perf_counter()
+app = QApplication(sys.argv)
+window = MainWindow()
+t_built = time.perf_counter()
+
+def on_first_paint():
+    t_paint = time.perf_counter()
+    loaded = [m for m in %r if m in sys.modules]
+    print(f"RESULT {t_import - t0:.6f} {t_built - t0:.6f} {t_paint - t0:.6f} {','.join(loaded) or '-'}")
+    app.quit()
+
+window.first_painted.connect(on_first_paint)
+window.show()
+app.exec_()
+""" % (LAZY_MODULES,)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def env():
+    e = dict(os.environ)
+    e.setdefault("QT_QPA_PLATFORM", "offscreen")
+    e["PYTHONPATH"] = ROOT + os.pathsep + e.get("PYTHONPATH", "")
+    return e
+
+def import_times(top_n):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.ui.main_window"],
+                          cwd=ROOT, env=env(), capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(cumulative_us), int(self_us), len(indent) // 2, name))
+    names = {name for _, _, _, name in rows}
+    print(f"Import time of app.ui.main_window (top {top_n} by cumulative)")
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for cumulative, self_us, depth, name in sorted(rows, reverse=True)[:top_n]:
+        print(f"{cumulative / 1000:>14.1f}{self_us / 1000:>10.1f}  {'  ' * depth}{name}")
+    print("Deferred modules loaded at import:",
+          ", ".join(m for m in LAZY_MODULES if m in names) or "none")
+    print()
+
+def first_paint(runs):
+    print("Time to first painted frame (s since interpreter start of the script)")
+    print(f"{'run':>4}{'imports':>10}{'window':>10}{'painted':>10}{'process':>10}  loaded before paint")
+    for run in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", FIRST_PAINT_SCRIPT],
+                              cwd=ROOT, env=env(), capture_output=True, text=True, timeout=60)
+        wall = time.perf_counter() - start
+        line = next((l for l in proc.stdout.splitlines() if l.startswith("RESULT")), None)
+        if line is None:
+            print(f"{run:>4}  failed: {proc.stderr.strip().splitlines()[-1:] or proc.returncode}")
+            continue
+        _, t_import, t_built, t_paint, loaded = line.split()
+        print(f"{run:>4}{float(t_import):>10.3f}{float(t_built):>10.3f}{float(t_paint):>10.3f}{wall:>10.3f}  {loaded}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="first paint runs")
+    parser.add_argument("--top", type=int, default=25, help="slowest imports to list")
+    args = parser.parse_args()
+    import_times(args.top)
+    first_paint(args.runs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Background restyle benchmark.
+
+Measures the cost of one flash toggle / background update, including the
+re-polish and repaint it causes, for:
+
+  stylesheet   the original approach: f-string stylesheets set on the
+               central widget, time container and time labels, plus setFont
+  cached       BackgroundStyles + BackgroundPanel as used by MainWindow
+
+Usage: python benchmarks/bench_styles.py [--iterations 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QHBoxLayout, QVBoxLayout
+
+from app.ui.styles import LIGHT_THEME, BackgroundStyles
+from app.ui.widgets import BackgroundPanel
+
+FLASH_COLOR = "#FF0000"
+
+def build(app, container_cls):
+    window = QWidget()
+    window.setStyleSheet(LIGHT_THEME)
+    central = container_cls()
+    central.setObjectName("CentralWidget")
+    time_container = container_cls()
+    time_container.setObjectName("TimeContainer")
+    labels = [QLabel(text) for text in ("05", ":", "00")]
+    row = QHBoxLayout(time_container)
+    for label in labels:
+        label.setObjectName("TimeLabelPart")
+        row.addWidget(label)
+    QVBoxLayout(central).addWidget(time_container)
+    QVBoxLayout(window).addWidget(central)
+    window.resize(600, 300)
+    window.show()
+    app.processEvents()
+    return window, central, time_container, labels
+
+def stylesheet_update(central, time_container, labels, flash):
+    color = FLASH_COLOR if flash else "rgba(240, 240, 240, 255)"
+    central.setStyleSheet(f"#CentralWidget {{ background-color: {color}; border-radius: 10px; }}")
+    time_container.setStyleSheet("#TimeContainer { background-color: transparent; }")
+    font = labels[0].font()
+    font.setPixelSize(150)
+    for label in labels:
+        label.setFont(font)
+    labels[1].setStyleSheet("padding-bottom: 22px; background-color: transparent;")
+    labels[0].setStyleSheet("background-color: transparent;")
+    labels[2].setStyleSheet("background-color: transparent;")
+
+def run(app, name, container_cls, update, iterations):
+    window, central, time_container, labels = build(app, container_cls)
+    start = time.perf_counter()
+    for i in range(iterations):
+        update(central, time_container, labels, i % 2 == 0)
+        window.repaint()
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    window.close()
+    print(f"{name:<12}{elapsed / iterations * 1e6:>12.1f} us/update")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    iterations = parser.parse_args().iterations
+    app = QApplication(sys.argv[:1])
+    styles = BackgroundStyles()
+    applied = [None]
+
+    def cached_update(central, time_container, labels, flash):
+        key = ("light", False, 1.0, FLASH_COLOR if flash else None)
+        if key != applied[0]:
+            applied[0] = key
+            central_color, container_color = styles.get(*key)
+            central.set_background(central_color)
+            time_container.set_background(container_color)
+
+    run(app, "stylesheet", QWidget, stylesheet_update, iterations)
+    run(app, "cached", BackgroundPanel, cached_update, iterations)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Drift / jitter benchmark for countdown timing strategies.
+
+Simulates multi-hour countdowns on a VirtualClock, with every wakeup
+delivered late by a random scheduler jitter, and compares:
+
+  legacy-20ms       20 ms periodic tick, remaining -= time.time() delta
+                    (the original engine, including one wall clock step)
+  deadline-20ms     monotonic deadline core, polled every 20 ms
+  deadline-aligned  monotonic deadline core, woken only at display
+                    boundaries and thresholds (current engine)
+
+Reports the final drift, how late alert/flash/finish fire (p50/p99) and
+the total number of wakeups. No Qt needed.
+
+Usage: python benchmarks/bench_timing.py [--hours 2] [--runs 10] [--seed 1]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.clock import VirtualClock
+from app.core.countdown import Countdown, NS_PER_MS, FLASH_HALF_PERIOD_NS
+
+NS_PER_S = 1000 * NS_PER_MS
+WALL_EPOCH_S = 1.7e9 # time.time() magnitude, for realistic float rounding
+
+class Jitter:
+    """Wakeup lateness: mostly ~1 ms, sometimes a coarse-timer/GC spike."""
+    def __init__(self, rng, mean_ms, spike_prob, spike_ms):
+        self.rng = rng
+        self.mean_ms = mean_ms
+        self.spike_prob = spike_prob
+        self.spike_ms = spike_ms
+
+    def sample_ns(self):
+        late = self.rng.expovariate(1.0 / self.mean_ms) if self.mean_ms > 0 else 0.0
+        if self.rng.random() < self.spike_prob:
+            late += self.rng.uniform(0, self.spike_ms)
+        return int(late * NS_PER_MS)
+
+class Result:
+    def __init__(self):
+        self.wakeups = 0
+        self.drift_ns = [] # finish time error per run
+        self.late_ns = {"alert": [], "flash": [], "finish": []}
+
+def percentile(values, pct):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+def ideal_times(start_ns, duration_s, alerts_s, flash_s):
+    duration_ns = duration_s * NS_PER_S
+    return {
+        "alert": [start_ns + duration_ns - a * NS_PER_S for a in sorted(alerts_s, reverse=True)],
+        # First visible flash: half a second into the flash window
+        "flash": [start_ns + duration_ns - flash_s * NS_PER_S + FLASH_HALF_PERIOD_NS],
+        "finish": [start_ns + duration_ns],
+    }
+
+def record(result, ideal, fired):
+    for kind, times in fired.items():
+        for actual, expected in zip(times, ideal[kind]):
+            result.late_ns[kind].append(actual - expected)
+    result.drift_ns.append(fired["finish"][0] - ideal["finish"][0])
+
+def run_legacy(result, jitter, duration_s, alerts_s, flash_s, wall_step_ms):
+    # Port of the original _on_tick: wall clock deltas accumulated into a
+    # float remaining, one alert, checks on every 20 ms tick.
+    clock = VirtualClock()
+    start = clock.now_ns()
+    wall_offset = WALL_EPOCH_S
+    step_at = start + duration_s * NS_PER_S // 2
+    stepped = False
+
+    def wall():
+        return clock.now_ns() / NS_PER_S + wall_offset
+
+    remaining = duration_s * 1000.0
+    alert_time = max(alerts_s) * 1000 if alerts_s else 0
+    flash_start = flash_s * 1000
+    alert_flag = False
+    flashing = False
+    fired = {"alert": [], "flash": [], "finish": []}
+    last = wall()
+    nominal = start
+    while True:
+        nominal += 20 * NS_PER_MS
+        clock.set(max(clock.now_ns(), nominal + jitter.sample_ns()))
+        result.wakeups += 1
+        if not stepped and clock.now_ns() >= step_at:
+            # NTP / DST style wall clock adjustment mid-session
+            wall_offset += wall_step_ms / 1000.0
+            stepped = True
+        current = wall()
+        remaining -= (current - last) * 1000
+        last = current
+        if alert_time > 0 and remaining <= alert_time and not alert_flag:
+            alert_flag = True
+            fired["alert"].append(clock.now_ns())
+        if remaining <= flash_start and not flashing:
+            flashing = True
+            # The free-running 500 ms flash timer turns it on one period later
+            fired["flash"].append(clock.now_ns() + FLASH_HALF_PERIOD_NS + jitter.sample_ns())
+        if remaining <= 0:
+            fired["finish"].append(clock.now_ns())
+            break
+    record(result, ideal_times(start, duration_s, [max(alerts_s)] if alerts_s else [], flash_s), fired)
+
+def run_core(result, jitter, duration_s, alerts_s, flash_s, poll_ms):
+    clock = VirtualClock()
+    fired = {"alert": [], "flash": [], "finish": []}
+    pending = [None]
+
+    def on_schedule(due_ns):
+        pending[0] = due_ns
+
+    def on_flash(state):
+        if state and not fired["flash"]:
+            fired["flash"].append(clock.now_ns())
+
+    countdown = Countdown(on_alert=lambda: fired["alert"].append(clock.now_ns()),
+                          on_flash=on_flash,
+                          on_finished=lambda: fired["finish"].append(clock.now_ns()),
+                          on_schedule=on_schedule,
+                          clock=clock)
+    countdown.set_config(duration_s, list(alerts_s), flash_s)
+    start = clock.now_ns()
+    countdown.start()
+    nominal = start
+    while countdown.is_running:
+        if poll_ms:
+            nominal += poll_ms * NS_PER_MS
+            due = nominal
+        else:
+            due = pending[0]
+        clock.set(max(clock.now_ns(), due + jitter.sample_ns()))
+        result.wakeups += 1
+        countdown.tick()
+    record(result, ideal_times(start, duration_s, alerts_s, flash_s), fired)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hours", type=float, default=2.0, help="countdown length")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jitter-ms", type=float, default=1.0, help="mean wakeup lateness")
+    parser.add_argument("--spike-prob", type=float, default=0.01)
+    parser.add_argument("--spike-ms", type=float, default=16.0)
+    parser.add_argument("--wall-step-ms", type=float, default=-1000.0,
+                        help="wall clock adjustment applied mid-run (legacy engine only sees it)")
+    args = parser.parse_args()
+
+    duration_s = int(args.hours * 3600)
+    alerts_s = [300, 60]
+    flash_s = 30
+
+    strategies = (
+        ("legacy-20ms", lambda r, j: run_legacy(r, j, duration_s, alerts_s, flash_s, args.wall_step_ms)),
+        ("deadline-20ms", lambda r, j: run_core(r, j, duration_s, alerts_s, flash_s, 20)),
+        ("deadline-aligned", lambda r, j: run_core(r, j, duration_s, alerts_s, flash_s, 0)),
+    )
+
+    print(f"{args.runs} runs of {args.hours:g} h, jitter mean {args.jitter_ms} ms, "
+          f"spikes {args.spike_prob:.0%} up to {args.spike_ms} ms")
+    header = f"{'strategy':<18}{'wakeups/run':>12}{'drift p50':>11}{'drift max':>11}"
+    for kind in ("alert", "flash", "finish"):
+        header += f"{kind + ' p50':>13}{kind + ' p99':>13}"
+    print(header + "   (times in ms)")
+
+    for name, run in strategies:
+        rng = random.Random(args.seed)
+        jitter = Jitter(rng, args.jitter_ms, args.spike_prob, args.spike_ms)
+        result = Result()
+        for _ in range(args.runs):
+            run(result, jitter)
+        drift = [abs(d) for d in result.drift_ns]
+        line = (f"{name:<18}{result.wakeups / args.runs:>12.0f}"
+                f"{percentile(drift, 50) / NS_PER_MS:>11.2f}{max(drift) / NS_PER_MS:>11.2f}")
+        for kind in ("alert", "flash", "finish"):
+            late = result.late_ns[kind]
+            line += f"{percentile(late, 50) / NS_PER_MS:>13.2f}{percentile(late, 99) / NS_PER_MS:>13.2f}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from datetime import date, datetime
+
+from app.config.settings import Preset
+from app.core.agenda import Agenda, AgendaSlot, build_slots, format_delta, parse_start
+
+NOW = 1_700_000_000.0
+
+PRESETS = [Preset("a", 300), Preset("b", 600), Preset("c", 900)]
+
+def test_floating_agenda_starts_at_first_slot():
+    agenda = Agenda(build_slots([], PRESETS), NOW)
+    assert not agenda.has_fixed_starts()
+    assert agenda.index_at(NOW) == 0
+    assert agenda.starts == [NOW, NOW + 300, NOW + 900]
+
+def test_index_at_with_fixed_starts():
+    day = date(2026, 1, 5)
+    slots = build_slots([{"preset": "a", "start": "09:00"}, {"preset": "b"}, {"preset": 2, "start": "10:00"}],
+                        PRESETS, day)
+    agenda = Agenda(slots, NOW)
+    assert agenda.has_fixed_starts()
+    nine = datetime(2026, 1, 5, 9, 0).timestamp()
+    ten = datetime(2026, 1, 5, 10, 0).timestamp()
+    assert agenda.starts == [nine, nine + 300, ten]
+    assert agenda.index_at(nine - 60) == 0
+    assert agenda.index_at(nine + 400) == 1
+    assert agenda.index_at(ten + 1) == 2
+
+def test_start_anchors_floating_slots_at_current_index():
+    agenda = Agenda(build_slots([], PRESETS), 0)
+    agenda.seek(1)
+    agenda.start(NOW)
+    assert agenda.elapsed_before(1) == 300
+    assert agenda.starts[1] == NOW
+    assert agenda.ends[1] == NOW + 600
+
+def test_elapsed_before_ignores_fixed_start_times():
+    slots = [AgendaSlot(0, 300), AgendaSlot(1, 600, fixed_start=NOW + 3600), AgendaSlot(2, 900)]
+    agenda = Agenda(slots, 0)
+    assert agenda.elapsed_before(2) == 900
+
+def test_delta_and_advance():
+    agenda = Agenda(build_slots([], PRESETS), 0)
+    agenda.start(NOW)
+    # 10 s late into the first slot, with its full duration still remaining
+    assert agenda.delta(NOW + 10, 300) == 10
+    assert agenda.advance() and agenda.index == 1
+    assert agenda.advance() and agenda.index == 2
+    assert not agenda.advance()
+
+def test_unknown_presets_are_skipped():
+    slots = build_slots([{"preset": "missing"}, {"preset": 7}, "bad", {"preset": "c"}], PRESETS)
+    assert [s.preset_index for s in slots] == [2]
+
+def test_parse_start_and_format_delta():
+    day = date(2026, 1, 5)
+    assert parse_start("08:30", day) == datetime(2026, 1, 5, 8, 30).timestamp()
+    assert parse_start("25:00", day) is None
+    assert parse_start("", day) is None
+    assert format_delta(0.2) == "准时"
+    assert format_delta(75) == "落后 01:15"
+    assert format_delta(-5) == "提前 00:05"
+
+def test_fixed_start_before_previous_end_follows_it():
+    ten = NOW + 3600
+    slots = [AgendaSlot(0, 3600, fixed_start=ten), AgendaSlot(1, 600, fixed_start=ten - 1800),
+             AgendaSlot(2, 900)]
+    agenda = Agenda(slots, NOW)
+    assert agenda.starts == [ten, ten + 3600, ten + 4200]
+    assert agenda.ends == [ten + 3600, ten + 4200, ten + 5100]
+    assert agenda.index_at(ten + 1800) == 0
+    assert agenda.index_at(ten + 3700) == 1
@@ -0,0 +1,34 @@
+import asyncio
+
+from app.core.async_driver import AsyncCountdownDriver
+from app.core.countdown import Countdown
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+def test_wait_finished_returns_when_not_started():
+    driver = AsyncCountdownDriver()
+    run(driver.wait_finished())
+
+def test_on_finished_set_after_construction_is_called():
+    async def main():
+        driver = AsyncCountdownDriver(Countdown())
+        calls = []
+        driver.countdown.on_finished = lambda: calls.append("finished")
+        driver.countdown.on_alert = lambda: calls.append("alert")
+        driver.countdown.set_config(1, [], 0)
+        driver.countdown.seek(100)
+        driver.countdown.start()
+        await driver.wait_finished()
+        return calls
+    assert run(main()) == ["finished"]
+
+def test_wait_finished_returns_on_pause():
+    async def main():
+        driver = AsyncCountdownDriver()
+        driver.countdown.set_config(60, [], 0)
+        driver.countdown.start()
+        asyncio.get_running_loop().call_later(0.05, driver.countdown.pause)
+        await driver.wait_finished()
+        return driver.countdown.remaining_ns()
+    assert run(main()) > 0
@@ -0,0 +1,132 @@
+from app.core.clock import VirtualClock
+from app.core.countdown import (Countdown, compile_schedule, next_change_ns,
+                                EVENT_ALERT, EVENT_FLASH, EVENT_FINISH, NS_PER_MS)
+
+class Harness:
+    """Runs a Countdown on a VirtualClock, ticking exactly when asked to."""
+    def __init__(self, duration, alerts=(), flash=0):
+        self.clock = VirtualClock(10**12)
+        self.events = []
+        self.due = None
+        self.countdown = Countdown(
+            on_update=lambda ms: None,
+            on_finished=lambda: self.events.append(("finished", self.now_ms())),
+            on_alert=lambda: self.events.append(("alert", self.now_ms())),
+            on_flash=lambda state: self.events.append(("flash", state, self.now_ms())),
+            on_schedule=self.on_schedule,
+            clock=self.clock)
+        self.start_ns = self.clock.now_ns()
+        self.countdown.set_config(duration, list(alerts), flash)
+
+    def on_schedule(self, due_ns):
+        self.due = due_ns
+
+    def now_ms(self):
+        return (self.clock.now_ns() - self.start_ns) // NS_PER_MS
+
+    def run_until(self, ms):
+        end = self.start_ns + ms * NS_PER_MS
+        while self.due is not None and self.due <= end:
+            self.clock.set(max(self.clock.now_ns(), self.due))
+            self.due = None
+            self.countdown.tick()
+        self.clock.set(max(self.clock.now_ns(), end))
+
+def test_compile_schedule_orders_thresholds():
+    events = compile_schedule([60000, 0, 120000], 60000)
+    assert events == [(120000, EVENT_ALERT), (60000, EVENT_ALERT), (60000, EVENT_FLASH), (0, EVENT_FINISH)]
+
+def test_next_change_ns():
+    second = 1000 * NS_PER_MS
+    assert next_change_ns(2500 * NS_PER_MS, [(second, 0)], ()) == 2000 * NS_PER_MS
+    # A pending threshold above the next step boundary comes first
+    assert next_change_ns(2500 * NS_PER_MS, [(second, 0)], (2200 * NS_PER_MS,)) == 2200 * NS_PER_MS
+    # An exact boundary moves on to the next one
+    assert next_change_ns(2000 * NS_PER_MS, [(second, 0)], ()) == 1000 * NS_PER_MS
+
+def test_next_change_ns_with_offset():
+    steps = [(100 * NS_PER_MS, 50 * NS_PER_MS)]
+    assert next_change_ns(1000 * NS_PER_MS, steps, ()) == 950 * NS_PER_MS
+    assert next_change_ns(950 * NS_PER_MS, steps, ()) == 850 * NS_PER_MS
+    assert next_change_ns(50 * NS_PER_MS, steps, ()) == 0
+
+def test_alerts_and_finish_fire_on_time():
+    h = Harness(10, alerts=[7, 3])
+    h.countdown.start()
+    h.run_until(20000)
+    assert h.events == [("alert", 3000), ("alert", 7000), ("finished", 10000)]
+    assert not h.countdown.is_running
+    assert h.countdown.remaining == 0
+
+def test_late_tick_fires_passed_thresholds_once():
+    h = Harness(10, alerts=[7, 3])
+    h.countdown.start()
+    h.clock.advance_ms(8000)
+    h.countdown.tick()
+    assert [e[0] for e in h.events] == ["alert", "alert"]
+    h.countdown.tick()
+    assert len(h.events) == 2
+
+def test_pause_keeps_remaining_time():
+    h = Harness(10)
+    h.countdown.start()
+    h.run_until(4000)
+    h.countdown.pause()
+    assert h.due is None
+    h.clock.advance_ms(60000)
+    assert h.countdown.remaining == 6000
+    h.countdown.start()
+    assert h.countdown.remaining == 6000
+
+def test_seek_skips_passed_alerts():
+    h = Harness(10, alerts=[7, 3])
+    h.countdown.start()
+    h.countdown.seek(5000)
+    h.run_until(20000)
+    assert [e[0] for e in h.events] == ["alert", "finished"]
+
+def test_flash_cycle_follows_deadline():
+    h = Harness(10, flash=2)
+    h.countdown.start()
+    h.run_until(10000)
+    flashes = [(state, ms) for kind, *rest in h.events if kind == "flash" for state, ms in [rest]]
+    # Off for the first half second of the window, then toggling every 500 ms
+    assert flashes == [(True, 8500), (False, 9000), (True, 9500), (False, 10000)]
+
+def test_seek_out_of_flash_window_turns_flash_off():
+    h = Harness(10, flash=2)
+    h.countdown.start()
+    h.run_until(8600)
+    assert h.countdown.flash_state
+    h.countdown.seek(5000)
+    assert not h.countdown.flash_state
+    assert h.events[-1][:2] == ("flash", False)
+
+def test_start_chained_continues_from_previous_deadline():
+    h = Harness(10)
+    h.countdown.start()
+    h.run_until(10000)
+    # Handling the finish took 30 ms; the next run doesn't lose it
+    h.clock.advance_ms(30)
+    h.countdown.reset()
+    h.countdown.start_chained()
+    assert h.countdown.remaining == 10000 - 30
+
+def test_last_event_ns_is_ideal_threshold_time():
+    h = Harness(10, alerts=[3])
+    seen = []
+    h.countdown.on_alert = lambda: seen.append(h.countdown.last_event_ns - h.start_ns)
+    h.countdown.start()
+    h.clock.advance_ms(7005)
+    h.countdown.tick()
+    assert seen == [7000 * NS_PER_MS]
+
+def test_only_tick_crossings_are_marked_as_events():
+    h = Harness(10, flash=2)
+    h.countdown.start()
+    assert not h.countdown.event_crossed
+    # Seeking into the flash window turns the flash on without a crossing
+    h.countdown.seek(1200)
+    assert h.countdown.flash_state and not h.countdown.event_crossed
+    h.run_until(1000)
+    assert h.countdown.event_crossed
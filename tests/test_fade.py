@@ -0,0 +1,46 @@
+import pytest
+
+from app.core.clock import VirtualClock
+from app.core.fade import CURVES, Fade, MIN_INTERVAL_MS, MAX_INTERVAL_MS
+
+@pytest.mark.parametrize("name", sorted(CURVES))
+def test_curves_span_zero_to_one(name):
+    curve = CURVES[name]
+    assert curve(0) == pytest.approx(0)
+    assert curve(1) == pytest.approx(1)
+    assert all(curve(i / 10) <= curve((i + 1) / 10) for i in range(10))
+
+def test_fade_follows_elapsed_time():
+    clock = VirtualClock()
+    fade = Fade(0, 80, 2000, "linear", clock)
+    clock.advance_ms(500)
+    assert fade.volume() == pytest.approx(20)
+    # However late the update, the fade ends after exactly its duration
+    clock.advance_ms(5000)
+    assert fade.done()
+    assert fade.volume() == 80
+
+def test_fade_out_mirrors_fade_in():
+    clock = VirtualClock()
+    fade_in = Fade(0, 100, 1000, "log", clock)
+    fade_out = Fade(100, 0, 1000, "log", clock)
+    # The fade out retraces the fade in backwards
+    assert fade_out.volume(fade_out.start_ns + 300 * 1000000) == pytest.approx(
+        fade_in.volume(fade_in.start_ns + 700 * 1000000))
+
+def test_next_update_ms_is_bounded():
+    clock = VirtualClock()
+    fade = Fade(0, 100, 10000, "linear", clock)
+    # 100 volume steps over 10 s: about one step every 100 ms
+    assert fade.next_update_ms() == MAX_INTERVAL_MS
+    fast = Fade(0, 100, 200, "linear", clock)
+    assert fast.next_update_ms() == MIN_INTERVAL_MS
+    clock.advance_ms(195)
+    assert fast.next_update_ms() == 5
+    clock.advance_ms(10)
+    assert fast.next_update_ms() == 0
+
+def test_zero_duration_is_done_at_once():
+    fade = Fade(20, 80, 0, "equal_power", VirtualClock())
+    assert fade.done()
+    assert fade.volume() == 80
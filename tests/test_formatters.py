@@ -0,0 +1,32 @@
+from app.core.countdown import NS_PER_MS, next_change_ns
+from app.ui.formatters import MinSecFormatter, PercentFormatter
+
+def changes(formatter, total_ms):
+    # Remaining times (ms) at which the text differs from one ms earlier
+    return [r for r in range(total_ms, 0, -1)
+            if formatter.format(r - 1) != formatter.format(r)]
+
+def scheduled(formatter, total_ms):
+    step = formatter.tick_step_ms()
+    step, offset = step if isinstance(step, tuple) else (step, 0)
+    steps = [(int(step * NS_PER_MS), int(offset * NS_PER_MS))]
+    wakeups = []
+    remaining = total_ms * NS_PER_MS
+    while remaining > 0:
+        remaining = next_change_ns(remaining, steps, ())
+        wakeups.append(remaining // NS_PER_MS)
+    return wakeups
+
+def test_percent_wakes_only_when_the_text_changes():
+    total = 60000
+    formatter = PercentFormatter(total)
+    assert formatter.format(total) == "100.0%"
+    assert formatter.format(30) == "0.0%"
+    assert formatter.format(31) == "0.1%"
+    # A change between r and r - 1 is shown by the tick at r - 1; the
+    # finish at 0 is scheduled anyway
+    assert [r - 1 for r in changes(formatter, total)] == scheduled(formatter, total)[:-1]
+
+def test_min_sec_wakes_on_whole_seconds():
+    formatter = MinSecFormatter(5000)
+    assert [r - 1 for r in changes(formatter, 5000)] == scheduled(formatter, 5000)
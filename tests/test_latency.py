@@ -0,0 +1,57 @@
+import json
+
+from app.core.clock import VirtualClock
+from app.core.latency import LatencyRecorder, NS_PER_MS
+
+def test_stages_measured_from_ideal_time():
+    clock = VirtualClock(1000 * NS_PER_MS)
+    recorder = LatencyRecorder(clock)
+    recorder.begin("alert", ideal_ns=999 * NS_PER_MS)
+    clock.advance_ms(2)
+    recorder.mark("alert", "signal")
+    clock.advance_ms(3)
+    recorder.mark("alert", "play")
+    recorder.mark("alert", "play") # Only the first mark of a stage counts
+    clock.advance_ms(5)
+    recorder.mark("alert", "playing")
+    snapshot = recorder.snapshot()["alert"]
+    assert snapshot["crossing"]["p50_ms"] == 1
+    assert snapshot["signal"]["p50_ms"] == 3
+    assert snapshot["play"]["count"] == 1
+    assert snapshot["playing"]["p50_ms"] == 11
+    # The last stage closes the trace
+    assert "alert" not in recorder.open
+
+def test_cancel_drops_open_trace():
+    clock = VirtualClock()
+    recorder = LatencyRecorder(clock)
+    recorder.begin("alert", 0)
+    recorder.mark("alert", "signal")
+    recorder.cancel("alert")
+    clock.advance_ms(300000)
+    recorder.mark("alert", "playing")
+    assert "playing" not in recorder.snapshot()["alert"]
+
+def test_disabled_recorder_records_nothing():
+    recorder = LatencyRecorder(VirtualClock(), enabled=False)
+    recorder.begin("flash", 0)
+    recorder.mark("flash", "paint")
+    assert recorder.snapshot() == {}
+
+def test_percentiles_and_export(tmp_path):
+    clock = VirtualClock()
+    recorder = LatencyRecorder(clock)
+    for ms in range(1, 101):
+        recorder.begin("flash", clock.now_ns())
+        clock.advance_ms(ms)
+        recorder.mark("flash", "paint")
+    paint = recorder.snapshot()["flash"]["paint"]
+    assert paint["count"] == 100
+    assert paint["p50_ms"] == 50
+    assert paint["p99_ms"] == 99
+    assert paint["max_ms"] == 100
+    path = tmp_path / "latency.json"
+    recorder.export(str(path))
+    assert json.loads(path.read_text())["flash"]["paint"]["count"] == 100
+    recorder.export(str(tmp_path / "latency.csv"))
+    assert (tmp_path / "latency.csv").read_text().startswith("kind,stage,count")
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt5.QtCore")
+
+from app.core.clock import VirtualClock
+from app.core.countdown import NS_PER_MS
+from app.core.pool import TimerPool
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+def run_until(pool, ms):
+    # Stand-in for the OS timer: wake the pool at every armed due time
+    end = ms * NS_PER_MS
+    while pool._armed_ns is not None and pool._armed_ns <= end:
+        pool.clock.set(max(pool.clock.now_ns(), pool._armed_ns))
+        pool._on_timeout()
+    pool.clock.set(max(pool.clock.now_ns(), end))
+
+def test_countdowns_share_one_timer(app):
+    pool = TimerPool(VirtualClock())
+    finished = []
+    for i in range(50):
+        countdown = pool.create(f"t{i}", 5, [2], 0)
+        countdown.set_tick_steps([])
+        countdown.finished.connect(lambda i=i: finished.append(i))
+        countdown.start()
+    run_until(pool, 6000)
+    assert sorted(finished) == list(range(50))
+    # All countdowns are due together, so each wakeup serves all of them
+    assert pool.wakeups == 2
+
+def test_paused_and_removed_countdowns_are_skipped(app):
+    pool = TimerPool(VirtualClock())
+    finished = []
+    for name in ("a", "b", "c"):
+        countdown = pool.create(name, 3, 0, 0)
+        countdown.finished.connect(lambda name=name: finished.append(name))
+        countdown.start()
+    pool.get("b").pause()
+    pool.remove("c")
+    run_until(pool, 5000)
+    assert finished == ["a"]
+    assert pool.get("b").remaining == 3000
+    assert "c" not in pool and len(pool) == 2
+
+def test_duplicate_name_rejected(app):
+    pool = TimerPool(VirtualClock())
+    pool.create("a", 1)
+    with pytest.raises(KeyError):
+        pool.create("a", 1)
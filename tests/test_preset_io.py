@@ -0,0 +1,81 @@
+import pytest
+
+from app.config.preset_io import (PresetImporter, PresetExporter, normalize_preset,
+                                  parse_seconds, parse_ical_duration)
+from app.config.preset_store import PresetStore
+from app.config.settings import Preset
+
+def run(task):
+    while task.step():
+        pass
+
+@pytest.fixture
+def store(tmp_path):
+    store = PresetStore(str(tmp_path / "p.db"))
+    store.sync([Preset("已有", 300)])
+    yield store
+    store.close()
+
+def test_parse_seconds():
+    assert parse_seconds(90) == 90
+    assert parse_seconds("05:00") == 300
+    assert parse_seconds("1:30:00") == 5400
+    assert parse_seconds("abc") is None
+    assert parse_seconds(True) is None
+    assert parse_ical_duration("PT1H30M") == 5400
+    assert parse_ical_duration("-PT5M") is None
+
+def test_normalize_preset():
+    preset = normalize_preset({"name": " a ", "duration": "10:00", "alerts": "60; 30, 900", "music": 3})
+    assert (preset.name, preset.duration, preset.alerts, preset.music) == ("a", 600, [60, 30], "")
+    assert normalize_preset({"name": "a", "duration": 0}) is None
+    assert normalize_preset({"duration": 60}) is None
+    assert normalize_preset("a") is None
+
+def test_unsupported_format_opens_nothing(tmp_path, store, monkeypatch):
+    path = tmp_path / "presets.txt"
+    path.write_text("x")
+    opened = []
+    monkeypatch.setattr("builtins.open", lambda *a, **k: opened.append(a))
+    with pytest.raises(ValueError):
+        PresetImporter(str(path), store)
+    with pytest.raises(ValueError):
+        PresetExporter(str(tmp_path / "out.txt"), store)
+    assert opened == []
+
+def test_csv_import_skips_duplicates_and_invalid(tmp_path, store):
+    path = tmp_path / "presets.csv"
+    path.write_text("﻿name,duration,alerts\n已有,300,\n新,05:00,60\n新,300,\n坏,abc,\n",
+                    encoding='utf-8')
+    importer = PresetImporter(str(path), store, chunk_size=1)
+    run(importer)
+    assert (importer.imported, importer.duplicates, importer.invalid) == (1, 2, 1)
+    assert [p.name for p in store.all()] == ["已有", "新"]
+    assert importer.raw.closed
+
+@pytest.mark.parametrize("ext", [".jsonl", ".csv", ".ics", ".json"])
+def test_export_import_round_trip(tmp_path, ext):
+    source = PresetStore(str(tmp_path / "a.db"))
+    presets = [Preset(f"p{i}", 60 * (i + 1), [30], 5, "") for i in range(7)]
+    source.sync(presets)
+    path = str(tmp_path / ("out" + ext))
+    exporter = PresetExporter(path, source, chunk_size=3)
+    run(exporter)
+    assert exporter.exported == 7
+
+    target = PresetStore(str(tmp_path / "b.db"))
+    target.sync([])
+    run(PresetImporter(path, target, chunk_size=3))
+    imported = target.all()
+    assert [(p.name, p.duration) for p in imported] == [(p.name, p.duration) for p in presets]
+    source.close()
+    target.close()
+
+def test_cancelled_export_writes_nothing(tmp_path, store):
+    store.insert_many([Preset(f"p{i}", 60 + i) for i in range(10)])
+    path = str(tmp_path / "out.jsonl")
+    exporter = PresetExporter(path, store, chunk_size=4)
+    assert exporter.step()
+    exporter.close()
+    assert not (tmp_path / "out.jsonl").exists()
+    assert not (tmp_path / "out.jsonl.tmp").exists()
@@ -0,0 +1,45 @@
+import sqlite3
+
+from app.config.preset_store import PresetStore
+from app.config.settings import Preset
+
+PRESETS = [Preset("5分钟", 300, [60], 10, ""), Preset("10分钟", 600, [60], 10, ""), Preset("汇报", 900)]
+
+def test_sync_only_rewrites_when_presets_change(tmp_path):
+    store = PresetStore(str(tmp_path / "p.db"))
+    assert store.sync(list(PRESETS))
+    assert not store.sync(list(PRESETS))
+    assert store.all() == PRESETS
+    assert store.sync(PRESETS[:2])
+    assert store.count() == 2
+
+def test_search_and_get(tmp_path):
+    store = PresetStore(str(tmp_path / "p.db"))
+    store.sync(PRESETS)
+    ids = store.ids("分钟")
+    assert [store.get(i).name for i in ids] == ["5分钟", "10分钟"]
+    assert store.ids("100%") == []
+    assert store.get(-1) is None
+
+def test_update_commits_on_commit(tmp_path):
+    path = str(tmp_path / "p.db")
+    store = PresetStore(path)
+    store.sync(PRESETS)
+    preset_id = store.ids()[0]
+    store.update(preset_id, Preset("改名", 300))
+    assert store.get(preset_id).name == "改名"
+    # Not visible to other connections until committed
+    other = sqlite3.connect(path)
+    assert other.execute("SELECT name FROM presets WHERE id = ?", (preset_id,)).fetchone()[0] == "5分钟"
+    store.commit()
+    assert other.execute("SELECT name FROM presets WHERE id = ?", (preset_id,)).fetchone()[0] == "改名"
+    other.close()
+
+def test_insert_and_delete_keep_order(tmp_path):
+    store = PresetStore(str(tmp_path / "p.db"))
+    store.sync(PRESETS)
+    new_id = store.insert(Preset("新预设", 60))
+    store.insert_many([Preset("x", 1), Preset("y", 2)])
+    store.delete(store.ids()[0])
+    assert [p.name for p in store.all()] == ["10分钟", "汇报", "新预设", "x", "y"]
+    assert store.get(new_id).duration == 60
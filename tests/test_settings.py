@@ -0,0 +1,165 @@
+import json
+import threading
+
+import pytest
+
+from app.config.settings import Settings, SettingsModel, DEFAULT_SETTINGS
+
+def write_config(tmp_path, data):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+@pytest.mark.parametrize("bad", [
+    {"alerts": ["60"]},
+    {"alerts": 60},
+    {"alerts": [None, "x", -5, True]},
+    {"alert_time": "60"},
+    {"alert_time": None},
+])
+def test_bad_preset_keeps_rest_of_config(tmp_path, bad):
+    data = {
+        "theme": "dark",
+        "display": {"format": "seconds", "font_size": 90},
+        "presets": [
+            dict({"name": "坏", "duration": 120}, **bad),
+            {"name": "好", "duration": 300, "alerts": [60, 30], "flash_time": 10, "music": ""},
+        ],
+    }
+    settings = Settings(write_config(tmp_path, data))
+    model = settings.model
+    assert model.theme == "dark"
+    assert model.display.format == "seconds"
+    assert model.display.font_size == 90
+    assert [p.name for p in model.presets] == ["坏", "好"]
+    assert model.presets[1].alerts == [60, 30]
+    assert all(isinstance(t, int) and t > 0 for t in model.presets[0].alerts)
+
+def test_numeric_string_alerts_are_converted():
+    model = SettingsModel({"presets": [{"name": "a", "duration": 100, "alerts": ["60", 30, "30"]}]})
+    assert model.presets[0].alerts == [60, 30]
+
+def test_legacy_alert_time():
+    model = SettingsModel({"presets": [{"name": "a", "duration": 100, "alert_time": 20}]})
+    assert model.presets[0].alerts == [20]
+
+def test_invalid_values_fall_back_and_clamp():
+    model = SettingsModel({
+        "window": {"width": "wide", "opacity": 5},
+        "display": {"format": "bogus", "font_size": 1},
+        "theme": "purple",
+    })
+    assert model.window.width == DEFAULT_SETTINGS["window"]["width"]
+    assert model.window.opacity == 1.0
+    assert model.display.format == "min_sec"
+    assert model.display.font_size == 20
+    assert model.theme == DEFAULT_SETTINGS["theme"]
+
+def test_unknown_keys_survive_round_trip():
+    model = SettingsModel({"custom": {"a": 1}})
+    assert model.to_dict()["custom"] == {"a": 1}
+
+def test_invalid_json_falls_back_to_defaults(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{not json", encoding='utf-8')
+    settings = Settings(str(path))
+    assert settings.model.theme == DEFAULT_SETTINGS["theme"]
+
+def test_interleaved_flushes_write_newest_last(tmp_path):
+    settings = Settings(write_config(tmp_path, {"theme": "light"}))
+    settings.set("display.font_size", 120)
+    write_file = settings.write_file
+    writing = threading.Event()
+    release = threading.Event()
+
+    def slow_write(text):
+        # The first write (the save timer's) stalls until released
+        if not writing.is_set():
+            writing.set()
+            release.wait(2)
+        write_file(text)
+
+    settings.write_file = slow_write
+    saver = threading.Thread(target=settings.flush)
+    saver.start()
+    assert writing.wait(2)
+    settings.set("display.font_size", 99)
+    exit_flush = threading.Thread(target=settings.flush)
+    exit_flush.start()
+    exit_flush.join(0.2)
+    # The exit flush waits for the write in progress instead of returning
+    assert exit_flush.is_alive()
+    release.set()
+    saver.join(2)
+    exit_flush.join(2)
+    data = json.loads((tmp_path / "config.json").read_text(encoding='utf-8'))
+    assert data["display"]["font_size"] == 99
+
+class StallingLock:
+    """Lock whose first acquire stalls until released, like a preempted thread."""
+    def __init__(self, stall):
+        self.lock = threading.Lock()
+        self.stall = stall
+        self.stalled = threading.Event()
+
+    def __enter__(self):
+        if not self.stalled.is_set():
+            self.stalled.set()
+            self.stall.wait(2)
+        return self.lock.__enter__()
+
+    def __exit__(self, *exc):
+        return self.lock.__exit__(*exc)
+
+def test_stalled_saver_cannot_overwrite_newer_flush(tmp_path):
+    settings = Settings(write_config(tmp_path, {"theme": "light"}))
+    settings.set("display.font_size", 120)
+    release = threading.Event()
+    settings.write_lock = StallingLock(release)
+    saver = threading.Thread(target=settings.flush)
+    saver.start()
+    assert settings.write_lock.stalled.wait(2)
+    settings.set("display.font_size", 99)
+    settings.flush()
+    release.set()
+    saver.join(2)
+    data = json.loads((tmp_path / "config.json").read_text(encoding='utf-8'))
+    assert data["display"]["font_size"] == 99
+
+def test_save_writes_behind_atomically(tmp_path):
+    path = write_config(tmp_path, {"theme": "light"})
+    settings = Settings(path)
+    settings.set("display.font_size", 120)
+    settings.set("theme", "dark")
+    settings.flush()
+    data = json.loads((tmp_path / "config.json").read_text(encoding='utf-8'))
+    assert data["theme"] == "dark"
+    assert data["display"]["font_size"] == 120
+    assert not (tmp_path / "config.json.tmp").exists()
+
+def test_save_merges_file_replaced_on_disk(tmp_path):
+    path = write_config(tmp_path, {"theme": "light", "display": {"font_size": 150}})
+    settings = Settings(path)
+    notified = []
+    settings.subscribe("", notified.append)
+    settings.set("window.opacity", 0.5)
+    # A central push lands inside the write-behind window
+    write_config(tmp_path, {"theme": "dark", "display": {"font_size": 80}})
+    settings.flush()
+    data = json.loads((tmp_path / "config.json").read_text(encoding='utf-8'))
+    assert data["theme"] == "dark"
+    assert data["display"]["font_size"] == 80
+    assert data["window"]["opacity"] == 0.5
+    assert settings.model.theme == "dark"
+    assert {"theme", "display.font_size"} <= notified[-1]
+    # Later saves don't merge the same file again
+    settings.set("window.opacity", 0.6)
+    settings.flush()
+    assert json.loads((tmp_path / "config.json").read_text(encoding='utf-8'))["theme"] == "dark"
+
+def test_reload_keeps_unsaved_local_changes(tmp_path):
+    settings = Settings(write_config(tmp_path, {"theme": "light"}))
+    settings.set("display.font_size", 90)
+    settings.replace_model(SettingsModel({"theme": "dark"}), "digest")
+    assert settings.model.theme == "dark"
+    assert settings.model.display.font_size == 90